@@ -11,30 +11,47 @@ Usage:
     python dashboard.py --demo --agents 100     # demo with 100 agent slots
     python dashboard.py --follow                # tail latest logs/run-*.ndjson live (use with Poke)
     node packages/orchestrator/dist/main.js | python dashboard.py --stdin
+    python dashboard.py --replay logs/run-X.ndjson --speed 10
+    python dashboard.py --replay logs/run-X.ndjson --speed 0 --headless > state.ndjson
+    python dashboard.py --llm-stats logs/llm-detail-X.ndjson   # LLM latency/tokens per endpoint
+    python dashboard.py --stdin --headless --alerts alerts.json  # exits 3 if an alert fired
     python dashboard.py                         # spawns orchestrator subprocess
 Controls:
     + / -                                       # zoom planner tree levels in/out
-    tab                                         # switch between Agent Grid and Activity tabs
+    tab                                         # cycle tabs (g/a/t/u/k/r pick one)
+    1 / 2 / 3                                   # throughput/slots: 1m, 15m or 1h window
+    space / , / . / b / n                       # replay: pause, slower, faster, skip back/ahead
 """
 
 from __future__ import annotations
 
+import abc
 import argparse
+import bisect
+import ctypes
+import functools
+import gzip
+import heapq
 import json
+import math
 import os
 import queue
 import random
 import re
 import select
+import struct
 import subprocess
 import sys
+import tempfile
 import termios
 import threading
 import time
 import tty
 from collections import deque
+from collections.abc import Callable, Iterable, Mapping
 from datetime import datetime, timedelta
-from typing import Any
+from types import MappingProxyType
+from typing import Any, NamedTuple
 
 try:
     from rich.console import Console
@@ -43,9 +60,19 @@ try:
     from rich.panel import Panel
     from rich.table import Table
     from rich.text import Text
+
+    HAVE_RICH = True
+except ImportError:  # --headless and --json-only run without Rich
+    HAVE_RICH = False
+
+try:  # optional faster JSON backend; decodes bytes directly
+    import orjson
+
+    _json_loads: Callable[[bytes], Any] = orjson.loads
+    JSON_BACKEND = "orjson"
 except ImportError:
-    print("Rich library required.  pip install rich")
-    sys.exit(1)
+    _json_loads = json.loads
+    JSON_BACKEND = "json"
 
 
 # ---------------------------------------------------------------------------
@@ -54,6 +81,34 @@ except ImportError:
 
 MAX_ACTIVITY = 50
 COST_PER_1K = 0.001  # default $/1K tokens -- override with --cost-rate
+SNAPSHOT_CLOCK_INTERVAL = 0.5  # republish unchanged state this often for clock-driven fields
+INGEST_QUEUE_SIZE = 50_000  # events buffered between readers and the render loop
+READ_CHUNK = 1 << 16  # bytes per NDJSON read
+MAX_LINE_BYTES = 16 << 20  # drop an unterminated line that grows beyond this
+FOLLOW_POLL_INTERVAL = 0.25  # seconds between polls of an idle followed log
+FOLLOW_WATCHDOG_INTERVAL = 5.0  # re-read even without inotify events (network filesystems)
+REPLAY_INDEX_STRIDE = 4 << 20  # bytes between sparse replay index samples
+REPLAY_SKIP_MINUTES = 5.0  # default log time skipped per replay skip key
+REPLAY_SPEEDS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 25.0, 100.0, 1000.0)
+CHECKPOINT_INTERVAL_MINUTES = 5.0  # log time between state checkpoints
+CHECKPOINT_VERSION = 2  # bump on any payload change; older checkpoints are ignored
+CHECKPOINT_MESSAGE = "Dashboard checkpoint"  # reader marker: state is in sync with a log offset
+RESTORE_MESSAGE = "Dashboard restore"  # reader request: replace state with a checkpoint
+ARCHIVE_AFTER_MINUTES = 30.0  # log time a finished subtree stays expanded before archival
+ARCHIVE_SWEEP_SECONDS = 60.0  # log time between archival sweeps
+RATE_HORIZON_SECONDS = 3600  # per-second history kept for throughput series
+THROUGHPUT_WINDOWS = (("1m", 60), ("15m", 900), ("1h", 3600))
+THROUGHPUT_COLUMNS = 60  # chart columns per throughput series
+STRAGGLER_COUNT = 5  # oldest in-flight tasks shown in the stragglers panel
+BRANCH_RANK_COUNT = 15  # planner subtrees listed in the Branches ranking
+PHASE_PENDING_LIMIT = 10_000  # unmatched phase starts kept per phase
+TRACE_MESSAGE = "Trace span"  # wraps one line of the tracer's trace file in the ingest stream
+TRACE_OPEN_LIMIT = 50_000  # open spans tracked before the oldest are dropped
+TRACE_TASK_LIMIT = 500  # per-task span timelines kept
+LLM_DETAIL_MESSAGE = "LLM detail"  # wraps the sizes of one llmDetailFile entry
+LLM_JOIN_LIMIT = 10_000  # LLM spans/details held while waiting for their counterpart
+ALERT_SAMPLE_SECONDS = 60.0  # log time between queue-depth samples kept by alert rules
+ALERT_EXIT_CODE = 3  # --headless exit status when any alert fired during the run
 
 
 # ---------------------------------------------------------------------------
@@ -61,25 +116,370 @@ COST_PER_1K = 0.001  # default $/1K tokens -- override with --cost-rate
 # ---------------------------------------------------------------------------
 
 
+class ArchiveSidecar:
+    """Append-only temp file holding the node records of archived subtrees."""
+
+    def __init__(self):
+        self._fh: Any = None
+
+    def append(self, records: list[list[Any]]) -> tuple[int, int]:
+        """Spill ``records`` as one NDJSON line; returns its ``(offset, length)``."""
+        if self._fh is None:
+            self._fh = tempfile.TemporaryFile(prefix="longshot-archive-")
+        data = json.dumps(records, separators=(",", ":")).encode() + b"\n"
+        offset = self._fh.seek(0, os.SEEK_END)
+        self._fh.write(data)
+        return offset, len(data)
+
+    def read(self, offset: int, length: int) -> list[list[Any]]:
+        self._fh.seek(offset)
+        return json.loads(self._fh.read(length))
+
+
+class ArchiveAggregate:
+    """Totals for the archived subtrees under one parent, plus where their records live."""
+
+    __slots__ = ("parent", "segments", "tasks", "statuses", "totals", "unmerged_tokens")
+
+    TOTAL_KEYS = (
+        "linesAdded",
+        "linesRemoved",
+        "filesChanged",
+        "tokensUsed",
+        "durationMs",
+        "merged",
+    )
+
+    def __init__(self, parent: int):
+        self.parent = parent
+        self.segments: list[tuple[int, int]] = []
+        self.tasks = 0
+        self.statuses: dict[str, int] = {}
+        self.totals = dict.fromkeys(self.TOTAL_KEYS, 0)
+        self.unmerged_tokens = 0
+
+    def add(self, records: list[list[Any]]):
+        statuses = self.statuses
+        totals = self.totals
+        for rec in records:
+            statuses[rec[2]] = statuses.get(rec[2], 0) + 1
+            metrics = rec[7]
+            if metrics:
+                for key in self.TOTAL_KEYS:
+                    totals[key] += metrics.get(key) or 0
+                if not metrics.get("merged"):
+                    self.unmerged_tokens += metrics.get("tokensUsed") or 0
+        self.tasks += len(records)
+
+    def metrics(self) -> dict[str, Any]:
+        """Summed handoff metrics, shaped like a task's ``handoff_metrics``."""
+        return {
+            **self.totals,
+            "unmergedTokens": self.unmerged_tokens,
+            "tasks": self.tasks,
+            "statuses": dict(self.statuses),
+        }
+
+
+class NodeViews(Mapping[str, dict[str, Any]]):
+    """Read-only ``name -> view`` mapping of one tree snapshot.
+
+    Snapshots share the tree's live views dict instead of copying it.  Before
+    the tree replaces or drops a view, the old one goes into the newest
+    snapshot's ``_undo`` (``None`` if the name was absent), and the next
+    snapshot becomes its ``_newer``.  Lookups check ``_undo`` and otherwise
+    defer to the newer snapshot, ending at the live dict, so every snapshot
+    keeps reading as published while publishing costs nothing per node.
+    Like the tree, read it from the ingesting thread.
+    """
+
+    __slots__ = ("_live", "_undo", "_newer", "_len")
+
+    def __init__(self, live: dict[str, dict[str, Any]]):
+        self._live = live
+        self._undo: dict[str, dict[str, Any] | None] = {}
+        self._newer: NodeViews | None = None
+        self._len = len(live)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        snap: NodeViews | None = self
+        while snap is not None:
+            undo = snap._undo
+            if name in undo:
+                view = undo[name]
+                return default if view is None else view
+            snap = snap._newer
+        return self._live.get(name, default)
+
+    def __getitem__(self, name: str) -> dict[str, Any]:
+        view = self.get(name)
+        if view is None:
+            raise KeyError(name)
+        return view
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.get(name) is not None
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self):
+        undo = self._undo
+        newer: Mapping[str, Any] = self._live if self._newer is None else self._newer
+        for name in newer:
+            if name not in undo or undo[name] is not None:
+                yield name
+        for name, view in undo.items():
+            if view is not None and name not in newer:
+                yield name
+
+    def current(self) -> Mapping[str, dict[str, Any]]:
+        """The same contents with plain-dict lookups, for one pass of reads.
+
+        While this is the newest snapshot and the tree has not changed since,
+        that is the live dict behind a read-only proxy (no copy); otherwise a
+        copy.  Do not keep it past the next ingest.
+        """
+        if self._newer is None and not self._undo:
+            return MappingProxyType(self._live)
+        return MappingProxyType({name: self[name] for name in self})
+
+    def changed_since(self, older: NodeViews) -> set[str] | None:
+        """Names whose view may differ from ``older``'s; ``None`` if not a snapshot before this."""
+        names: set[str] = set()
+        snap: NodeViews | None = older
+        while snap is not self:
+            if snap is None:
+                return None
+            names.update(snap._undo)
+            snap = snap._newer
+        return names
+
+
 class PlannerTreeState:
+    """Planner hierarchy with depth, child order and progress maintained per event.
+
+    Task IDs are interned to dense ints on first sight; per-node state lives in
+    int-indexed columns, with status and role stored as small-int codes.
+    Mutations propagate up the ancestor chain in O(depth) and mark touched nodes
+    dirty, so ``snapshot()`` only rebuilds views of nodes that changed.
+
+    ``archive()`` folds finished subtrees into one aggregate child per parent
+    and spills their records to an ``ArchiveSidecar``; they are rehydrated when
+    expanded or when a late event names one of their tasks.
+
+    Each node also carries a rollup of its subtree's finished tasks and their
+    handoff metrics (``ROLLUP_KEYS``), adjusted along the ancestor chain
+    whenever a node's own contribution changes or a subtree moves.
+    """
+
     ROOT_ID = "root-planner"
+    PANE_OPEN = 0
+    PANE_DONE = 1
+    STATUSES = ("idle", "pending", "assigned", "running", "complete", "failed", "cancelled")
+    TERMINAL = frozenset(("complete", "failed", "cancelled"))
+    ACTIVE = frozenset(("pending", "assigned", "running"))
+    STATUS_PROGRESS = {
+        "idle": 0.0,
+        "pending": 0.1,
+        "assigned": 0.25,
+        "running": 0.6,
+        "complete": 1.0,
+        "failed": 1.0,
+        "cancelled": 1.0,
+    }
+    # Codes of the STATUSES above; statuses first seen in events get the next free code.
+    _PENDING = 1
+    _ACTIVE_CODES = frozenset((1, 2, 3))
+    _TERMINAL_CODES = frozenset((4, 5, 6))
+    _IN_FLIGHT_CODES = frozenset((2, 3))
+    _NO_PARENT = -1
+    ARCHIVE_ROLE = "archive"
+    # Subtree totals: finished and failed tasks, merged branches, summed
+    # handoff metrics, and tokens of finished tasks whose branch has not merged.
+    ROLLUP_KEYS = (
+        "tasks",
+        "failed",
+        "merged",
+        "linesAdded",
+        "linesRemoved",
+        "filesChanged",
+        "tokensUsed",
+        "durationMs",
+        "unmergedTokens",
+    )
+    _ROLLUP_METRICS = ("merged", "linesAdded", "linesRemoved", "filesChanged", "tokensUsed")
 
     def __init__(self):
-        self.parent: dict[str, str | None] = {self.ROOT_ID: None}
-        self.children: dict[str, list[str]] = {self.ROOT_ID: []}
-        self.status: dict[str, str] = {self.ROOT_ID: "running"}
-        self.role: dict[str, str] = {self.ROOT_ID: "root-planner"}
-        self._order: dict[str, int] = {self.ROOT_ID: 0}
-        self._counter = 1
-        self.desc: dict[str, str] = {}
-        self.started_at: dict[str, float] = {}
-        self.worker_progress: dict[str, str] = {}
-        self.handoff_metrics: dict[str, dict[str, Any]] = {}
+        # Interning: task ID <-> dense node index (creation order)
+        self._ids: dict[str, int] = {}
+        self._names: list[str] = []
+        self._status_names = list(self.STATUSES)
+        self._status_codes = {name: code for code, name in enumerate(self.STATUSES)}
+        self._status_progress = [self.STATUS_PROGRESS[name] for name in self.STATUSES]
+        self._role_names: list[str | None] = [None]
+        self._role_codes: dict[str | None, int] = {None: 0}
+
+        # Node columns, indexed by node
+        self._parent: list[int] = []
+        self._children: list[list[int] | None] = []
+        self._status: list[int] = []
+        self._role: list[int] = []
+        self._order: list[int] = []
+        self._desc: list[str] = []
+        self._started_at: list[float | None] = []
+        self._worker_progress: list[str] = []
+        self._handoff_metrics: list[dict[str, Any] | None] = []
+        # Log time (epoch seconds) of the latest terminal transition in each subtree
+        self._done_at: list[float] = []
+        # ROLLUP_KEYS vectors: the node's own contribution and its subtree's
+        # total (None while all zero)
+        self._own: list[list[float] | None] = []
+        self._rollup: list[list[float] | None] = []
+        # Min-heap of (started_at, order, node) for started tasks; entries whose
+        # node has since finished (or whose slot was reused) are skipped lazily.
+        self._started_heap: list[tuple[float, int, int]] = []
+        # Max-heap of (-rollup value, -order, node) for rank_subtrees, on the
+        # column in _rank_col (None until first ranked); nodes whose rollup or
+        # children changed since are re-pushed from _rank_dirty, and outdated
+        # entries are skipped lazily.
+        self._rank_heap: list[tuple[float, int, int]] = []
+        self._rank_col: int | None = None
+        self._rank_dirty: set[int] = set()
+        self._counter = 0
+        self._free: list[int] = []  # indexes of removed nodes, reused first
+        self.clock = 0.0  # latest event time seen, epoch seconds
+        # (log time, task ID, old status code or -1 if new, new status code) per
+        # status change, drained by the owner (see UtilizationTracker.drain)
+        self.transitions: list[tuple[float, str, int, int]] = []
+
+        # Incrementally maintained aggregates
+        self._depth: list[int] = []
+        self._progress: list[float] = []
+        self._child_progress_sum: list[float] = []
+        # Children count toward their parent's progress with a weight: 1 for a
+        # task, the number of archived children for an aggregate.
+        self._weight: list[int] = []
+        self._child_weight: list[int] = []
+        self._depth_counts: dict[int, int] = {}
+        self._active_depth_counts: dict[int, int] = {}
+        # Non-root node count per status, updated on every transition
+        self.status_counts: dict[str, int] = {}
+        # Per-pane subtree index (0 = in progress, 1 = completed): matching nodes
+        # in each subtree, and rows the pane shows for it when fully expanded
+        # (matching nodes plus the ancestors that lead to them).
+        self._pane_matches: tuple[list[int], list[int]] = ([], [])
+        self._pane_rows: tuple[list[int], list[int]] = ([], [])
+
+        # Snapshot cache: per-node views, rebuilt only for dirty nodes
+        self._views: dict[str, dict[str, Any]] = {}
+        self._published: NodeViews | None = None
+        self._dirty: set[int] = set()
+        self._kids_dirty: set[int] = set()
+        # Renderer memo of pane row counts per node, keyed by (pane, levels
+        # below) and valid while the node's view is the same object. Kept here
+        # so removing a node drops its entries.
+        self._block_rows: dict[str, dict[tuple[int, int], tuple[dict[str, Any], int]]] = {}
+
+        self._columns: tuple[list[Any], ...] = (
+            self._names,
+            self._parent,
+            self._children,
+            self._status,
+            self._role,
+            self._order,
+            self._desc,
+            self._started_at,
+            self._worker_progress,
+            self._handoff_metrics,
+            self._done_at,
+            self._depth,
+            self._progress,
+            self._child_progress_sum,
+            self._weight,
+            self._child_weight,
+            *self._pane_matches,
+            *self._pane_rows,
+            self._own,
+            self._rollup,
+        )
+
+        # Archival: aggregate node -> its totals, parent -> its aggregate node,
+        # archived task ID -> aggregate node, and parents the user expanded.
+        self._sidecar = ArchiveSidecar()
+        self._aggregates: dict[int, ArchiveAggregate] = {}
+        self._archive_of: dict[int, int] = {}
+        self._archived: dict[str, int] = {}
+        self._pinned: set[int] = set()
+        self._archive_cutoff = 0.0
+
+        root = self._add_node(self.ROOT_ID, self._NO_PARENT, self._status_code("running"))
+        self._role[root] = self._role_code("root-planner")
+        self._set_subtree_depth(root, 0)
+        self._kids_dirty.add(root)
+        self._refresh_progress(root)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def archived_count(self) -> int:
+        return len(self._archived)
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._ids
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1 << 16)
+    def parse_sub_id(task_id: str) -> tuple[str, int] | None:
+        """Split ``<parent>-sub-<n>`` into ``(parent, n)``; ``None`` for other IDs."""
+        head, sep, tail = task_id.rpartition("-sub-")
+        if not sep or not tail.isdecimal():
+            return None
+        return head, int(tail)
 
     @staticmethod
     def infer_parent_id(task_id: str) -> str | None:
-        m = re.match(r"^(.*)-sub-\d+$", task_id)
-        return m.group(1) if m else None
+        parsed = PlannerTreeState.parse_sub_id(task_id)
+        return parsed[0] if parsed else None
+
+    def _status_code(self, status: str) -> int:
+        code = self._status_codes.get(status)
+        if code is None:
+            code = self._status_codes[status] = len(self._status_names)
+            self._status_names.append(status)
+            self._status_progress.append(0.0)
+        return code
+
+    def _role_code(self, role: str | None) -> int:
+        code = self._role_codes.get(role)
+        if code is None:
+            code = self._role_codes[role] = len(self._role_names)
+            self._role_names.append(role)
+        return code
+
+    def _add_node(self, node_id: str, parent: int, status: int, order: int | None = None) -> int:
+        """Store a detached node in a free or new column slot and return its index."""
+        if order is None:
+            order = self._counter
+            self._counter += 1
+        # In ``_columns`` order: name, parent, children, status, role, order, desc,
+        # started_at, worker_progress, handoff_metrics, done_at, depth, progress,
+        # child progress sum, weight, child weight, pane matches, pane rows,
+        # own rollup, subtree rollup.
+        values = (node_id, parent, None, status, 0, order, "", None, "", None, 0.0)
+        values += (-1, 0.0, 0.0, 1, 0, 0, 0, 0, 0, None, None)
+        if self._free:
+            idx = self._free.pop()
+            for column, value in zip(self._columns, values):
+                column[idx] = value
+        else:
+            idx = len(self._names)
+            for column, value in zip(self._columns, values):
+                column.append(value)
+        self._ids[node_id] = idx
+        self._dirty.add(idx)
+        return idx
 
     def ensure(
         self,
@@ -90,41 +490,65 @@ class PlannerTreeState:
     ):
         if not node_id:
             return
-        if desc:
-            self.desc[node_id] = desc
+        if node_id not in self._ids and node_id in self._archived:
+            self._rehydrate(self._archived[node_id])
 
         if node_id == self.ROOT_ID:
             parent_id = None
-        elif parent_id is None:
+        elif parent_id is None or parent_id == node_id:
             parent_id = self.infer_parent_id(node_id) or self.ROOT_ID
 
-        if node_id not in self.parent:
-            self.parent[node_id] = parent_id
-            self.children.setdefault(node_id, [])
-            self.status.setdefault(node_id, "pending")
-            if role:
-                self.role[node_id] = role
-            self._order[node_id] = self._counter
-            self._counter += 1
-        elif role:
-            self.role[node_id] = role
-
+        parent = self._NO_PARENT
         if parent_id is not None:
-            if parent_id not in self.parent:
+            parent = self._ids.get(parent_id, self._NO_PARENT)
+            if parent == self._NO_PARENT and parent_id in self._archived:
+                self._rehydrate(self._archived[parent_id])
+                parent = self._ids[parent_id]
+            if parent == self._NO_PARENT:
                 parent_parent = (
                     None
                     if parent_id == self.ROOT_ID
                     else self.infer_parent_id(parent_id) or self.ROOT_ID
                 )
                 self.ensure(parent_id, parent_parent)
-            kids = self.children.setdefault(parent_id, [])
-            if node_id not in kids:
-                kids.append(node_id)
-            if self.parent.get(node_id) != parent_id:
-                old_parent = self.parent.get(node_id)
-                if old_parent and node_id in self.children.get(old_parent, []):
-                    self.children[old_parent].remove(node_id)
-                self.parent[node_id] = parent_id
+                parent = self._ids[parent_id]
+
+        idx = self._ids.get(node_id)
+        if idx is None:
+            idx = self._add_node(node_id, parent, self._PENDING)
+            self.status_counts["pending"] = self.status_counts.get("pending", 0) + 1
+            self.transitions.append((self.clock, node_id, -1, self._PENDING))
+            if role:
+                self._role[idx] = self._role_code(role)
+            if desc:
+                self._desc[idx] = desc
+            self._attach(idx, parent)
+            self._pane_shift(self.PANE_OPEN, idx, 1, 0)
+            self._refresh_progress(idx)
+            return
+
+        if desc and self._desc[idx] != desc:
+            self._desc[idx] = desc
+            self._dirty.add(idx)
+
+        if role:
+            code = self._role_code(role)
+            if self._role[idx] != code:
+                self._role[idx] = code
+                self._dirty.add(idx)
+
+        old_parent = self._parent[idx]
+        if (
+            parent != self._NO_PARENT
+            and old_parent != parent
+            and not self._is_ancestor(idx, parent)
+        ):
+            self._detach(idx)
+            self._parent[idx] = parent
+            self._attach(idx, parent)
+            self._refresh_progress(parent)
+            if old_parent != self._NO_PARENT:
+                self._refresh_progress(old_parent)
 
     def update_status(
         self,
@@ -135,75 +559,838 @@ class PlannerTreeState:
         desc: str = "",
     ):
         self.ensure(node_id, parent_id, role, desc)
-        self.status[node_id] = status
-        if status in ("running", "assigned") and node_id not in self.started_at:
-            self.started_at[node_id] = time.time()
-        elif status in ("complete", "failed", "cancelled"):
-            self.started_at.pop(node_id, None)
-
-    def _depth_map(self) -> dict[str, int]:
-        depth = {self.ROOT_ID: 0}
-        q = deque([self.ROOT_ID])
-        while q:
-            cur = q.popleft()
-            for child in self.children.get(cur, []):
-                depth[child] = depth[cur] + 1
-                q.append(child)
-        return depth
+        idx = self._ids[node_id]
+        self._set_status(idx, self._status_code(status))
+        if status in ("running", "assigned") and self._started_at[idx] is None:
+            started = self._started_at[idx] = time.time()
+            self._push_started(idx, started)
+            self._dirty.add(idx)
+        elif status in self.TERMINAL and self._started_at[idx] is not None:
+            self._started_at[idx] = None
+            self._dirty.add(idx)
+
+    def set_worker_progress(self, node_id: str, detail: str):
+        idx = self._ids.get(node_id)
+        if idx is not None and self._worker_progress[idx] != detail:
+            self._worker_progress[idx] = detail
+            self._dirty.add(idx)
+
+    def set_handoff_metrics(self, node_id: str, metrics: dict[str, Any]):
+        idx = self._ids.get(node_id)
+        if idx is not None:
+            old = self._handoff_metrics[idx]
+            if old and old.get("merged") and "merged" not in metrics:
+                metrics = {**metrics, "merged": old["merged"]}
+            self._handoff_metrics[idx] = metrics
+            self._dirty.add(idx)
+            self._refresh_rollup(idx)
+
+    def record_merge(self, branch: str) -> str | None:
+        """Credit a merged ``branch`` to the task it was cut for; returns that task's ID.
+
+        Branches are named ``<prefix><task id>-<slug>`` (the demo uses
+        ``worker/<task id>``), so the longest live task ID the name starts with
+        after its last ``/`` wins.
+        """
+        name = branch.rpartition("/")[2]
+        idx = self._ids.get(name)
+        cut = len(name)
+        while idx is None:
+            cut = name.rfind("-", 0, cut)
+            if cut <= 0:
+                return None
+            idx = self._ids.get(name[:cut])
+        if not idx or idx in self._aggregates:
+            return None
+        metrics = self._handoff_metrics[idx]
+        self._handoff_metrics[idx] = {**(metrics or {}), "merged": 1}
+        self._dirty.add(idx)
+        self._refresh_rollup(idx)
+        return self._names[idx]
+
+    def _own_rollup(self, idx: int) -> list[float] | None:
+        """This node's own ``ROLLUP_KEYS`` contribution, excluding its children."""
+        agg = self._aggregates.get(idx)
+        metrics = self._handoff_metrics[idx]
+        if agg is not None:
+            totals = agg.totals
+            own = [agg.tasks, agg.statuses.get("failed", 0)]
+            own.extend(totals[key] for key in self._ROLLUP_METRICS)
+            own += [totals["durationMs"], agg.unmerged_tokens]
+            return own
+        code = self._status[idx]
+        if code not in self._TERMINAL_CODES:
+            return None  # counted once finished (again, if retried)
+        own = [1.0, 1.0 if self._status_names[code] == "failed" else 0.0]
+        if metrics:
+            own.extend(metrics.get(key) or 0 for key in self._ROLLUP_METRICS)
+            tokens = metrics.get("tokensUsed") or 0
+            own += [metrics.get("durationMs") or 0, 0 if metrics.get("merged") else tokens]
+        else:
+            own += [0.0] * 7
+        return own
+
+    def _refresh_rollup(self, idx: int):
+        """Recompute node ``idx``'s own contribution and push the change to the root."""
+        new = self._own_rollup(idx)
+        old = self._own[idx]
+        if new == old:
+            return
+        self._own[idx] = new
+        if old is None:
+            delta = new
+        elif new is None:
+            delta = [-v for v in old]
+        else:
+            delta = [a - b for a, b in zip(new, old)]
+        self._add_rollup(idx, delta)
+
+    def _add_rollup(self, idx: int, delta: list[float]):
+        """Add ``delta`` to the subtree rollup of node ``idx`` and every ancestor."""
+        rollup = self._rollup
+        parent = self._parent
+        while idx != self._NO_PARENT:
+            cur = rollup[idx]
+            if cur is None:
+                rollup[idx] = list(delta)
+            else:
+                for i, v in enumerate(delta):
+                    cur[i] += v
+            self._dirty.add(idx)
+            self._rank_dirty.add(idx)
+            idx = parent[idx]
+
+    def _push_started(self, idx: int, started: float):
+        heap = self._started_heap
+        heapq.heappush(heap, (started, self._order[idx], idx))
+        counts = self.status_counts
+        if len(heap) > 2 * (counts.get("assigned", 0) + counts.get("running", 0)) + 64:
+            self._started_heap = [entry for entry in heap if self._in_flight(entry)]
+            heapq.heapify(self._started_heap)
+
+    def _in_flight(self, entry: tuple[float, int, int]) -> bool:
+        started, order, idx = entry
+        return (
+            self._order[idx] == order
+            and self._started_at[idx] == started
+            and self._status[idx] in self._IN_FLIGHT_CODES
+        )
+
+    def oldest_in_flight(self, k: int) -> list[dict[str, Any]]:
+        """The ``k`` longest-running assigned/running tasks, oldest first.
+
+        Walks the start-time heap from its top, so the cost depends on ``k``
+        and the stale entries passed on the way, not on the tree size.
+        """
+        heap = self._started_heap
+        while heap and not self._in_flight(heap[0]):
+            heapq.heappop(heap)
+        found: list[int] = []
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier and len(found) < k:
+            entry, i = heapq.heappop(frontier)
+            if self._in_flight(entry):
+                found.append(entry[2])
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        names = self._names
+        return [
+            {
+                "id": names[idx],
+                "parent": names[self._parent[idx]] if self._parent[idx] != self._NO_PARENT else "",
+                "status": self._status_names[self._status[idx]],
+                "started_at": self._started_at[idx],
+                "worker_progress": self._worker_progress[idx],
+            }
+            for idx in found
+        ]
+
+    def rollup_of(self, idx: int) -> dict[str, Any] | None:
+        """Subtree totals of node ``idx`` with the ratios derived from them."""
+        rollup = self._rollup[idx]
+        if rollup is None:
+            return None
+        r: dict[str, Any] = {k: int(v) for k, v in zip(self.ROLLUP_KEYS, rollup)}
+        tasks, lines, minutes = r["tasks"], r["linesAdded"], r["durationMs"] / 60_000
+        r["tokens_per_line"] = r["tokensUsed"] / lines if lines else None
+        r["lines_per_min"] = lines / minutes if minutes else 0.0
+        r["fail_ratio"] = r["failed"] / tasks if tasks else 0.0
+        return r
+
+    def rank_subtrees(self, k: int, key: str = "unmergedTokens") -> list[dict[str, Any]]:
+        """The ``k`` planner subtrees (nodes with children) with the largest rollup ``key``.
+
+        The default ranks decomposition branches by tokens spent on finished
+        tasks whose branch has not merged.  Only nodes whose rollup changed
+        since the last call are re-pushed, so the cost follows the updates
+        in between and ``k``, not the tree size.  Ties go to the newer node,
+        by creation order, so a restored tree ranks like the original.
+        """
+        col = self.ROLLUP_KEYS.index(key)
+        rollups, order = self._rollup, self._order
+        heap = self._rank_heap
+        if col != self._rank_col or len(heap) > 2 * len(self._names) + 64:
+            self._rank_col = col
+            heap[:] = [
+                (-rollups[idx][col], -order[idx], idx)
+                for idx in range(len(rollups))
+                if self._rankable(idx)
+            ]
+            heapq.heapify(heap)
+        else:
+            for idx in self._rank_dirty:
+                if self._rankable(idx):
+                    heapq.heappush(heap, (-rollups[idx][col], -order[idx], idx))
+        self._rank_dirty = set()
+
+        top: list[tuple[float, int, int]] = []
+        seen: set[int] = set()
+        while heap and len(top) < k:
+            entry = heapq.heappop(heap)
+            value, stamp, idx = entry[0], -entry[1], entry[2]
+            if idx in seen or order[idx] != stamp or not self._rankable(idx):
+                continue
+            if rollups[idx][col] != -value:
+                continue
+            seen.add(idx)
+            top.append(entry)
+        for entry in top:
+            heapq.heappush(heap, entry)
+
+        names = self._names
+        ranked = []
+        for _, _, idx in top:
+            row: dict[str, Any] = {
+                "id": names[idx],
+                "depth": self._depth[idx],
+                "status": self._status_names[self._status[idx]],
+                "desc": self._desc[idx],
+            }
+            row.update(self.rollup_of(idx) or {})
+            ranked.append(row)
+        return ranked
+
+    def _rankable(self, idx: int) -> bool:
+        """Whether node ``idx`` is a live planner subtree with finished work to rank."""
+        return bool(
+            idx and self._rollup[idx] and self._children[idx] and idx not in self._aggregates
+        )
+
+    @classmethod
+    def pane_of(cls, status: str | None) -> int:
+        return cls.PANE_DONE if status in cls.TERMINAL else cls.PANE_OPEN
+
+    def max_depth(self) -> int:
+        return max(self._depth_counts)
+
+    def active_max_depth(self) -> int:
+        return max(self._active_depth_counts, default=0)
+
+    # -- incremental maintenance ---------------------------------------------
+
+    def _set_status(self, idx: int, code: int):
+        old = self._status[idx]
+        if old == code:
+            return
+        self._status[idx] = code
+        if idx:  # not the root
+            self.transitions.append((self.clock, self._names[idx], old, code))
+            counts = self.status_counts
+            counts[self._status_names[old]] -= 1
+            name = self._status_names[code]
+            counts[name] = counts.get(name, 0) + 1
+            old_pane = self.PANE_DONE if old in self._TERMINAL_CODES else self.PANE_OPEN
+            new_pane = self.PANE_DONE if code in self._TERMINAL_CODES else self.PANE_OPEN
+            if old_pane != new_pane:
+                self._pane_shift(old_pane, idx, -1, 0)
+                self._pane_shift(new_pane, idx, 1, 0)
+        if code in self._TERMINAL_CODES:
+            self._stamp_done(idx, self.clock)
+        was_active = old in self._ACTIVE_CODES
+        is_active = code in self._ACTIVE_CODES
+        if was_active != is_active:
+            self._bump(self._active_depth_counts, self._depth[idx], 1 if is_active else -1)
+        self._dirty.add(idx)
+        self._refresh_progress(idx)
+        self._refresh_rollup(idx)
+
+    @staticmethod
+    def _bump(counts: dict[int, int], key: int, delta: int):
+        n = counts.get(key, 0) + delta
+        if n:
+            counts[key] = n
+        else:
+            counts.pop(key, None)
+
+    def _stamp_done(self, idx: int, when: float):
+        """Raise the subtree finish time of node ``idx`` and its ancestors to ``when``."""
+        done_at = self._done_at
+        parent = self._parent
+        while idx != self._NO_PARENT and done_at[idx] < when:
+            done_at[idx] = when
+            idx = parent[idx]
+
+    def _is_ancestor(self, idx: int, other: int) -> bool:
+        """True if node ``idx`` is node ``other`` or one of its ancestors."""
+        parent = self._parent
+        while other != self._NO_PARENT:
+            if other == idx:
+                return True
+            other = parent[other]
+        return False
+
+    def _attach(self, idx: int, parent: int):
+        """Link node ``idx`` under ``parent`` and (re)compute its subtree depths."""
+        if parent != self._NO_PARENT:
+            kids = self._children[parent]
+            order = self._order
+            if kids is None:
+                kids = self._children[parent] = []
+            if not kids or order[kids[-1]] < order[idx]:
+                kids.append(idx)
+            else:
+                bisect.insort(kids, idx, key=order.__getitem__)
+            weight = self._weight[idx]
+            self._child_progress_sum[parent] += weight * self._progress[idx]
+            self._child_weight[parent] += weight
+            if self._rollup[idx]:
+                self._add_rollup(parent, self._rollup[idx])
+            self._stamp_done(parent, self._done_at[idx])
+            self._kids_dirty.add(parent)
+            self._dirty.add(parent)
+            self._rank_dirty.add(parent)  # may have just become a planner
+            for pane in (self.PANE_OPEN, self.PANE_DONE):
+                matches = self._pane_matches[pane][idx]
+                if matches:
+                    self._pane_shift(pane, parent, matches, self._pane_rows[pane][idx])
+        self._set_subtree_depth(idx, 0 if parent == self._NO_PARENT else self._depth[parent] + 1)
+
+    def _detach(self, idx: int):
+        old_parent = self._parent[idx]
+        if old_parent == self._NO_PARENT:
+            return
+        kids = self._children[old_parent]
+        assert kids is not None
+        kids.remove(idx)
+        weight = self._weight[idx]
+        self._child_progress_sum[old_parent] -= weight * self._progress[idx]
+        self._child_weight[old_parent] -= weight
+        if self._rollup[idx]:
+            self._add_rollup(old_parent, [-v for v in self._rollup[idx]])
+        self._kids_dirty.add(old_parent)
+        self._dirty.add(old_parent)
+        for pane in (self.PANE_OPEN, self.PANE_DONE):
+            matches = self._pane_matches[pane][idx]
+            if matches:
+                self._pane_shift(pane, old_parent, -matches, -self._pane_rows[pane][idx])
+
+    def _pane_shift(self, pane: int, idx: int, matches: int, rows: int):
+        """Add ``matches`` pane matches (carrying ``rows`` rows) below node ``idx``.
+
+        Walks to the root; an ancestor gains or loses its own row when its
+        subtree's match count crosses zero.
+        """
+        match_counts = self._pane_matches[pane]
+        row_counts = self._pane_rows[pane]
+        parent = self._parent
+        while idx != self._NO_PARENT:
+            before = match_counts[idx]
+            after = before + matches
+            match_counts[idx] = after
+            rows += (after > 0) - (before > 0)
+            if rows:
+                row_counts[idx] += rows
+                self._dirty.add(idx)
+            idx = parent[idx]
+
+    def _set_subtree_depth(self, idx: int, depth: int):
+        stack = [(idx, depth)]
+        while stack:
+            cur, d = stack.pop()
+            old = self._depth[cur]
+            if old == d:
+                continue
+            active = self._status[cur] in self._ACTIVE_CODES
+            if old >= 0:
+                self._bump(self._depth_counts, old, -1)
+                if active:
+                    self._bump(self._active_depth_counts, old, -1)
+            self._bump(self._depth_counts, d, 1)
+            if active:
+                self._bump(self._active_depth_counts, d, 1)
+            self._depth[cur] = d
+            self._dirty.add(cur)
+            stack.extend((child, d + 1) for child in self._children[cur] or ())
+
+    def _compute_progress(self, idx: int) -> float:
+        code = self._status[idx]
+        if code in self._TERMINAL_CODES:
+            return 1.0
+        weight = self._child_weight[idx]
+        if weight:
+            p = self._child_progress_sum[idx] / weight
+        else:
+            p = self._status_progress[code]
+        return max(0.0, min(1.0, p))
+
+    def _refresh_progress(self, idx: int):
+        """Recompute progress for node ``idx`` and push any change up to the root."""
+        while idx != self._NO_PARENT:
+            new = self._compute_progress(idx)
+            old = self._progress[idx]
+            if old == new:
+                return
+            self._progress[idx] = new
+            self._dirty.add(idx)
+            parent = self._parent[idx]
+            if parent != self._NO_PARENT:
+                self._child_progress_sum[parent] += (new - old) * self._weight[idx]
+            idx = parent
+
+    # -- archival --------------------------------------------------------------
+
+    def archive(self, cutoff: float) -> int:
+        """Fold subtrees that are wholly terminal and last finished by ``cutoff``.
+
+        Status counts are left as they are.  Subtrees under an expanded parent
+        are skipped.  Returns the number of tasks archived.
+        """
+        self._archive_cutoff = cutoff
+        blocked: set[int] = set()
+        for pinned in self._pinned:
+            while pinned != self._NO_PARENT and pinned not in blocked:
+                blocked.add(pinned)
+                pinned = self._parent[pinned]
+        open_matches = self._pane_matches[self.PANE_OPEN]
+        children = self._children
+        archived = 0
+        stack = [self._ids[self.ROOT_ID]]
+        while stack:
+            parent = stack.pop()
+            if parent in self._pinned:
+                continue
+            batch = []
+            for child in children[parent] or ():
+                if child in self._aggregates:
+                    continue
+                if (
+                    not open_matches[child]
+                    and self._done_at[child] <= cutoff
+                    and child not in blocked
+                ):
+                    batch.append(child)
+                elif children[child]:
+                    stack.append(child)
+            if batch:
+                archived += self._archive_children(parent, batch)
+        return archived
+
+    def expand(self, node_ids: Iterable[str]) -> int:
+        """Rehydrate the named aggregates and keep their parents expanded."""
+        expanded = 0
+        for node_id in node_ids:
+            idx = self._ids.get(node_id)
+            agg = self._aggregates.get(idx) if idx is not None else None
+            if agg is not None:
+                self._pinned.add(agg.parent)
+                expanded += self._rehydrate(idx)
+        return expanded
+
+    def collapse(self) -> int:
+        """Drop every expansion and re-archive at the last sweep's cutoff."""
+        if not self._pinned:
+            return 0
+        self._pinned.clear()
+        return self.archive(self._archive_cutoff)
+
+    def _record(self, idx: int) -> list[Any]:
+        parent = self._parent[idx]
+        return [
+            self._names[idx],
+            self._names[parent],
+            self._status_names[self._status[idx]],
+            self._role_names[self._role[idx]],
+            self._order[idx],
+            self._desc[idx],
+            self._worker_progress[idx],
+            self._handoff_metrics[idx],
+            self._done_at[idx],
+        ]
+
+    def _load(self, agg: ArchiveAggregate) -> list[list[Any]]:
+        records: list[list[Any]] = []
+        for offset, length in agg.segments:
+            records.extend(self._sidecar.read(offset, length))
+        return records
+
+    def _subtree_records(self, idx: int) -> list[list[Any]]:
+        """Records for the subtree at ``idx``, parents first; nested aggregates are inlined."""
+        records: list[list[Any]] = []
+        stack = [idx]
+        while stack:
+            cur = stack.pop()
+            agg = self._aggregates.get(cur)
+            if agg is not None:
+                records.extend(self._load(agg))
+                continue
+            records.append(self._record(cur))
+            stack.extend(reversed(self._children[cur] or ()))
+        return records
+
+    def _remove_subtree(self, idx: int):
+        """Unlink the subtree at ``idx`` and free its slots; status counts are untouched."""
+        parent = self._parent[idx]
+        self._detach(idx)
+        self._refresh_progress(parent)
+        stack = [idx]
+        while stack:
+            cur = stack.pop()
+            stack.extend(self._children[cur] or ())
+            agg = self._aggregates.pop(cur, None)
+            if agg is not None:
+                del self._archive_of[agg.parent]
+            self._bump(self._depth_counts, self._depth[cur], -1)
+            if self._status[cur] in self._ACTIVE_CODES:
+                self._bump(self._active_depth_counts, self._depth[cur], -1)
+            name = self._names[cur]
+            del self._ids[name]
+            self._set_view(name, None)
+            self._block_rows.pop(name, None)
+            self._dirty.discard(cur)
+            self._kids_dirty.discard(cur)
+            self._pinned.discard(cur)
+            # Drop references now; the remaining columns are reset on reuse.
+            self._children[cur] = None
+            self._desc[cur] = ""
+            self._worker_progress[cur] = ""
+            self._handoff_metrics[cur] = None
+            self._own[cur] = self._rollup[cur] = None
+            self._free.append(cur)
+
+    def _archive_children(self, parent: int, kids: list[int]) -> int:
+        order = min(self._order[kid] for kid in kids)
+        records: list[list[Any]] = []
+        for kid in kids:
+            records.extend(self._subtree_records(kid))
+            self._remove_subtree(kid)
+        agg = self._archive_of.get(parent)
+        if agg is None:
+            agg = self._new_aggregate(parent, order)
+        self._spill(agg, records, len(kids))
+        return len(records)
+
+    def _new_aggregate(self, parent: int, order: int) -> int:
+        name = f"{self.ARCHIVE_ROLE}:{self._names[parent]}"
+        idx = self._add_node(name, parent, self._status_code("complete"), order)
+        self._role[idx] = self._role_code(self.ARCHIVE_ROLE)
+        self._weight[idx] = 0
+        self._aggregates[idx] = ArchiveAggregate(parent)
+        self._archive_of[parent] = idx
+        self._attach(idx, parent)
+        self._pane_shift(self.PANE_DONE, idx, 1, 0)
+        self._refresh_progress(idx)
+        return idx
+
+    def _spill(self, idx: int, records: list[list[Any]], top_level: int):
+        """Add ``records`` (``top_level`` of them direct children) to aggregate ``idx``."""
+        agg = self._aggregates[idx]
+        agg.segments.append(self._sidecar.append(records))
+        agg.add(records)
+        for rec in records:
+            self._archived[rec[0]] = idx
+        self._desc[idx] = f"{agg.tasks} archived"
+        self._handoff_metrics[idx] = agg.metrics()
+        self._refresh_rollup(idx)
+        self._done_at[idx] = max(self._done_at[idx], max(rec[8] for rec in records))
+        self._dirty.add(idx)
+
+        parent = agg.parent
+        self._weight[idx] += top_level
+        self._child_weight[parent] += top_level
+        self._child_progress_sum[parent] += top_level * self._progress[idx]
+        self._refresh_progress(parent)
+
+    def _rehydrate(self, idx: int) -> int:
+        """Replace aggregate ``idx`` with the nodes it archived."""
+        records = self._load(self._aggregates[idx])
+        self._remove_subtree(idx)
+        for rec in records:
+            del self._archived[rec[0]]
+            self._insert_record(rec)
+        return len(records)
+
+    def _insert_record(self, rec: list[Any]):
+        node_id, parent_id, status, role, order, desc, progress_detail, metrics, done_at = rec
+        parent = self._ids[parent_id]
+        code = self._status_code(status)
+        idx = self._add_node(node_id, parent, code, order)
+        self._role[idx] = self._role_code(role)
+        self._desc[idx] = desc
+        self._worker_progress[idx] = progress_detail
+        self._handoff_metrics[idx] = metrics
+        self._done_at[idx] = done_at
+        self._attach(idx, parent)
+        pane = self.PANE_DONE if code in self._TERMINAL_CODES else self.PANE_OPEN
+        self._pane_shift(pane, idx, 1, 0)
+        self._refresh_progress(idx)
+        self._refresh_rollup(idx)
+
+    # -- checkpoints -----------------------------------------------------------
+
+    def checkpoint(self) -> dict[str, Any]:
+        """JSON-serializable copy of the node table; aggregates are rebuilt on load."""
+        names = self._names
+        order = self._order
+        status_names = self._status_names
+        role_names = self._role_names
+        live = sorted(
+            (idx for idx in self._ids.values() if idx not in self._aggregates),
+            key=order.__getitem__,
+        )
+        nodes = []
+        for idx in live:
+            parent = self._parent[idx]
+            nodes.append(
+                [
+                    names[idx],
+                    names[parent] if parent != self._NO_PARENT else None,
+                    status_names[self._status[idx]],
+                    role_names[self._role[idx]],
+                    order[idx],
+                ]
+            )
+        return {
+            "nodes": nodes,
+            "counter": self._counter,
+            "desc": {names[i]: self._desc[i] for i in live if self._desc[i]},
+            "started_at": {
+                names[i]: self._started_at[i] for i in live if self._started_at[i] is not None
+            },
+            "worker_progress": {
+                names[i]: self._worker_progress[i] for i in live if self._worker_progress[i]
+            },
+            "handoff_metrics": {
+                names[i]: self._handoff_metrics[i]
+                for i in live
+                if self._handoff_metrics[i] is not None
+            },
+            "done_at": {names[i]: self._done_at[i] for i in live if self._done_at[i]},
+            "clock": self.clock,
+            "archives": [
+                {"parent": names[agg.parent], "order": order[idx], "nodes": self._load(agg)}
+                for idx, agg in self._aggregates.items()
+            ],
+        }
+
+    @classmethod
+    def from_checkpoint(cls, data: Mapping[str, Any]) -> PlannerTreeState:
+        tree = cls()
+        kids: dict[str | None, list[list[Any]]] = {}
+        for rec in data["nodes"]:
+            kids.setdefault(rec[1], []).append(rec)
+        # Insert top-down so every parent exists first; the original creation
+        # counter keeps each child list in its recorded order.
+        pending = list(kids.get(cls.ROOT_ID, ()))
+        for node_id, parent_id, _status, role, order in pending:
+            tree._counter = order
+            tree.ensure(node_id, parent_id, role)
+            pending.extend(kids.get(node_id, ()))
+        for node_id, _parent, status, _role, _order in data["nodes"]:
+            tree._set_status(tree._ids[node_id], tree._status_code(status))
+        tree._counter = data["counter"]
+        for column, key in (
+            (tree._desc, "desc"),
+            (tree._started_at, "started_at"),
+            (tree._worker_progress, "worker_progress"),
+            (tree._handoff_metrics, "handoff_metrics"),
+        ):
+            for node_id, value in data[key].items():
+                idx = tree._ids.get(node_id)
+                if idx is not None:
+                    column[idx] = value
+        for node_id in data["handoff_metrics"]:
+            if node_id in tree._ids:
+                tree._refresh_rollup(tree._ids[node_id])
+        for node_id, when in data.get("done_at", {}).items():
+            tree._stamp_done(tree._ids[node_id], when)
+        for idx, started in enumerate(tree._started_at):
+            if started is not None:
+                tree._push_started(idx, started)
+        tree.clock = data.get("clock", 0.0)
+        for archive in data.get("archives", ()):
+            records = archive["nodes"]
+            for rec in records:
+                tree.status_counts[rec[2]] = tree.status_counts.get(rec[2], 0) + 1
+            parent = tree._ids[archive["parent"]]
+            agg = tree._new_aggregate(parent, archive["order"])
+            top_level = sum(1 for rec in records if rec[1] == archive["parent"])
+            tree._spill(agg, records, top_level)
+        tree._dirty.update(tree._ids.values())
+        tree.transitions.clear()  # rebuilt state, not status changes
+        return tree
+
+    # -- snapshot --------------------------------------------------------------
+
+    def _node_view(self, idx: int, prev: dict[str, Any] | None) -> dict[str, Any]:
+        names = self._names
+        node_depth = self._depth[idx]
+        node_role = self._role_names[self._role[idx]]
+        if not node_role:
+            node_role = "planner" if node_depth == 1 else "subplanner"
+        if prev is None or idx in self._kids_dirty:
+            kids = [names[child] for child in self._children[idx] or ()]
+        else:
+            kids = prev["children"]
+        return {
+            "id": names[idx],
+            "depth": node_depth,
+            "status": self._status_names[self._status[idx]],
+            "progress": self._progress[idx],
+            "children": kids,
+            "role": node_role,
+            "desc": self._desc[idx],
+            "started_at": self._started_at[idx],
+            "worker_progress": self._worker_progress[idx],
+            "handoff_metrics": self._handoff_metrics[idx],
+            "rollup": self.rollup_of(idx) if self._children[idx] else None,
+            "pane_rows": (
+                self._pane_rows[self.PANE_OPEN][idx],
+                self._pane_rows[self.PANE_DONE][idx],
+            ),
+        }
+
+    def _set_view(self, name: str, view: dict[str, Any] | None):
+        """Replace (or with ``None`` drop) the view of ``name``, keeping snapshots intact."""
+        views = self._views
+        published = self._published
+        if published is not None and name not in published._undo:
+            published._undo[name] = views.get(name)
+        if view is None:
+            views.pop(name, None)
+        else:
+            views[name] = view
 
     def snapshot(self) -> dict[str, Any]:
-        depth = self._depth_map()
-
-        status_progress = {
-            "idle": 0.0,
-            "pending": 0.1,
-            "assigned": 0.25,
-            "running": 0.6,
-            "complete": 1.0,
-            "failed": 1.0,
-            "cancelled": 1.0,
+        views = self._views
+        names = self._names
+        for idx in self._dirty:
+            name = names[idx]
+            self._set_view(name, self._node_view(idx, views.get(name)))
+        self._dirty.clear()
+        self._kids_dirty.clear()
+        nodes = self._published
+        if nodes is None or nodes._undo:
+            nodes = NodeViews(views)
+            if self._published is not None:
+                self._published._newer = nodes
+            self._published = nodes
+        return {
+            "root": self.ROOT_ID,
+            "nodes": nodes,
+            "max_depth": self.max_depth(),
+            "archived": len(self._archived),
+            "block_rows": self._block_rows,
         }
 
-        progress: dict[str, float] = {}
-
-        def calc(node_id: str) -> float:
-            if node_id in progress:
-                return progress[node_id]
-            kids = self.children.get(node_id, [])
-            st = self.status.get(node_id, "pending")
-            if st in ("complete", "failed", "cancelled"):
-                p = 1.0
-            elif kids:
-                vals = [calc(k) for k in kids]
-                p = sum(vals) / max(len(vals), 1)
-            else:
-                p = status_progress.get(st, 0.0)
-            progress[node_id] = max(0.0, min(1.0, p))
-            return progress[node_id]
-
-        calc(self.ROOT_ID)
-
-        nodes: dict[str, dict[str, Any]] = {}
-        for node_id, node_depth in depth.items():
-            kids = sorted(self.children.get(node_id, []), key=lambda x: self._order.get(x, 0))
-            node_role = self.role.get(node_id)
-            if not node_role:
-                node_role = "planner" if node_depth == 1 else "subplanner"
-            nodes[node_id] = {
-                "id": node_id,
-                "depth": node_depth,
-                "status": self.status.get(node_id, "pending"),
-                "progress": progress.get(node_id, 0.0),
-                "children": kids,
-                "role": node_role,
-                "desc": self.desc.get(node_id, ""),
-                "started_at": self.started_at.get(node_id),
-                "worker_progress": self.worker_progress.get(node_id, ""),
-                "handoff_metrics": self.handoff_metrics.get(node_id),
-            }
 
-        max_depth = max(depth.values()) if depth else 0
-        return {"root": self.ROOT_ID, "nodes": nodes, "max_depth": max_depth}
+# ---------------------------------------------------------------------------
+# Rate engine -- per-second buckets for throughput series
+# ---------------------------------------------------------------------------
+
+
+class RateEngine:
+    """Per-second totals for a fixed set of series, kept in a ring of buckets.
+
+    Counters (``add``) sum what happened in each second; gauges (``set``) hold
+    the last value seen in a second and carry it forward into idle seconds.
+    Updates are O(1) amortized and reads are O(seconds read), independent of
+    how many events arrived.
+    """
+
+    def __init__(
+        self,
+        counters: Iterable[str],
+        gauges: Iterable[str] = (),
+        seconds: int = RATE_HORIZON_SECONDS,
+    ):
+        self.seconds = seconds
+        self.gauges = frozenset(gauges)
+        self._buckets: dict[str, list[float]] = {
+            name: [0.0] * seconds for name in (*counters, *self.gauges)
+        }
+        self._head = 0  # epoch second of the newest bucket
+
+    def _advance(self, sec: int) -> bool:
+        """Move the head to ``sec``; False if ``sec`` already fell off the ring."""
+        head = self._head
+        if sec <= head:
+            return sec > head - self.seconds
+        n = self.seconds
+        for name, buckets in self._buckets.items():
+            fill = buckets[head % n] if name in self.gauges and head else 0.0
+            for s in range(max(head + 1, sec - n + 1), sec + 1):
+                buckets[s % n] = fill
+        self._head = sec
+        return True
+
+    def add(self, name: str, when: float, amount: float = 1.0):
+        sec = int(when)
+        if self._advance(sec):
+            self._buckets[name][sec % self.seconds] += amount
+
+    def set(self, name: str, when: float, value: float):
+        sec = int(when)
+        if self._advance(sec):
+            self._buckets[name][sec % self.seconds] = value
+
+    def series(self, name: str, now: float, window: int, columns: int) -> list[float]:
+        """Per-second rate (counters) or mean level (gauges) in ``columns`` slices of ``window``."""
+        buckets = self._buckets[name]
+        gauge = name in self.gauges
+        n = self.seconds
+        head = self._head
+        window = min(window, n)
+        end = int(now)
+        start = end - window + 1
+        out = []
+        for col in range(columns):
+            lo = start + col * window // columns
+            hi = start + (col + 1) * window // columns
+            total = 0.0
+            for s in range(lo, hi):
+                if s > head:
+                    total += buckets[head % n] if gauge and head else 0.0
+                elif s > head - n:
+                    total += buckets[s % n]
+            out.append(total / (hi - lo) if hi > lo else 0.0)
+        return out
+
+    def total(self, name: str, now: float, window: int) -> float:
+        """Sum of a counter over the last ``window`` seconds."""
+        return self.series(name, now, window, 1)[0] * min(window, self.seconds)
+
+    def checkpoint(self) -> dict[str, Any]:
+        n = self.seconds
+        head = self._head
+        # Oldest first, so a ring of a different size can restore it.
+        order = [(head - i) % n for i in range(n - 1, -1, -1)]
+        return {
+            "head": head,
+            "series": {name: [b[i] for i in order] for name, b in self._buckets.items()},
+        }
+
+    def restore(self, data: Mapping[str, Any]):
+        head = data["head"]
+        n = self.seconds
+        self._head = head
+        for name, values in data["series"].items():
+            buckets = self._buckets.get(name)
+            if buckets is None:
+                continue
+            buckets[:] = [0.0] * n
+            for i, value in enumerate(reversed(values[-n:])):
+                buckets[(head - i) % n] = value
 
 
 # ---------------------------------------------------------------------------
@@ -211,7 +1398,40 @@ class PlannerTreeState:
 # ---------------------------------------------------------------------------
 
 
+ERROR_EVENTS = "level:error"  # handler key for error-level events with no message handler
+
+
+class IngestEvent(NamedTuple):
+    """One decoded event as seen by ``DashboardState`` handlers."""
+
+    event: dict[str, Any]
+    msg: str
+    data: dict[str, Any]
+    level: str
+    agent_role: str
+    node_role: str | None
+    ts_str: str
+    now: float
+
+
+class EventHandler:
+    """A registered handler plus its call count and cumulative run time."""
+
+    __slots__ = ("message", "name", "fn", "calls", "seconds")
+
+    def __init__(self, message: str, name: str, fn: Callable[[IngestEvent], None]):
+        self.message = message
+        self.name = name
+        self.fn = fn
+        self.calls = 0
+        self.seconds = 0.0
+
+
 class DashboardState:
+    TABS = ("grid", "activity", "throughput", "slots", "branches", "spans")
+    RATE_COUNTERS = ("completions", "failures", "merges", "conflicts", "tokens")
+    RATE_GAUGES = ("active",)
+
     def __init__(self, max_agents: int, total_features: int, cost_rate: float):
         self._lock = threading.RLock()
         self.start_time = time.time()
@@ -232,6 +1452,8 @@ class DashboardState:
         self.max_agents = max_agents
         self.total_features = total_features
         self.visible_levels = 2
+        # Log seconds before a finished subtree is archived (0 = never)
+        self.archive_after = ARCHIVE_AFTER_MINUTES * 60
         self.active_tab = "grid"
         self.in_progress_scroll = 0
         self.completed_scroll = 0
@@ -246,31 +1468,73 @@ class DashboardState:
 
         # Lines added (cumulative)
         self.lines_added = 0
+        # Log time of the first event, epoch seconds (0 until one arrives)
+        self.log_start = 0.0
 
         # Iteration counter
         self.iteration = 0
 
         self.planner_thinking = False
         self.planner_thinking_since = 0.0
-        self.completion_times: deque[float] = deque(maxlen=300)
+        # Run log / trace / LLM detail paths from the "Run files" event
+        self.run_files: dict[str, str] = {}
+
+        # Throughput series, bucketed per second of wall time
+        self.rates = RateEngine(self.RATE_COUNTERS, self.RATE_GAUGES)
+        self.throughput_window = THROUGHPUT_WINDOWS[0][0]
+
+        # Main-loop pacing stats shown in the footer
+        self.ingest_backlog = 0
+        self.ingest_coalesced = 0
+        self.frame_hz = 0.0
+
+        # Replay position/speed shown in the controls bar (None outside --replay)
+        self.replay: Mapping[str, Any] | None = None
+
+        # Message -> handlers dispatch table (see register_handler)
+        self._handlers: dict[str, list[EventHandler]] = {}
+        for message, method in self.EVENT_HANDLERS.items():
+            self.register_handler(message, getattr(self, method), name=method)
+
+        # Begin/end event pairs, timed in log time
+        self.phases = PhaseTracker()
+        self.phases.attach(self)
+
+        # Slot occupancy and queueing, from the tree's status transitions
+        self.utilization = UtilizationTracker()
+
+        # Span trees and LLM call stats from the trace and LLM detail files (fed
+        # by TraceFollower); not checkpointed, since those files are their own
+        # streams and are re-read from their start.
+        self.spans = SpanTracker()
+        self.spans.attach(self)
+        self.llm = LlmCallStats()
+        self.llm.attach(self)
+
+        # Alert rules, re-checked after every batch (see AlertEngine)
+        self.alerts = AlertEngine()
+        self.alerts.attach(self)
+
+        # HH:MM:SS of the last formatted event second
+        self._ts_cache_sec = -1
+        self._ts_cache_str = ""
+
+        # Published snapshots: bumped on every mutation, read lock-free by renderers
+        self._generation = 0
+        self._published: Mapping[str, Any] | None = None
+        self._published_at = 0.0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
 
     def _derive_counts_from_tree(self):
         """Derive task counts from tree state for real-time updates between Monitor polls."""
-        running = 0
-        pending = 0
-        completed = 0
-        failed = 0
-        for node_id, status in self.tree.status.items():
-            if node_id == PlannerTreeState.ROOT_ID:
-                continue
-            if status in ("running", "assigned"):
-                running += 1
-            elif status == "pending":
-                pending += 1
-            elif status == "complete":
-                completed += 1
-            elif status == "failed":
-                failed += 1
+        counts = self.tree.status_counts
+        running = counts.get("running", 0) + counts.get("assigned", 0)
+        pending = counts.get("pending", 0)
+        completed = counts.get("complete", 0)
+        failed = counts.get("failed", 0)
         self.active_workers = running
         self.pending_tasks = pending
         self.completed_tasks = completed
@@ -288,17 +1552,26 @@ class DashboardState:
         with self._lock:
             cap = self._current_level_cap_locked()
             self.visible_levels = max(1, min(cap, self.visible_levels + delta))
+            self._generation += 1
 
     def switch_tab(self, direction: int = 1):
         with self._lock:
-            tabs = ["grid", "activity"]
+            tabs = self.TABS
             i = tabs.index(self.active_tab) if self.active_tab in tabs else 0
             self.active_tab = tabs[(i + direction) % len(tabs)]
+            self._generation += 1
 
     def set_tab(self, tab: str):
         with self._lock:
-            if tab in ("grid", "activity"):
+            if tab in self.TABS:
                 self.active_tab = tab
+                self._generation += 1
+
+    def set_throughput_window(self, window: str):
+        with self._lock:
+            if window in dict(THROUGHPUT_WINDOWS):
+                self.throughput_window = window
+                self._generation += 1
 
     def adjust_tree_scroll(self, pane: str, delta: int):
         with self._lock:
@@ -306,267 +1579,1660 @@ class DashboardState:
                 self.in_progress_scroll = max(0, self.in_progress_scroll + delta)
             elif pane == "completed":
                 self.completed_scroll = max(0, self.completed_scroll + delta)
+            self._generation += 1
+
+    def expand_archives(self, node_ids: Iterable[str]):
+        """Rehydrate archived subtrees (e.g. those shown in the Completed pane)."""
+        with self._lock:
+            if self.tree.expand(node_ids):
+                self._generation += 1
+
+    def collapse_archives(self):
+        with self._lock:
+            self.tree.collapse()
+            self._generation += 1
+
+    def set_loop_stats(self, backlog: int, hz: float, coalesced: int = 0):
+        """Record ingest backlog depth; the frame rate is only reported alongside a backlog."""
+        hz = round(hz, 1) if backlog else 0.0
+        if (backlog, hz, coalesced) == (self.ingest_backlog, self.frame_hz, self.ingest_coalesced):
+            return
+        with self._lock:
+            self.ingest_backlog = backlog
+            self.frame_hz = hz
+            self.ingest_coalesced = coalesced
+            self._generation += 1
+
+    # Ingested (not UI) fields carried by checkpoints, besides tree/activity/completions.
+    CHECKPOINT_FIELDS = (
+        "active_workers",
+        "pending_tasks",
+        "completed_tasks",
+        "failed_tasks",
+        "commits_per_hour",
+        "merge_success_rate",
+        "total_tokens",
+        "estimated_in_flight",
+        "merge_merged",
+        "merge_conflicts",
+        "merge_failed",
+        "lines_added",
+        "log_start",
+        "iteration",
+        "planner_thinking",
+        "planner_thinking_since",
+        "run_files",
+    )
+
+    def checkpoint(self) -> dict[str, Any]:
+        """JSON-serializable copy of everything ingestion has built up."""
+        with self._lock:
+            # Markers are folded mid-batch; take in this batch's transitions so far.
+            self.utilization.drain(self.tree)
+            return {
+                "version": CHECKPOINT_VERSION,
+                "fields": {name: getattr(self, name) for name in self.CHECKPOINT_FIELDS},
+                "activity": [list(entry) for entry in self.activity],
+                "rates": self.rates.checkpoint(),
+                "phases": self.phases.checkpoint(),
+                "utilization": self.utilization.checkpoint(),
+                "tree": self.tree.checkpoint(),
+            }
+
+    def restore(self, ckpt: Mapping[str, Any] | None):
+        """Replace ingested state with ``ckpt``; ``None`` resets it to empty."""
+        if ckpt is None:
+            ckpt = DashboardState(self.max_agents, self.total_features, self.cost_rate).checkpoint()
+        elif ckpt.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(
+                f"checkpoint version {ckpt.get('version')!r} is not {CHECKPOINT_VERSION}"
+            )
+        tree = PlannerTreeState.from_checkpoint(ckpt["tree"])
+        with self._lock:
+            for name, value in ckpt["fields"].items():
+                if name in self.CHECKPOINT_FIELDS:
+                    setattr(self, name, value)
+            self.activity.clear()
+            self.activity.extend(tuple(entry) for entry in ckpt["activity"])
+            self.rates = RateEngine(self.RATE_COUNTERS, self.RATE_GAUGES)
+            self.rates.restore(ckpt["rates"])
+            self.phases.restore(ckpt["phases"])
+            self.utilization.restore(ckpt["utilization"])
+            self.alerts.reset()
+            self.tree = tree
+            self._derive_counts_from_tree()
+            self._generation += 1
+
+    def set_replay(self, status: Mapping[str, Any] | None):
+        if status == self.replay:
+            return
+        with self._lock:
+            self.replay = MappingProxyType(dict(status)) if status is not None else None
+            self._generation += 1
 
     def _current_level_cap_locked(self) -> int:
-        tree_snapshot = self.tree.snapshot()
-        active_depths = [
-            n["depth"]
-            for n in tree_snapshot["nodes"].values()
-            if n["status"] in ("pending", "assigned", "running")
-        ]
-        return max(1, (max(active_depths) if active_depths else 0) + 1)
+        return max(1, self.tree.active_max_depth() + 1)
 
     def ingest(self, event: dict[str, Any]):
+        self.ingest_many((event,))
+
+    def ingest_many(self, events: Iterable[dict[str, Any]]):
+        """Apply a batch of events under one lock acquisition.
+
+        Per-batch work -- deriving task counts and bumping the generation --
+        runs once at the end instead of after every event.
+        """
         with self._lock:
-            msg = event.get("message", "")
-            data = event.get("data") or {}
-            level = event.get("level", "info")
-            agent_role = event.get("agentRole", "")
-            ts = event.get("timestamp", 0)
-            ts_str = (
-                datetime.fromtimestamp(ts / 1000).strftime("%H:%M:%S")
-                if ts
-                else time.strftime("%H:%M:%S")
+            now = time.time()
+            applied = 0
+            for event in events:
+                self._ingest_locked(event, now)
+                applied += 1
+            if applied:
+                self._derive_counts_from_tree()
+                self.rates.set("active", self.tree.clock, self.active_workers)
+                self.utilization.drain(self.tree)
+                self.alerts.evaluate(self, self.tree.clock, now)
+                self._generation += 1
+
+    def check_alerts(self):
+        """Re-check alert rules between batches, so a silent live run still trips them."""
+        with self._lock:
+            if self.alerts.tick(self, time.time()):
+                self._generation += 1
+
+    def _format_ts(self, ts: int, now: float) -> str:
+        """HH:MM:SS for an epoch-ms timestamp, cached per second."""
+        sec = ts // 1000 if ts else int(now)
+        if sec != self._ts_cache_sec:
+            self._ts_cache_sec = sec
+            self._ts_cache_str = datetime.fromtimestamp(sec).strftime("%H:%M:%S")
+        return self._ts_cache_str
+
+    # -- event dispatch -------------------------------------------------------
+
+    def register_handler(
+        self,
+        message: str,
+        handler: Callable[[IngestEvent], None],
+        name: str | None = None,
+    ):
+        """Run ``handler`` for every ``message`` event, after any already registered.
+
+        ``"*"`` matches every event; ``ERROR_EVENTS`` matches error-level events
+        that no message handler claimed.  Handlers run under the state lock.
+        """
+        label = name or getattr(handler, "__qualname__", repr(handler))
+        self._handlers.setdefault(message, []).append(EventHandler(message, label, handler))
+
+    def handler_stats(self) -> list[dict[str, Any]]:
+        """Call count and cumulative time per handler, most expensive first."""
+        with self._lock:
+            rows = [
+                {
+                    "message": h.message,
+                    "handler": h.name,
+                    "calls": h.calls,
+                    "total_ms": h.seconds * 1000.0,
+                    "mean_us": h.seconds / h.calls * 1e6 if h.calls else 0.0,
+                }
+                for handlers in self._handlers.values()
+                for h in handlers
+            ]
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return rows
+
+    def _ingest_locked(self, event: dict[str, Any], now: float):
+        msg = event.get("message", "")
+        data = event.get("data") or {}
+        level = event.get("level", "info")
+        agent_role = event.get("agentRole", "")
+        node_role = self._event_node_role(agent_role)
+
+        # Archival runs on log time, at fixed sweep boundaries, so a state
+        # restored from a checkpoint archives exactly what a full fold would.
+        ts = event.get("timestamp")
+        clock = ts / 1000 if ts else now
+        tree = self.tree
+        if clock > tree.clock:
+            sweep = clock // ARCHIVE_SWEEP_SECONDS
+            due = self.archive_after and sweep > tree.clock // ARCHIVE_SWEEP_SECONDS
+            tree.clock = clock
+            if not self.log_start:
+                self.log_start = clock
+            if due:
+                tree.archive(sweep * ARCHIVE_SWEEP_SECONDS - self.archive_after)
+
+        event_task_id = str(data.get("taskId") or event.get("taskId") or "")
+        if event_task_id:
+            parent_id = (
+                data.get("parentId")
+                or data.get("parentTaskId")
+                or PlannerTreeState.infer_parent_id(event_task_id)
             )
+            self.tree.ensure(event_task_id, parent_id, node_role)
 
-            event_task_id = str(data.get("taskId") or event.get("taskId") or "")
-            node_role = self._event_node_role(agent_role)
+        handlers = self._handlers.get(msg)
+        if handlers is None and level == "error":
+            handlers = self._handlers.get(ERROR_EVENTS)
+        catch_all = self._handlers.get("*")
+        if handlers is None and catch_all is None:
+            return
 
-            if event_task_id:
-                parent_id = (
-                    data.get("parentId")
-                    or data.get("parentTaskId")
-                    or PlannerTreeState.infer_parent_id(event_task_id)
-                )
-                self.tree.ensure(event_task_id, parent_id, node_role)
-
-            # -- Metrics snapshot (periodic from Monitor) -------------------
-            if msg == "Metrics":
-                self.active_workers = data.get("activeWorkers", self.active_workers)
-                self.pending_tasks = data.get("pendingTasks", self.pending_tasks)
-                self.completed_tasks = data.get("completedTasks", self.completed_tasks)
-                self.failed_tasks = data.get("failedTasks", self.failed_tasks)
-                self.commits_per_hour = data.get("commitsPerHour", self.commits_per_hour)
-                self.merge_success_rate = data.get("mergeSuccessRate", self.merge_success_rate)
-                self.total_tokens = data.get("totalTokensUsed", self.total_tokens)
-                self.estimated_in_flight = data.get("estimatedInFlightTokens", 0)
-
-            # -- Per-task lifecycle (from wired TaskQueue.onStatusChange) ----
-            elif msg == "Task status":
-                task_id = data.get("taskId", "")
-                new_st = data.get("to", "")
-                if task_id and new_st:
-                    parent_id = data.get("parentId") or data.get("parentTaskId")
-                    self.tree.update_status(
-                        task_id, new_st, parent_id, node_role, desc=data.get("desc", "")
-                    )
+        ev = IngestEvent(
+            event,
+            msg,
+            data,
+            level,
+            agent_role,
+            node_role,
+            self._format_ts(event.get("timestamp", 0), now),
+            now,
+        )
+        perf = time.perf_counter
+        for group in (handlers, catch_all):
+            if group is None:
+                continue
+            for h in group:
+                t0 = perf()
+                h.fn(ev)
+                h.seconds += perf() - t0
+                h.calls += 1
+
+    # -- Metrics snapshot (periodic from Monitor) ---------------------------
+
+    def _on_metrics(self, ev: IngestEvent):
+        data = ev.data
+        self.active_workers = data.get("activeWorkers", self.active_workers)
+        self.pending_tasks = data.get("pendingTasks", self.pending_tasks)
+        self.completed_tasks = data.get("completedTasks", self.completed_tasks)
+        self.failed_tasks = data.get("failedTasks", self.failed_tasks)
+        self.commits_per_hour = data.get("commitsPerHour", self.commits_per_hour)
+        self.merge_success_rate = data.get("mergeSuccessRate", self.merge_success_rate)
+        self.total_tokens = data.get("totalTokensUsed", self.total_tokens)
+        self.estimated_in_flight = data.get("estimatedInFlightTokens", 0)
+
+    # -- Per-task lifecycle (from wired TaskQueue.onStatusChange) -----------
+
+    def _on_task_status(self, ev: IngestEvent):
+        data = ev.data
+        task_id = data.get("taskId", "")
+        new_st = data.get("to", "")
+        if task_id and new_st:
+            parent_id = data.get("parentId") or data.get("parentTaskId")
+            self.tree.update_status(
+                task_id, new_st, parent_id, ev.node_role, desc=data.get("desc", "")
+            )
 
-            # -- Task created (from Planner callback) -----------------------
-            elif msg == "Task created":
-                task_id = data.get("taskId", "")
-                desc = data.get("desc", "")
-                if task_id:
-                    parent_id = data.get("parentId") or data.get("parentTaskId")
-                    self.tree.update_status(task_id, "pending", parent_id, node_role, desc=desc)
-                self.planner_thinking = False
-                self._feed(ts_str, f"  + {task_id}  {desc[:52]}", "cyan")
-
-            # -- Task completed ---------------------------------------------
-            elif msg == "Task completed":
-                task_id = data.get("taskId", "")
-                status = data.get("status", "")
-                final = "complete" if status in ("complete", "partial") else "failed"
-                if task_id:
-                    parent_id = data.get("parentId") or data.get("parentTaskId")
-                    self.tree.update_status(task_id, final, parent_id, node_role)
-                if task_id and data.get("linesAdded") is not None:
-                    self.tree.handoff_metrics[task_id] = {
-                        "linesAdded": data.get("linesAdded", 0),
-                        "linesRemoved": data.get("linesRemoved", 0),
-                        "filesChanged": data.get("filesChanged", 0),
-                        "tokensUsed": data.get("tokensUsed", 0),
-                        "durationMs": data.get("durationMs", 0),
-                        "summary": (data.get("summary") or "")[:80],
-                    }
-                if final == "complete":
-                    self.completion_times.append(time.time())
-                style = "green" if final == "complete" else "red"
-                self._feed(ts_str, f"  {task_id}  {status}", style)
-
-            # -- Worker dispatched ------------------------------------------
-            elif msg == "Dispatching task to ephemeral sandbox":
-                task_id = data.get("taskId", "")
-                if task_id:
-                    parent_id = data.get("parentId") or data.get("parentTaskId")
-                    self.tree.update_status(task_id, "assigned", parent_id, node_role)
-
-            # -- Subplanner decomposition lifecycle -------------------------
-            elif msg == "Calling LLM for task decomposition":
-                self.planner_thinking = True
-                self.planner_thinking_since = time.time()
-                parent_task_id = data.get("parentTaskId") or event.get("taskId")
-                if parent_task_id:
-                    parent_parent = PlannerTreeState.infer_parent_id(str(parent_task_id))
-                    self.tree.update_status(
-                        str(parent_task_id),
-                        "running",
-                        parent_parent,
-                        "subplanner",
-                    )
+    # -- Task created (from Planner callback) -------------------------------
 
-            elif msg == "Subtask still complex — recursing":
-                subtask_id = data.get("subtaskId", "")
-                if subtask_id:
-                    parent_id = (
-                        data.get("parentId")
-                        or data.get("parentTaskId")
-                        or PlannerTreeState.infer_parent_id(str(subtask_id))
-                    )
-                    self.tree.update_status(str(subtask_id), "running", parent_id, "subplanner")
-
-            elif msg == "Subtask completed by worker":
-                subtask_id = data.get("subtaskId", "")
-                if subtask_id:
-                    parent_id = (
-                        data.get("parentId")
-                        or data.get("parentTaskId")
-                        or PlannerTreeState.infer_parent_id(str(subtask_id))
-                    )
-                    status = data.get("status", "")
-                    final = "complete" if status in ("complete", "partial") else "failed"
-                    self.tree.update_status(str(subtask_id), final, parent_id)
-
-            # -- Merge results (from new planner logging) -------------------
-            elif msg == "Merge result":
-                status = data.get("status", "")
-                branch = data.get("branch", "")[:30]
-                if status == "merged":
-                    self.merge_merged += 1
-                    self._feed(ts_str, f"  >> merged  {branch}", "green")
-                elif status == "conflict":
-                    self.merge_conflicts += 1
-                    self._feed(ts_str, f"  !! conflict  {branch}", "yellow")
-                else:
-                    self.merge_failed += 1
-                    self._feed(ts_str, f"  xx merge fail  {branch}", "red")
-
-            # -- Iteration --------------------------------------------------
-            elif msg == "Iteration complete":
-                self.planner_thinking = False
-                self.iteration = data.get("iteration", self.iteration)
-                n = data.get("tasks", 0)
-                self._feed(ts_str, f"  -- iteration {self.iteration}  ({n} tasks)", "blue")
-
-            # -- Reconciler -------------------------------------------------
-            elif msg == "Reconciler created fix tasks":
-                c = data.get("count", 0)
-                self._feed(ts_str, f"  reconciler  {c} fix tasks", "yellow")
-
-            elif msg == "Sweep check results":
-                ok = data.get("buildOk") and data.get("testsOk")
-                label = "all green" if ok else "NEEDS FIX"
-                self._feed(ts_str, f"  sweep: {label}", "green" if ok else "red")
-
-            # -- Worker progress (streamed from Modal sandboxes) ----------
-            elif msg == "Worker progress":
-                task_id = data.get("taskId", "")
-                phase = data.get("phase", "")
-                detail = (data.get("detail") or "")[:60]
-                if task_id:
-                    self.tree.worker_progress[task_id] = detail
-                if phase == "sandbox":
-                    self._feed(ts_str, f"  \u2699 {task_id}  {detail}", "cyan")
-                else:
-                    self._feed(ts_str, f"  \u25b8 {task_id}  {detail}", "dim")
-
-            # -- Timeouts / errors ------------------------------------------
-            elif msg == "Worker timed out":
-                tid = data.get("taskId", "")
-                if tid:
-                    self.tree.update_status(
-                        tid,
-                        "failed",
-                        data.get("parentId") or data.get("parentTaskId"),
-                        node_role,
-                    )
-                self._feed(ts_str, f"  TIMEOUT  {tid}", "bold red")
+    def _on_task_created(self, ev: IngestEvent):
+        data = ev.data
+        task_id = data.get("taskId", "")
+        desc = data.get("desc", "")
+        if task_id:
+            parent_id = data.get("parentId") or data.get("parentTaskId")
+            self.tree.update_status(task_id, "pending", parent_id, ev.node_role, desc=desc)
+        self.planner_thinking = False
+        self._feed(ev.ts_str, f"  + {task_id}  {desc[:52]}", "cyan")
+
+    # -- Task completed -----------------------------------------------------
+
+    def _on_task_completed(self, ev: IngestEvent):
+        data = ev.data
+        task_id = data.get("taskId", "")
+        status = data.get("status", "")
+        final = "complete" if status in ("complete", "partial") else "failed"
+        if task_id:
+            parent_id = data.get("parentId") or data.get("parentTaskId")
+            self.tree.update_status(task_id, final, parent_id, ev.node_role)
+        if task_id and data.get("linesAdded") is not None:
+            self.tree.set_handoff_metrics(
+                task_id,
+                {
+                    "linesAdded": data.get("linesAdded", 0),
+                    "linesRemoved": data.get("linesRemoved", 0),
+                    "filesChanged": data.get("filesChanged", 0),
+                    "tokensUsed": data.get("tokensUsed", 0),
+                    "durationMs": data.get("durationMs", 0),
+                    "summary": (data.get("summary") or "")[:80],
+                },
+            )
+        rates, clock = self.rates, self.tree.clock
+        rates.add("completions" if final == "complete" else "failures", clock)
+        tokens = data.get("tokensUsed")
+        if tokens:
+            rates.add("tokens", clock, tokens)
+        style = "green" if final == "complete" else "red"
+        self._feed(ev.ts_str, f"  {task_id}  {status}", style)
+
+    # -- Worker dispatched --------------------------------------------------
+
+    def _on_dispatch(self, ev: IngestEvent):
+        data = ev.data
+        task_id = data.get("taskId", "")
+        if task_id:
+            parent_id = data.get("parentId") or data.get("parentTaskId")
+            self.tree.update_status(task_id, "assigned", parent_id, ev.node_role)
+
+    # -- Subplanner decomposition lifecycle ---------------------------------
+
+    def _on_decomposition(self, ev: IngestEvent):
+        self.planner_thinking = True
+        self.planner_thinking_since = ev.now
+        parent_task_id = ev.data.get("parentTaskId") or ev.event.get("taskId")
+        if parent_task_id:
+            parent_parent = PlannerTreeState.infer_parent_id(str(parent_task_id))
+            self.tree.update_status(
+                str(parent_task_id),
+                "running",
+                parent_parent,
+                "subplanner",
+            )
+
+    def _on_subtask_recursing(self, ev: IngestEvent):
+        data = ev.data
+        subtask_id = data.get("subtaskId", "")
+        if subtask_id:
+            parent_id = (
+                data.get("parentId")
+                or data.get("parentTaskId")
+                or PlannerTreeState.infer_parent_id(str(subtask_id))
+            )
+            self.tree.update_status(str(subtask_id), "running", parent_id, "subplanner")
+
+    def _on_subtask_completed(self, ev: IngestEvent):
+        data = ev.data
+        subtask_id = data.get("subtaskId", "")
+        if subtask_id:
+            parent_id = (
+                data.get("parentId")
+                or data.get("parentTaskId")
+                or PlannerTreeState.infer_parent_id(str(subtask_id))
+            )
+            status = data.get("status", "")
+            final = "complete" if status in ("complete", "partial") else "failed"
+            self.tree.update_status(str(subtask_id), final, parent_id)
+
+    # -- Merge results (from new planner logging) ---------------------------
+
+    def _on_merge_result(self, ev: IngestEvent):
+        status = ev.data.get("status", "")
+        branch = ev.data.get("branch", "")[:30]
+        if status == "merged":
+            self.merge_merged += 1
+            self.tree.record_merge(ev.data.get("branch", ""))
+            self.rates.add("merges", self.tree.clock)
+            self._feed(ev.ts_str, f"  >> merged  {branch}", "green")
+        elif status == "conflict":
+            self.merge_conflicts += 1
+            self.rates.add("conflicts", self.tree.clock)
+            self._feed(ev.ts_str, f"  !! conflict  {branch}", "yellow")
+        else:
+            self.merge_failed += 1
+            self._feed(ev.ts_str, f"  xx merge fail  {branch}", "red")
+
+    # -- Iteration ----------------------------------------------------------
+
+    def _on_iteration(self, ev: IngestEvent):
+        self.planner_thinking = False
+        self.iteration = ev.data.get("iteration", self.iteration)
+        n = ev.data.get("tasks", 0)
+        self._feed(ev.ts_str, f"  -- iteration {self.iteration}  ({n} tasks)", "blue")
+
+    # -- Reconciler ---------------------------------------------------------
+
+    def _on_fix_tasks(self, ev: IngestEvent):
+        c = ev.data.get("count", 0)
+        self._feed(ev.ts_str, f"  reconciler  {c} fix tasks", "yellow")
+
+    def _on_sweep(self, ev: IngestEvent):
+        ok = ev.data.get("buildOk") and ev.data.get("testsOk")
+        label = "all green" if ok else "NEEDS FIX"
+        self._feed(ev.ts_str, f"  sweep: {label}", "green" if ok else "red")
+
+    # -- Worker progress (streamed from Modal sandboxes) --------------------
+
+    def _on_worker_progress(self, ev: IngestEvent):
+        task_id = ev.data.get("taskId", "")
+        phase = ev.data.get("phase", "")
+        detail = (ev.data.get("detail") or "")[:60]
+        if task_id:
+            self.tree.set_worker_progress(task_id, detail)
+        if phase == "sandbox":
+            self._feed(ev.ts_str, f"  \u2699 {task_id}  {detail}", "cyan")
+        else:
+            self._feed(ev.ts_str, f"  \u25b8 {task_id}  {detail}", "dim")
+
+    # -- Run files (log, trace and LLM detail paths) -------------------------
+
+    def _on_run_files(self, ev: IngestEvent):
+        self.run_files = {
+            key: str(ev.data[key])
+            for key in ("logFile", "traceFile", "llmDetailFile")
+            if ev.data.get(key)
+        }
+
+    # -- Timeouts / errors --------------------------------------------------
+
+    def _on_worker_timeout(self, ev: IngestEvent):
+        tid = ev.data.get("taskId", "")
+        if tid:
+            self.tree.update_status(
+                tid,
+                "failed",
+                ev.data.get("parentId") or ev.data.get("parentTaskId"),
+                ev.node_role,
+            )
+        self.rates.add("failures", self.tree.clock)
+        self._feed(ev.ts_str, f"  TIMEOUT  {tid}", "bold red")
+
+    # -- Checkpoint restore (injected by follow/replay readers) --------------
+
+    def _on_restore(self, ev: IngestEvent):
+        self.restore(ev.data.get("checkpoint"))
+
+    def _on_error(self, ev: IngestEvent):
+        if ev.agent_role == "planner" or ev.agent_role == "root-planner":
+            self.planner_thinking = False
+        self._feed(ev.ts_str, f"  ERR  {ev.msg[:60]}", "bold red")
+
+    # Built-in message handlers, bound per instance in __init__.
+    EVENT_HANDLERS: dict[str, str] = {
+        "Metrics": "_on_metrics",
+        "Task status": "_on_task_status",
+        "Task created": "_on_task_created",
+        "Task completed": "_on_task_completed",
+        "Dispatching task to ephemeral sandbox": "_on_dispatch",
+        "Calling LLM for task decomposition": "_on_decomposition",
+        "Subtask still complex — recursing": "_on_subtask_recursing",
+        "Subtask completed by worker": "_on_subtask_completed",
+        "Merge result": "_on_merge_result",
+        "Iteration complete": "_on_iteration",
+        "Reconciler created fix tasks": "_on_fix_tasks",
+        "Sweep check results": "_on_sweep",
+        "Worker progress": "_on_worker_progress",
+        "Worker timed out": "_on_worker_timeout",
+        "Run files": "_on_run_files",
+        RESTORE_MESSAGE: "_on_restore",
+        ERROR_EVENTS: "_on_error",
+    }
+
+    def _feed(self, ts: str, msg: str, style: str):
+        self.activity.appendleft((ts, msg, style))
+
+    # -- snapshot for renderers ---------------------------------------------
+
+    def latest(self) -> Mapping[str, Any]:
+        """Most recently published snapshot, possibly stale; never takes the lock."""
+        return self._published or self.snap()
+
+    def snap(self) -> Mapping[str, Any]:
+        """Publish an immutable snapshot, reusing the previous one if nothing changed.
+
+        The same object is returned while the generation is unchanged and the
+        clock-driven fields (elapsed, velocity) are fresh, so callers can skip
+        re-rendering with an identity check.
+        """
+        published = self._published
+        now = time.time()
+        if (
+            published is not None
+            and published["generation"] == self._generation
+            and now - self._published_at < SNAPSHOT_CLOCK_INTERVAL
+        ):
+            return published
+
+        with self._lock:
+            generation = self._generation
+            tree_snapshot = self.tree.snapshot()
+            tree_snapshot["active_max_depth"] = self.tree.active_max_depth()
+            cap = max(1, tree_snapshot["active_max_depth"] + 1)
+            self.visible_levels = max(1, min(self.visible_levels, cap))
+            total_merge = self.merge_merged + self.merge_conflicts + self.merge_failed
+            total_tasks = (
+                self.active_workers + self.pending_tasks + self.completed_tasks + self.failed_tasks
+            )
+            fields: dict[str, Any] = {
+                "generation": generation,
+                "elapsed": now - self.start_time,
+                "log_elapsed": self.tree.clock - self.log_start if self.log_start else 0.0,
+                "active": self.active_workers,
+                "pending": self.pending_tasks,
+                "completed": self.completed_tasks,
+                "failed": self.failed_tasks,
+                "cph": self.commits_per_hour,
+                "merge_rate": self.merge_success_rate,
+                "tokens": self.total_tokens,
+                "estimated_in_flight": self.estimated_in_flight,
+                "cost": self.total_tokens / 1000.0 * self.cost_rate,
+                "max_agents": self.max_agents,
+                "total_tasks": total_tasks,
+                "merge_merged": self.merge_merged,
+                "merge_conflicts": self.merge_conflicts,
+                "merge_failed": self.merge_failed,
+                "merge_total": total_merge,
+                "activity": tuple(self.activity),
+                "iteration": self.iteration,
+                "tree": MappingProxyType(tree_snapshot),
+                "visible_levels": self.visible_levels,
+                "active_tab": self.active_tab,
+                "in_progress_scroll": self.in_progress_scroll,
+                "completed_scroll": self.completed_scroll,
+                "planner_thinking": self.planner_thinking,
+                "planner_thinking_since": self.planner_thinking_since,
+                "backlog": self.ingest_backlog,
+                "coalesced": self.ingest_coalesced,
+                "frame_hz": self.frame_hz,
+                "replay": self.replay,
+                "throughput_window": self.throughput_window,
+            }
+            # Rates are on log time, like phases and utilization, so a replay
+            # or catch-up spreads them over the run instead of one second.
+            rates, clock = self.rates, self.tree.clock
+            fields["recent_velocity"] = rates.total("completions", clock, 60)
+            fields["sparkline"] = self._sparkline(rates.series("completions", clock, 300, 10))
+            if self.active_tab == "throughput":
+                fields["throughput"] = self._throughput(clock)
+            elif self.active_tab == "slots":
+                fields["utilization"] = self._utilization()
+            elif self.active_tab == "branches":
+                fields["branches"] = tuple(self.tree.rank_subtrees(BRANCH_RANK_COUNT))
+            elif self.active_tab == "spans":
+                fields["spans"] = self.spans.summary()
+                fields["llm"] = self.llm.summary()
+            fields["stragglers"] = tuple(self.tree.oldest_in_flight(STRAGGLER_COUNT))
+            fields["phases"] = self.phases.summary()
+            fields["alerts"] = self.alerts.summary()
+            fields["alerts_fired"] = self.alerts.fired_total
+        snapshot = MappingProxyType(fields)
+        self._published = snapshot
+        self._published_at = now
+        return snapshot
+
+    def _throughput(self, clock: float) -> MappingProxyType:
+        """Chart columns and window totals of every rate series for the selected window."""
+        window = dict(THROUGHPUT_WINDOWS)[self.throughput_window]
+        rates = self.rates
+        series = {}
+        for name in (*self.RATE_COUNTERS, *self.RATE_GAUGES):
+            columns = rates.series(name, clock, window, THROUGHPUT_COLUMNS)
+            series[name] = {
+                "columns": tuple(columns),
+                "current": columns[-1],
+                "mean": sum(columns) / len(columns),
+                "peak": max(columns),
+            }
+        return MappingProxyType({"window": self.throughput_window, "series": series})
+
+    def _utilization(self, window: str | None = None) -> MappingProxyType:
+        """Slot occupancy and queueing over a ``THROUGHPUT_WINDOWS`` window (default: selected)."""
+        window = window or self.throughput_window
+        seconds = dict(THROUGHPUT_WINDOWS)[window]
+        summary = self.utilization.summary(self.tree.clock, seconds, self.max_agents)
+        summary["window"] = window
+        return MappingProxyType(summary)
+
+    def utilization_summary(self, window: str = THROUGHPUT_WINDOWS[-1][0]) -> Mapping[str, Any]:
+        with self._lock:
+            return self._utilization(window)
+
+    def run_summary(self) -> dict[str, Any]:
+        """End-of-run figures that are not in snapshots, read under the ingest lock."""
+        with self._lock:
+            return {
+                "status_counts": dict(self.tree.status_counts),
+                "llm": self.llm.summary(),
+                "branches": self.tree.rank_subtrees(BRANCH_RANK_COUNT),
+            }
+
+    @staticmethod
+    def _sparkline(values: list[float]) -> str:
+        chars = " ▁▂▃▄▅▆▇█"
+        mx = max(values) or 1
+        return "".join(chars[min(len(chars) - 1, int(v / mx * (len(chars) - 1)))] for v in values)
+
+
+# ---------------------------------------------------------------------------
+# Phase latency -- begin/end event pairing with streaming histograms
+# ---------------------------------------------------------------------------
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (HDR style, ~2% relative error).
+
+    Memory and quantile reads are bounded by the number of occupied buckets,
+    which grows with the log of the observed range rather than the sample count.
+    """
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    GROWTH = 1.04
+    _LOG_GROWTH = math.log(GROWTH)
+
+    def __init__(self):
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, ms: float):
+        key = int(math.log(ms) / self._LOG_GROWTH) if ms >= 1.0 else 0
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def quantiles(self, qs: Iterable[float]) -> list[float]:
+        """Bucket midpoints at each quantile in ``qs`` (ascending)."""
+        out = []
+        if not self.count:
+            return [0.0 for _ in qs]
+        items = sorted(self.buckets.items())
+        seen = 0
+        i = 0
+        for q in qs:
+            rank = q * self.count
+            while i < len(items) - 1 and seen + items[i][1] < rank:
+                seen += items[i][1]
+                i += 1
+            key = items[i][0]
+            mid = self.GROWTH ** (key + 0.5) if key else 1.0
+            out.append(min(mid, self.max))
+        return out
+
+    def to_json(self) -> dict[str, Any]:
+        # A copy: checkpoints are serialized on another thread while ingest goes on.
+        return {
+            "buckets": dict(self.buckets),
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Any]) -> LatencyHistogram:
+        hist = cls()
+        hist.buckets = {int(k): v for k, v in data["buckets"].items()}
+        hist.count = data["count"]
+        hist.total = data["total"]
+        hist.max = data["max"]
+        return hist
+
+
+class PhaseEdge(NamedTuple):
+    """Events that open or close a phase: a message, optionally narrowed by ``when``.
+
+    The pairing key is the first non-empty ``keys`` field of the event data
+    (then the event's own ``taskId``); events with none share the key ``""``.
+    """
+
+    message: str
+    keys: tuple[str, ...] = ("taskId",)
+    when: Callable[[Mapping[str, Any]], bool] | None = None
+
+
+class PhaseSpec(NamedTuple):
+    name: str
+    start: PhaseEdge
+    end: PhaseEdge
+
+
+def _sweep_green(data: Mapping[str, Any]) -> bool:
+    return bool(
+        data.get("buildOk", True)
+        and data.get("testsOk", True)
+        and not data.get("hasConflictMarkers")
+    )
+
+
+PHASES = (
+    PhaseSpec(
+        "planner",
+        PhaseEdge("Calling LLM for task decomposition", ("parentTaskId",)),
+        PhaseEdge("Task created", ("parentId", "parentTaskId")),
+    ),
+    PhaseSpec(
+        "sandbox",
+        PhaseEdge("Dispatching task to ephemeral sandbox"),
+        PhaseEdge("Task completed"),
+    ),
+    PhaseSpec(
+        "worker setup",
+        PhaseEdge("Worker progress", when=lambda d: d.get("phase") == "sandbox"),
+        PhaseEdge("Worker progress", when=lambda d: d.get("phase") == "execution"),
+    ),
+    PhaseSpec(
+        "worker execution",
+        PhaseEdge("Worker progress", when=lambda d: d.get("phase") == "execution"),
+        PhaseEdge("Task completed"),
+    ),
+    PhaseSpec(
+        "sweep red->green",
+        PhaseEdge("Sweep check results", (), lambda d: not _sweep_green(d)),
+        PhaseEdge("Sweep check results", (), _sweep_green),
+    ),
+)
+
+
+class PhaseTracker:
+    """Pairs phase start and end events by key and records their log-time latency.
+
+    Handlers are registered on a ``DashboardState`` per message, so events no
+    phase mentions cost nothing.  Only the first start per key is kept until
+    its end arrives; at most ``PHASE_PENDING_LIMIT`` starts are held per phase,
+    the oldest dropped first.
+    """
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, specs: Iterable[PhaseSpec] = PHASES):
+        self.specs = tuple(specs)
+        self.histograms = {spec.name: LatencyHistogram() for spec in self.specs}
+        self._open: dict[str, dict[str, int]] = {spec.name: {} for spec in self.specs}
+        # message -> (phase, edge, is_start); ends are listed first so an event
+        # that closes one phase and opens another (or the same) does both.
+        self._edges: dict[str, list[tuple[str, PhaseEdge, bool]]] = {}
+        for spec in self.specs:
+            self._edges.setdefault(spec.end.message, []).insert(0, (spec.name, spec.end, False))
+            self._edges.setdefault(spec.start.message, []).append((spec.name, spec.start, True))
+
+    def attach(self, state: DashboardState):
+        for message in self._edges:
+            state.register_handler(message, self.on_event, name="PhaseTracker")
+
+    @staticmethod
+    def _key(edge: PhaseEdge, ev: IngestEvent) -> str:
+        data = ev.data
+        for field in edge.keys:
+            value = data.get(field)
+            if value:
+                return str(value)
+        if edge.keys:
+            return str(ev.event.get("taskId") or "")
+        return ""
+
+    def on_event(self, ev: IngestEvent):
+        ts = ev.event.get("timestamp") or int(ev.now * 1000)
+        for phase, edge, is_start in self._edges[ev.msg]:
+            if edge.when is not None and not edge.when(ev.data):
+                continue
+            key = self._key(edge, ev)
+            pending = self._open[phase]
+            if is_start:
+                if key not in pending:
+                    pending[key] = ts
+                    if len(pending) > PHASE_PENDING_LIMIT:
+                        del pending[next(iter(pending))]
+            else:
+                started = pending.pop(key, None)
+                if started is not None:
+                    self.histograms[phase].record(max(0, ts - started))
+
+    def summary(self) -> tuple[dict[str, Any], ...]:
+        rows = []
+        for spec in self.specs:
+            hist = self.histograms[spec.name]
+            p50, p95, p99 = hist.quantiles(self.QUANTILES)
+            rows.append(
+                {
+                    "phase": spec.name,
+                    "count": hist.count,
+                    "open": len(self._open[spec.name]),
+                    "p50_ms": round(p50),
+                    "p95_ms": round(p95),
+                    "p99_ms": round(p99),
+                    "max_ms": round(hist.max),
+                }
+            )
+        return tuple(rows)
+
+    def checkpoint(self) -> dict[str, Any]:
+        return {
+            "histograms": {name: h.to_json() for name, h in self.histograms.items()},
+            "open": {name: dict(pending) for name, pending in self._open.items()},
+        }
+
+    def restore(self, data: Mapping[str, Any] | None):
+        """Replace recorded latencies and open starts; ``None`` clears them."""
+        for spec in self.specs:
+            self.histograms[spec.name] = LatencyHistogram()
+            self._open[spec.name] = {}
+        if data is None:
+            return
+        for name, hist in data["histograms"].items():
+            if name in self.histograms:
+                self.histograms[name] = LatencyHistogram.from_json(hist)
+        for name, pending in data["open"].items():
+            if name in self._open:
+                self._open[name] = dict(pending)
+
+
+# ---------------------------------------------------------------------------
+# Slot utilization -- occupancy and queueing from task status transitions
+# ---------------------------------------------------------------------------
+
+
+class UtilizationTracker:
+    """Slot occupancy, arrivals, pending wait and service time, on log time.
+
+    Fed from ``PlannerTreeState.transitions`` once per ingested batch: a task
+    arrives when it first becomes pending (or is dispatched without queueing),
+    waits until it is assigned/running, and is served until it turns terminal.
+    Windowed totals live in a ``RateEngine`` keyed by log seconds, so means
+    over a window follow Little's law: L = arrival rate x (wait + service).
+    """
+
+    COUNTERS = ("arrivals", "dispatches", "departures", "wait_s", "service_s")
+    GAUGES = ("busy", "queued")
+    QUANTILES = (0.5, 0.95)
+
+    def __init__(self):
+        self.rates = RateEngine(self.COUNTERS, self.GAUGES)
+        self.wait = LatencyHistogram()
+        self.service = LatencyHistogram()
+        self._queued_at: dict[str, float] = {}
+        self._busy_at: dict[str, float] = {}
+        self._first = 0.0  # log time of the first transition
+        self._clock = 0.0
+
+    def drain(self, tree: PlannerTreeState):
+        """Consume the tree's pending status transitions."""
+        transitions = tree.transitions
+        if not transitions:
+            return
+        pending = PlannerTreeState._PENDING
+        in_flight = PlannerTreeState._IN_FLIGHT_CODES
+        terminal = PlannerTreeState._TERMINAL_CODES
+        rates = self.rates
+        queued_at, busy_at = self._queued_at, self._busy_at
+        # Levels come from the tree, which also counts tasks seen before a
+        # restore; walk back to where this batch started, then replay it.
+        counts = tree.status_counts
+        busy = counts.get("assigned", 0) + counts.get("running", 0)
+        queued = counts.get("pending", 0)
+        for _, _, old, new in transitions:
+            busy -= (new in in_flight) - (old in in_flight)
+            queued -= (new == pending) - (old == pending)
+        for clock, task_id, old, new in transitions:
+            busy += (new in in_flight) - (old in in_flight)
+            queued += (new == pending) - (old == pending)
+            if new == pending:
+                if old not in in_flight:
+                    rates.add("arrivals", clock)
+                queued_at[task_id] = clock
+                busy_at.pop(task_id, None)
+            elif new in in_flight and old not in in_flight:
+                since = queued_at.pop(task_id, None)
+                if since is None and old not in terminal:
+                    rates.add("arrivals", clock)  # dispatched without queueing
+                    since = clock
+                if since is not None:
+                    waited = max(0.0, clock - since)
+                    rates.add("dispatches", clock)
+                    rates.add("wait_s", clock, waited)
+                    self.wait.record(waited * 1000)
+                busy_at[task_id] = clock
+            elif new in terminal:
+                queued_at.pop(task_id, None)
+                started = busy_at.pop(task_id, None)
+                if started is not None:
+                    served = max(0.0, clock - started)
+                    rates.add("departures", clock)
+                    rates.add("service_s", clock, served)
+                    self.service.record(served * 1000)
+            if not self._first:
+                self._first = clock
+            if clock >= self._clock:
+                self._clock = clock
+                rates.set("busy", clock, busy)
+                rates.set("queued", clock, queued)
+        transitions.clear()
+
+    def summary(self, clock: float, window: int, slots: int) -> dict[str, Any]:
+        """Occupancy and queueing over the last ``window`` log seconds before ``clock``.
+
+        The window is clipped to the time since the first transition, so a
+        young run is not averaged against seconds before it started.
+        """
+        rates = self.rates
+        window = max(1, min(window, rates.seconds, int(clock - self._first) + 1))
+        busy = rates.series("busy", clock, window, THROUGHPUT_COLUMNS)
+        queued = rates.series("queued", clock, window, THROUGHPUT_COLUMNS)
+        totals = {name: rates.total(name, clock, window) for name in self.COUNTERS}
+        mean_busy = sum(busy) / len(busy)
+        mean_queued = sum(queued) / len(queued)
+        arrival_rate = totals["arrivals"] / window  # tasks/s
+        mean_wait = totals["wait_s"] / totals["dispatches"] if totals["dispatches"] else 0.0
+        mean_service = totals["service_s"] / totals["departures"] if totals["departures"] else 0.0
+        utilization = mean_busy / slots if slots else 0.0
+        wait_p50, wait_p95 = self.wait.quantiles(self.QUANTILES)
+        service_p50, service_p95 = self.service.quantiles(self.QUANTILES)
+        if not totals["arrivals"] and not mean_busy:
+            bound = "idle"
+        elif utilization >= 0.9 and mean_queued >= 1:
+            bound = "capacity"  # slots full and work waiting for them
+        elif utilization < 0.75 and mean_queued < 1:
+            bound = "planner"  # free slots and nothing to put in them
+        elif utilization < 0.75:
+            bound = "dispatch"  # free slots while tasks sit pending
+        else:
+            bound = "balanced"
+        return {
+            "slots": slots,
+            "busy_columns": tuple(busy),
+            "queued_columns": tuple(queued),
+            "busy": busy[-1],
+            "mean_busy": mean_busy,
+            "peak_busy": max(busy),
+            "idle_slots": max(0.0, slots - mean_busy),
+            "utilization": utilization,
+            "mean_queued": mean_queued,
+            "arrivals_per_min": arrival_rate * 60,
+            "departures_per_min": totals["departures"] / window * 60,
+            "mean_wait_ms": round(mean_wait * 1000),
+            "mean_service_ms": round(mean_service * 1000),
+            "wait_p50_ms": round(wait_p50),
+            "wait_p95_ms": round(wait_p95),
+            "service_p50_ms": round(service_p50),
+            "service_p95_ms": round(service_p95),
+            # Little's law: tasks in the system predicted from arrivals, vs. observed
+            "offered_slots": arrival_rate * mean_service,
+            "little_l": arrival_rate * (mean_wait + mean_service),
+            "observed_l": mean_busy + mean_queued,
+            "bound": bound,
+        }
+
+    def checkpoint(self) -> dict[str, Any]:
+        return {
+            "rates": self.rates.checkpoint(),
+            "wait": self.wait.to_json(),
+            "service": self.service.to_json(),
+            "queued_at": dict(self._queued_at),
+            "busy_at": dict(self._busy_at),
+            "first": self._first,
+            "clock": self._clock,
+        }
+
+    def restore(self, data: Mapping[str, Any] | None):
+        """Replace recorded history; ``None`` clears it."""
+        self.rates = RateEngine(self.COUNTERS, self.GAUGES)
+        self.wait = LatencyHistogram()
+        self.service = LatencyHistogram()
+        self._queued_at = {}
+        self._busy_at = {}
+        self._first = 0.0
+        self._clock = 0.0
+        if data is None:
+            return
+        self.rates.restore(data["rates"])
+        self.wait = LatencyHistogram.from_json(data["wait"])
+        self.service = LatencyHistogram.from_json(data["service"])
+        self._queued_at = dict(data["queued_at"])
+        self._busy_at = dict(data["busy_at"])
+        self._first = data["first"]
+        self._clock = data["clock"]
+
+
+# ---------------------------------------------------------------------------
+# Trace spans -- incremental span trees from the tracer's trace-*.ndjson
+# ---------------------------------------------------------------------------
+
+
+class _OpenSpan:
+    __slots__ = ("name", "parent", "start", "task", "child_ms", "last_mark")
+
+    def __init__(self, name: str, parent: str, start: int, task: str):
+        self.name = name
+        self.parent = parent
+        self.start = start
+        self.task = task
+        self.child_ms = 0.0
+        self.last_mark = start
+
+
+class SpanTracker:
+    """Folds tracer span events into per-name totals and per-task timelines.
+
+    Open spans are linked to their parent by span ID; when a span ends its
+    duration is charged to the parent, so self time (duration minus time in
+    ended children) is exact for properly nested spans.  Instant events on a
+    span split it into segments named after the event, which turns
+    ``worker.execute`` into sandbox created -> cloned -> worker started ->
+    pushed.  Open spans and task timelines are bounded by ``TRACE_OPEN_LIMIT``
+    and ``TRACE_TASK_LIMIT``.
+    """
+
+    def __init__(self):
+        self._open: dict[str, _OpenSpan] = {}
+        self.events = 0
+        # span name -> [count, total ms, self ms, max ms]
+        self.by_name: dict[str, list[float]] = {}
+        # "<span> > <event>" -> [count, total ms, max ms]
+        self.segments: dict[str, list[float]] = {}
+        # task ID -> {"segments": [(label, ms)], "spans": {name: ms}, "open": n}
+        self.tasks: dict[str, dict[str, Any]] = {}
+
+    def attach(self, state: DashboardState):
+        state.register_handler(TRACE_MESSAGE, self.on_event, name="SpanTracker")
+
+    def _task(self, task_id: str) -> dict[str, Any]:
+        entry = self.tasks.pop(task_id, None)
+        if entry is None:
+            entry = {"segments": [], "spans": {}, "open": 0}
+            if len(self.tasks) >= TRACE_TASK_LIMIT:
+                del self.tasks[next(iter(self.tasks))]
+        self.tasks[task_id] = entry  # most recently touched last
+        return entry
+
+    def _segment(self, span: _OpenSpan, label: str, ts: int):
+        ms = max(0, ts - span.last_mark)
+        span.last_mark = ts
+        stats = self.segments.setdefault(f"{span.name} > {label}", [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += ms
+        stats[2] = max(stats[2], ms)
+        if span.task:
+            self._task(span.task)["segments"].append((label, ms))
+
+    def on_event(self, ev: IngestEvent):
+        span = ev.data.get("span")
+        if not span:
+            return
+        self.events += 1
+        trace = span.get("trace") or {}
+        span_id = trace.get("spanId", "")
+        kind = span.get("spanKind")
+        ts = span.get("timestamp") or 0
+        if kind == "begin":
+            task = span.get("taskId") or ""
+            self._open[span_id] = _OpenSpan(
+                span.get("spanName", ""), trace.get("parentSpanId") or "", ts, task
+            )
+            if len(self._open) > TRACE_OPEN_LIMIT:
+                del self._open[next(iter(self._open))]  # never ended; oldest first
+            if task:
+                self._task(task)["open"] += 1
+        elif kind == "event":
+            rec = self._open.get(span_id)
+            if rec is not None:
+                self._segment(rec, span.get("spanName", ""), ts)
+        elif kind == "end":
+            rec = self._open.pop(span_id, None)
+            if rec is None:
+                return
+            duration = span.get("durationMs")
+            if duration is None:
+                duration = max(0, ts - rec.start)
+            if rec.last_mark != rec.start:
+                self._segment(rec, "end", rec.start + duration)
+            parent = self._open.get(rec.parent)
+            if parent is not None:
+                parent.child_ms += duration
+            stats = self.by_name.setdefault(rec.name, [0, 0.0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] += max(0.0, duration - rec.child_ms)
+            stats[3] = max(stats[3], duration)
+            if rec.task:
+                entry = self._task(rec.task)
+                entry["open"] = max(0, entry["open"] - 1)
+                entry["spans"][rec.name] = entry["spans"].get(rec.name, 0) + duration
+
+    def summary(self, tasks: int = 8) -> MappingProxyType:
+        """Span names by self time, segment totals and the most recent task timelines."""
+        total_self = sum(stats[2] for stats in self.by_name.values()) or 1.0
+        names = [
+            {
+                "name": name,
+                "count": int(count),
+                "total_ms": total,
+                "self_ms": self_ms,
+                "self_share": self_ms / total_self,
+                "mean_ms": total / count,
+                "max_ms": peak,
+            }
+            for name, (count, total, self_ms, peak) in self.by_name.items()
+        ]
+        names.sort(key=lambda row: row["self_ms"], reverse=True)
+        segments = [
+            {"name": name, "count": int(count), "mean_ms": total / count, "max_ms": peak}
+            for name, (count, total, peak) in self.segments.items()
+        ]
+        segments.sort(key=lambda row: row["mean_ms"], reverse=True)
+        recent = [
+            {
+                "task": task_id,
+                "open": entry["open"],
+                "segments": tuple(entry["segments"]),
+                "spans": dict(entry["spans"]),
+            }
+            for task_id, entry in list(self.tasks.items())[-tasks:]
+        ]
+        recent.reverse()
+        return MappingProxyType(
+            {
+                "events": self.events,
+                "open": len(self._open),
+                "names": tuple(names),
+                "segments": tuple(segments),
+                "tasks": tuple(recent),
+            }
+        )
+
+
+# ---------------------------------------------------------------------------
+# LLM calls -- per model/endpoint analytics from llm.request spans and llmDetailFile
+# ---------------------------------------------------------------------------
+
+
+def summarize_llm_detail(entry: Mapping[str, Any]) -> dict[str, Any]:
+    """The sizes of one llmDetailFile entry, without its message bodies."""
+    messages = entry.get("messages") or []
+    response = entry.get("response")
+    return {
+        "spanId": entry.get("spanId", ""),
+        "timestamp": entry.get("timestamp"),
+        "messages": len(messages),
+        "promptChars": sum(len(m.get("content") or "") for m in messages if isinstance(m, dict)),
+        "responseChars": len(response) if isinstance(response, str) else 0,
+        "error": entry.get("error"),
+    }
+
+
+class _LlmGroup:
+    __slots__ = (
+        "calls",
+        "errors",
+        "latency",
+        "latency_ms",
+        "prompt_tokens",
+        "completion_tokens",
+        "details",
+        "prompt_chars",
+        "response_chars",
+    )
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+        self.latency_ms = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.details = 0
+        self.prompt_chars = 0
+        self.response_chars = 0
+
+
+class _Coverage:
+    """Wall-clock time covered by at least one interval, fed in any order.
+
+    Keeps the union as sorted, disjoint intervals, so its size follows the
+    gaps between busy periods rather than the number of intervals.
+    Overlapping calls count once:
+
+    >>> c = _Coverage()
+    >>> c.add(5, 10)
+    >>> c.add(0, 12)
+    >>> c.add(20, 25)
+    >>> c.add(11, 21)
+    >>> c.busy_ms, c.sum_ms
+    (25.0, 32.0)
+    """
+
+    __slots__ = ("busy_ms", "sum_ms", "_starts", "_ends")
+
+    def __init__(self):
+        self.busy_ms = 0.0
+        self.sum_ms = 0.0
+        self._starts: list[float] = []
+        self._ends: list[float] = []
+
+    def add(self, start: float, end: float):
+        if end <= start:
+            return
+        self.sum_ms += end - start
+        starts, ends = self._starts, self._ends
+        # Stored intervals touching [start, end] are ends[lo:] and starts[:hi].
+        lo = bisect.bisect_left(ends, start)
+        hi = bisect.bisect_right(starts, end)
+        if lo < hi:
+            start = min(start, starts[lo])
+            end = max(end, ends[hi - 1])
+            self.busy_ms -= sum(ends[i] - starts[i] for i in range(lo, hi))
+        starts[lo:hi] = [start]
+        ends[lo:hi] = [end]
+        self.busy_ms += end - start
+
+
+class LlmCallStats:
+    """Streaming LLM request analytics, grouped by (model, endpoint).
+
+    ``llm.request`` span ends from the trace carry the endpoint, model, token
+    usage and latency; llmDetailFile entries (see ``summarize_llm_detail``)
+    add message counts and prompt/response sizes and are joined by span ID in
+    either order.  ``worker.execute`` spans give sandbox time, so the summary
+    can say whether the run waited on the inference endpoint or on sandboxes.
+    """
+
+    def __init__(self):
+        self.groups: dict[tuple[str, str], _LlmGroup] = {}
+        self.task_calls: dict[str, int] = {}
+        self._span_group: dict[str, tuple[str, str]] = {}  # span ID -> group, awaiting detail
+        self._detail: dict[str, dict[str, Any]] = {}  # span ID -> detail, awaiting span
+        self._llm = _Coverage()
+        self._sandbox = _Coverage()
+        self._first_ts = 0.0
+        self._last_ts = 0.0
+        self.details = 0
+        self.detail_errors = 0
+
+    def attach(self, state: DashboardState):
+        state.register_handler(TRACE_MESSAGE, self._on_span_event, name="LlmCallStats")
+        state.register_handler(LLM_DETAIL_MESSAGE, self._on_detail_event, name="LlmCallStats")
+
+    def _on_span_event(self, ev: IngestEvent):
+        span = ev.data.get("span")
+        if span:
+            self.add_span(span)
+
+    def _on_detail_event(self, ev: IngestEvent):
+        detail = ev.data.get("detail")
+        if detail:
+            self.add_detail(detail)
+
+    @staticmethod
+    def _remember(table: dict[str, Any], key: str, value: Any):
+        table[key] = value
+        if len(table) > LLM_JOIN_LIMIT:
+            del table[next(iter(table))]
+
+    def _clock(self, start: float, end: float):
+        if end:
+            if not self._first_ts or start < self._first_ts:
+                self._first_ts = start
+            self._last_ts = max(self._last_ts, end)
+
+    def add_span(self, span: Mapping[str, Any]):
+        if span.get("spanKind") != "end":
+            return
+        name = span.get("spanName")
+        ts = span.get("timestamp") or 0
+        duration = span.get("durationMs") or 0
+        if name == "worker.execute":
+            self._clock(ts - duration, ts)
+            self._sandbox.add(ts - duration, ts)
+            return
+        if name != "llm.request":
+            return
+        self._clock(ts - duration, ts)
+        attrs = span.get("attributes") or {}
+        key = (str(attrs.get("model", "?")), str(attrs.get("endpoint", "?")))
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = _LlmGroup()
+        latency = attrs.get("latencyMs") or duration
+        group.calls += 1
+        group.latency.record(latency)
+        group.latency_ms += latency
+        group.prompt_tokens += attrs.get("promptTokens") or 0
+        group.completion_tokens += attrs.get("completionTokens") or 0
+        if span.get("spanStatus") == "error":
+            group.errors += 1
+        self._llm.add(ts - duration, ts)
+        task = span.get("taskId") or ""
+        self.task_calls[task] = self.task_calls.get(task, 0) + 1
+
+        span_id = (span.get("trace") or {}).get("spanId", "")
+        detail = self._detail.pop(span_id, None)
+        if detail is not None:
+            self._join(group, detail)
+        elif span_id:
+            self._remember(self._span_group, span_id, key)
+
+    def add_detail(self, detail: Mapping[str, Any]):
+        self.details += 1
+        if detail.get("error"):
+            self.detail_errors += 1
+        span_id = detail.get("spanId", "")
+        key = self._span_group.pop(span_id, None)
+        if key is not None:
+            self._join(self.groups[key], detail)
+        else:
+            self._remember(self._detail, span_id, detail)
+
+    @staticmethod
+    def _join(group: _LlmGroup, detail: Mapping[str, Any]):
+        group.details += 1
+        group.prompt_chars += detail.get("promptChars", 0)
+        group.response_chars += detail.get("responseChars", 0)
+
+    def summary(self) -> dict[str, Any]:
+        groups = []
+        for (model, endpoint), g in sorted(self.groups.items()):
+            p50, p95, p99 = g.latency.quantiles((0.5, 0.95, 0.99))
+            groups.append(
+                {
+                    "model": model,
+                    "endpoint": endpoint,
+                    "calls": g.calls,
+                    "errors": g.errors,
+                    "p50_ms": round(p50),
+                    "p95_ms": round(p95),
+                    "p99_ms": round(p99),
+                    "max_ms": round(g.latency.max),
+                    "prompt_tokens": g.prompt_tokens,
+                    "completion_tokens": g.completion_tokens,
+                    "tokens_per_s": g.completion_tokens / (g.latency_ms / 1000)
+                    if g.latency_ms
+                    else 0.0,
+                    "mean_prompt_chars": g.prompt_chars / g.details if g.details else None,
+                    "mean_response_chars": g.response_chars / g.details if g.details else None,
+                }
+            )
+        tasked = [n for task, n in self.task_calls.items() if task]
+        wall = self._last_ts - self._first_ts
+        llm_busy = self._llm.busy_ms / wall if wall else 0.0
+        sandbox_busy = self._sandbox.busy_ms / wall if wall else 0.0
+        if not wall:
+            bound = "unknown"
+        elif llm_busy >= 0.5 and llm_busy >= sandbox_busy:
+            bound = "inference endpoint"
+        elif sandbox_busy >= 0.5:
+            bound = "sandboxes"
+        else:
+            bound = "neither (idle)"
+        return {
+            "calls": sum(g.calls for g in self.groups.values()),
+            "errors": sum(g.errors for g in self.groups.values()),
+            "groups": groups,
+            "calls_per_task": {
+                "tasks": len(tasked),
+                "mean": sum(tasked) / len(tasked) if tasked else 0.0,
+                "max": max(tasked, default=0),
+                "untasked": self.task_calls.get("", 0),
+            },
+            "details": self.details,
+            "detail_errors": self.detail_errors,
+            "unjoined_details": len(self._detail),
+            "wall_ms": wall,
+            "llm_busy": llm_busy,
+            "llm_mean_in_flight": self._llm.sum_ms / wall if wall else 0.0,
+            "sandbox_busy": sandbox_busy,
+            "sandbox_mean_in_flight": self._sandbox.sum_ms / wall if wall else 0.0,
+            "bound": bound,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Alerts -- rules evaluated incrementally over the ingested stream
+# ---------------------------------------------------------------------------
+
+
+def _alert_number(key: str, value: Any, zero: bool = False, maximum: float = math.inf) -> float:
+    """``value`` as a float above 0 (or at least 0 with ``zero``) and at most ``maximum``.
+
+    Raises ``ValueError`` for anything else, so a bad config fails at load time.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{key} must be a number, got {value!r}")
+    if value > maximum:
+        raise ValueError(f"{key} must be at most {maximum:g}, got {value!r}")
+    if value < 0 or (value == 0 and not zero):
+        bound = "at least 0" if zero else "greater than 0"
+        raise ValueError(f"{key} must be {bound}, got {value!r}")
+    return float(value)
+
+
+class AlertRule(abc.ABC):
+    """One alert condition, kept current from events and re-checked after every batch.
+
+    ``observe`` runs for each event in ``MESSAGES``; ``evaluate`` returns a
+    description while the condition holds and ``None`` otherwise.  Times are
+    log seconds (``PlannerTreeState.clock``).
+    """
+
+    MESSAGES: tuple[str, ...] = ()
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def observe(self, ev: IngestEvent, clock: float):
+        pass
+
+    @abc.abstractmethod
+    def evaluate(self, state: DashboardState, clock: float) -> str | None: ...
+
+
+class _WindowCount:
+    """Values stamped with log time, summed over a sliding window."""
+
+    __slots__ = ("seconds", "total", "_items")
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.total = 0.0
+        self._items: deque[tuple[float, float]] = deque()
+
+    def add(self, when: float, value: float = 1.0):
+        self._items.append((when, value))
+        self.total += value
+
+    def expire(self, clock: float):
+        items = self._items
+        cutoff = clock - self.seconds
+        while items and items[0][0] <= cutoff:
+            self.total -= items.popleft()[1]
+
+
+class StallRule(AlertRule):
+    """No ``Task completed`` for ``minutes`` while workers are active.
+
+    The stall is timed from the last completion, or from the first dispatch
+    after a period with no active workers.
+    """
+
+    MESSAGES = ("Task completed", "Task status")
+
+    def __init__(self, name: str, minutes: float = 10.0):
+        super().__init__(name)
+        self.seconds = _alert_number("minutes", minutes) * 60
+        self._since: float | None = None
+
+    def observe(self, ev: IngestEvent, clock: float):
+        if ev.event.get("message") == "Task completed":
+            self._since = clock
+        elif self._since is None and ev.data.get("to") in ("assigned", "running"):
+            self._since = clock
+
+    def evaluate(self, state: DashboardState, clock: float) -> str | None:
+        if state.active_workers <= 0:
+            self._since = None
+            return None
+        if self._since is None:
+            self._since = clock
+        idle = clock - self._since
+        if idle >= self.seconds:
+            return f"no task completed in {idle / 60:.0f}m, {state.active_workers} active"
+        return None
+
+
+class MergeRateRule(AlertRule):
+    """Merge success rate below ``below`` over ``window_minutes``, once ``min_merges`` are in."""
+
+    MESSAGES = ("Merge result",)
+
+    def __init__(
+        self, name: str, below: float = 0.7, window_minutes: float = 15.0, min_merges: int = 10
+    ):
+        super().__init__(name)
+        self.below = _alert_number("below", below, maximum=1.0)
+        self.min_merges = _alert_number("min_merges", min_merges)
+        window = _alert_number("window_minutes", window_minutes) * 60
+        self._merged = _WindowCount(window)
+        self._all = _WindowCount(window)
+
+    def observe(self, ev: IngestEvent, clock: float):
+        self._all.add(clock)
+        if ev.data.get("status") == "merged":
+            self._merged.add(clock)
+
+    def evaluate(self, state: DashboardState, clock: float) -> str | None:
+        self._merged.expire(clock)
+        self._all.expire(clock)
+        total = self._all.total
+        if total >= self.min_merges and self._merged.total < self.below * total:
+            return f"merge success {self._merged.total / total:.0%} over {total:.0f} merges"
+        return None
+
+
+class TimeoutRateRule(AlertRule):
+    """More than ``above`` ``Worker timed out`` events within ``window_minutes``."""
+
+    MESSAGES = ("Worker timed out",)
+
+    def __init__(self, name: str, above: int = 5, window_minutes: float = 5.0):
+        super().__init__(name)
+        self.above = _alert_number("above", above, zero=True)
+        self.window_minutes = _alert_number("window_minutes", window_minutes)
+        self._timeouts = _WindowCount(self.window_minutes * 60)
+
+    def observe(self, ev: IngestEvent, clock: float):
+        self._timeouts.add(clock)
+
+    def evaluate(self, state: DashboardState, clock: float) -> str | None:
+        self._timeouts.expire(clock)
+        if self._timeouts.total > self.above:
+            return f"{self._timeouts.total:.0f} worker timeouts in {self.window_minutes:g}m"
+        return None
 
-            elif level == "error":
-                if agent_role == "planner" or agent_role == "root-planner":
-                    self.planner_thinking = False
-                self._feed(ts_str, f"  ERR  {msg[:60]}", "bold red")
 
-            self._derive_counts_from_tree()
+class QueueGrowthRule(AlertRule):
+    """Pending up by ``min_growth`` over ``window_minutes`` with active workers flat.
 
-    def _feed(self, ts: str, msg: str, style: str):
-        self.activity.appendleft((ts, msg, style))
+    "Flat" means active moved by at most ``max_active_change`` over the window.
+    """
 
-    # -- snapshot for renderers ---------------------------------------------
+    def __init__(
+        self,
+        name: str,
+        window_minutes: float = 10.0,
+        min_growth: int = 20,
+        max_active_change: int = 2,
+    ):
+        super().__init__(name)
+        self.seconds = _alert_number("window_minutes", window_minutes) * 60
+        self.min_growth = _alert_number("min_growth", min_growth)
+        self.max_active_change = _alert_number("max_active_change", max_active_change, True)
+        # (log time, pending, active), at most one per ALERT_SAMPLE_SECONDS
+        self._samples: deque[tuple[float, int, int]] = deque()
+
+    def evaluate(self, state: DashboardState, clock: float) -> str | None:
+        samples = self._samples
+        pending, active = state.pending_tasks, state.active_workers
+        if not samples or clock - samples[-1][0] >= ALERT_SAMPLE_SECONDS:
+            samples.append((clock, pending, active))
+        while len(samples) > 1 and samples[1][0] <= clock - self.seconds:
+            samples.popleft()
+        start, pending0, active0 = samples[0]
+        if clock - start < self.seconds:
+            return None
+        growth = pending - pending0
+        if growth >= self.min_growth and abs(active - active0) <= self.max_active_change:
+            return f"pending +{growth} in {(clock - start) / 60:.0f}m, active flat at {active}"
+        return None
 
-    def snap(self) -> dict[str, Any]:
-        with self._lock:
-            elapsed = time.time() - self.start_time
-            total_merge = self.merge_merged + self.merge_conflicts + self.merge_failed
-            tree_snapshot = self.tree.snapshot()
-            active_depths = [
-                n["depth"]
-                for n in tree_snapshot["nodes"].values()
-                if n["status"] in ("pending", "assigned", "running")
-            ]
-            tree_snapshot["active_max_depth"] = max(active_depths) if active_depths else 0
-            cap = max(1, tree_snapshot["active_max_depth"] + 1)
-            self.visible_levels = max(1, min(self.visible_levels, cap))
-            total_tasks = (
-                self.active_workers + self.pending_tasks + self.completed_tasks + self.failed_tasks
+
+ALERT_KINDS: dict[str, type[AlertRule]] = {
+    "stall": StallRule,
+    "merge_rate": MergeRateRule,
+    "timeout_rate": TimeoutRateRule,
+    "queue_growth": QueueGrowthRule,
+}
+
+# Used without --alerts.  A config file has the same shape: {"rules": [...]},
+# each rule a "kind" from ALERT_KINDS, an optional "name" and that kind's
+# keyword parameters.
+DEFAULT_ALERT_RULES: tuple[dict[str, Any], ...] = (
+    {"kind": "stall", "name": "stalled", "minutes": 10},
+    {"kind": "merge_rate", "name": "merge rate", "below": 0.7, "window_minutes": 15},
+    {"kind": "timeout_rate", "name": "timeouts", "above": 5, "window_minutes": 5},
+    {"kind": "queue_growth", "name": "queue backlog", "window_minutes": 10, "min_growth": 20},
+)
+
+
+def build_alert_rules(specs: Iterable[Mapping[str, Any]]) -> list[AlertRule]:
+    """Instantiate rule specs; raises ``ValueError`` for an unknown kind or parameter."""
+    rules: list[AlertRule] = []
+    for spec in specs:
+        params = dict(spec)
+        kind = params.pop("kind", None)
+        cls = ALERT_KINDS.get(kind) if isinstance(kind, str) else None
+        if cls is None:
+            kinds = ", ".join(ALERT_KINDS)
+            raise ValueError(f"unknown alert kind {kind!r} (expected one of {kinds})")
+        name = str(params.pop("name", kind))
+        if any(rule.name == name for rule in rules):
+            raise ValueError(f"duplicate alert name {name!r}")
+        try:
+            rules.append(cls(name, **params))
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"alert {name!r}: {exc}") from None
+    return rules
+
+
+def load_alert_rules(path: str) -> list[dict[str, Any]]:
+    """Rule specs from a JSON config file, validated by building them once."""
+    with open(path) as fh:
+        config = json.load(fh)
+    specs = config.get("rules") if isinstance(config, dict) else None
+    if not isinstance(specs, list) or not all(isinstance(spec, dict) for spec in specs):
+        raise ValueError('expected {"rules": [{"kind": ..., ...}, ...]}')
+    build_alert_rules(specs)
+    return specs
+
+
+class AlertEngine:
+    """Runs ``AlertRule``s over a ``DashboardState`` and tracks which are firing.
+
+    Rules observe their events through ``register_handler`` and are evaluated
+    at the end of every ingested batch, on log time.  For live sources,
+    ``tick`` also advances that clock by the wall time since the last event,
+    so a run that stops logging altogether still trips time-based rules.
+    """
+
+    def __init__(self, specs: Iterable[Mapping[str, Any]] = DEFAULT_ALERT_RULES):
+        self.live = False
+        self.configure(specs)
+
+    def configure(self, specs: Iterable[Mapping[str, Any]]):
+        self.specs = tuple(specs)
+        self.reset()
+
+    def reset(self):
+        """Fresh rules and no firing alerts (e.g. after a checkpoint restore)."""
+        self.rules = build_alert_rules(self.specs)
+        self.firing: dict[str, tuple[str, float]] = {}  # rule name -> (message, since)
+        self.fired_total = 0
+        self._clock = 0.0
+        self._clock_wall = 0.0
+
+    def attach(self, state: DashboardState):
+        messages = {message for cls in ALERT_KINDS.values() for message in cls.MESSAGES}
+        for message in sorted(messages):
+            state.register_handler(
+                message, functools.partial(self._observe, state), name="AlertEngine"
             )
-            return {
-                "elapsed": elapsed,
-                "active": self.active_workers,
-                "pending": self.pending_tasks,
-                "completed": self.completed_tasks,
-                "failed": self.failed_tasks,
-                "cph": self.commits_per_hour,
-                "merge_rate": self.merge_success_rate,
-                "tokens": self.total_tokens,
-                "estimated_in_flight": self.estimated_in_flight,
-                "cost": self.total_tokens / 1000.0 * self.cost_rate,
-                "max_agents": self.max_agents,
-                "total_tasks": total_tasks,
-                "merge_merged": self.merge_merged,
-                "merge_conflicts": self.merge_conflicts,
-                "merge_failed": self.merge_failed,
-                "merge_total": total_merge,
-                "activity": list(self.activity),
-                "iteration": self.iteration,
-                "tree": tree_snapshot,
-                "visible_levels": self.visible_levels,
-                "active_tab": self.active_tab,
-                "in_progress_scroll": self.in_progress_scroll,
-                "completed_scroll": self.completed_scroll,
-                "planner_thinking": self.planner_thinking,
-                "planner_thinking_since": self.planner_thinking_since,
-                "recent_velocity": self._compute_velocity(),
-                "sparkline": self._compute_sparkline(),
-            }
 
-    def _compute_velocity(self) -> float:
-        now = time.time()
-        cutoff = now - 60
-        return sum(1 for t in self.completion_times if t > cutoff)
+    def _observe(self, state: DashboardState, ev: IngestEvent):
+        message = ev.event.get("message", "")
+        for rule in self.rules:
+            if message in rule.MESSAGES:
+                rule.observe(ev, state.tree.clock)
 
-    def _compute_sparkline(self) -> str:
-        now = time.time()
-        buckets = [0] * 10
-        bucket_width = 30.0
-        for t in self.completion_times:
-            age = now - t
-            if age > 300:
-                continue
-            idx = min(9, int(age / bucket_width))
-            buckets[9 - idx] += 1
-        chars = " ▁▂▃▄▅▆▇█"
-        mx = max(max(buckets), 1)
-        return "".join(chars[min(len(chars) - 1, int(b / mx * (len(chars) - 1)))] for b in buckets)
+    def evaluate(self, state: DashboardState, clock: float, now: float) -> bool:
+        """Re-check every rule after a batch that left the log clock at ``clock``.
+
+        Returns True if an alert started, resolved or changed its message.
+        """
+        self._clock = clock
+        self._clock_wall = now
+        return self._check(state, clock, now)
+
+    def tick(self, state: DashboardState, now: float) -> bool:
+        """Re-check between batches; a live source's clock runs on while it is quiet."""
+        if not self._clock or not self.live:
+            return False
+        return self._check(state, self._clock + max(0.0, now - self._clock_wall), now)
+
+    def _check(self, state: DashboardState, clock: float, now: float) -> bool:
+        changed = False
+        ts_str = state._format_ts(int(clock * 1000), now)
+        for rule in self.rules:
+            message = rule.evaluate(state, clock)
+            firing = self.firing.get(rule.name)
+            if message is None:
+                if firing is not None:
+                    del self.firing[rule.name]
+                    state._feed(ts_str, f"  ok  {rule.name} resolved", "green")
+                    changed = True
+            elif firing is None:
+                self.firing[rule.name] = (message, clock)
+                self.fired_total += 1
+                state._feed(ts_str, f"  ALERT  {rule.name}: {message}", "bold bright_red")
+                changed = True
+            elif firing[0] != message:
+                self.firing[rule.name] = (message, firing[1])
+                changed = True
+        return changed
+
+    def summary(self) -> tuple[Mapping[str, Any], ...]:
+        return tuple(
+            MappingProxyType({"name": name, "message": message, "since": since})
+            for name, (message, since) in self.firing.items()
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -585,6 +3251,10 @@ def make_layout() -> Layout:
         Layout(name="left", size=30, minimum_size=26),
         Layout(name="right", ratio=1, minimum_size=40),
     )
+    root["right"].split_column(
+        Layout(name="tab", ratio=1),
+        Layout(name="stragglers", size=STRAGGLER_COUNT + 3),
+    )
     root["footer_row"].split_row(
         Layout(name="footer", ratio=1),
         Layout(name="controls", ratio=1),
@@ -629,6 +3299,15 @@ def _fmt_tokens(n: int) -> str:
     return str(n)
 
 
+def _ms_str(ms: float) -> str:
+    if ms >= 60_000:
+        m, sec = divmod(int(ms / 1000), 60)
+        return f"{m}m{sec:02d}s"
+    if ms >= 1000:
+        return f"{ms / 1000:.1f}s"
+    return f"{int(ms)}ms"
+
+
 def _elapsed_str(s: float) -> str:
     h = int(s // 3600)
     m = int((s % 3600) // 60)
@@ -636,7 +3315,7 @@ def _elapsed_str(s: float) -> str:
     return f"{h:02d}:{m:02d}:{sec:02d}"
 
 
-def render_header(s: dict[str, Any]) -> Panel:
+def render_header(s: Mapping[str, Any]) -> Panel:
     tbl = Table.grid(expand=True)
     tbl.add_column(justify="left", ratio=1)
     tbl.add_column(justify="center", ratio=1)
@@ -647,7 +3326,14 @@ def render_header(s: dict[str, Any]) -> Panel:
     total = s["total_tasks"]
     merged = s["merge_merged"]
 
-    if s.get("planner_thinking"):
+    alerts = s.get("alerts", ())
+    if alerts:
+        first = alerts[0]
+        more = f" [dim](+{len(alerts) - 1} more)[/]" if len(alerts) > 1 else ""
+        center = (
+            f"[bold bright_red]ALERT[/] [bright_red]{first['name']}: {first['message']}[/]{more}"
+        )
+    elif s.get("planner_thinking"):
         thinking_sec = int(time.time() - s.get("planner_thinking_since", time.time()))
         dots = "●" * ((int(time.time() * 2) % 3) + 1)
         center = f"[bold bright_yellow]PLANNING {dots}[/] [dim]({thinking_sec}s)[/]"
@@ -665,7 +3351,7 @@ def render_header(s: dict[str, Any]) -> Panel:
     return Panel(tbl, style="bright_cyan", height=3)
 
 
-def render_metrics(s: dict[str, Any]) -> Panel:
+def render_metrics(s: Mapping[str, Any]) -> Panel:
     tbl = Table(show_header=False, box=None, padding=(0, 1), expand=True)
     tbl.add_column("k", style="dim", no_wrap=True, width=13)
     tbl.add_column("v", justify="right")
@@ -699,19 +3385,49 @@ def render_metrics(s: dict[str, Any]) -> Panel:
     return Panel(tbl, title="[bold]METRICS[/]", border_style="bright_blue")
 
 
+def _rollup_markup(r: Mapping[str, Any]) -> str:
+    """Tasks, lines, tokens per line and failure ratio of a subtree rollup."""
+    tpl = r["tokens_per_line"]
+    tpl_str = f"{tpl:.0f}tok/ln" if tpl is not None else "no lines"
+    return (
+        f"{r['tasks']:.0f}t +{r['linesAdded']:.0f} {_fmt_tokens(int(r['tokensUsed']))}tok "
+        f"{tpl_str} {r['fail_ratio'] * 100:.0f}%fail"
+    )
+
+
+_TAB_LABELS = {
+    "grid": "Agent Grid",
+    "activity": "Activity",
+    "throughput": "Throughput",
+    "slots": "Slots",
+    "branches": "Branches",
+    "spans": "Spans",
+}
+
+
 def _tabs_title(active_tab: str) -> str:
-    if active_tab == "activity":
-        return "[dim]Agent Grid[/]  [reverse] Activity [/]"
-    return "[reverse] Agent Grid [/]  [dim]Activity[/]"
+    return "  ".join(
+        f"[reverse] {label} [/]" if tab == active_tab else f"[dim]{label}[/]"
+        for tab, label in _TAB_LABELS.items()
+    )
+
 
+def render_grid(s: Mapping[str, Any]) -> Panel:
+    return build_grid(s)[0]
 
-def render_grid(s: dict[str, Any]) -> Panel:
+
+def build_grid(s: Mapping[str, Any]) -> tuple[Panel, list[str]]:
+    """The Agent Grid panel and the archive nodes shown in its Completed window.
+
+    The 'x' key expands those archives; they depend on scroll and terminal size,
+    so only the render knows them.
+    """
     tree_data = s["tree"]
-    nodes = tree_data["nodes"]
+    nodes = tree_data["nodes"].current()
+    block_memo = tree_data["block_rows"]
     root_id = tree_data["root"]
     visible_levels = s["visible_levels"]
     max_visible_depth = max(0, visible_levels - 1)
-    max_visible_depth = max(0, visible_levels - 1)
 
     def meter(progress: float, status: str) -> str:
         if status in ("failed", "cancelled"):
@@ -737,6 +3453,7 @@ def render_grid(s: dict[str, Any]) -> Panel:
             "planner": "plan",
             "subplanner": "sub",
             "worker": "wkr",
+            PlannerTreeState.ARCHIVE_ROLE: "arch",
         }.get(role, role)
         node_id = node["id"]
         if len(node_id) > 20:
@@ -778,59 +3495,81 @@ def render_grid(s: dict[str, Any]) -> Panel:
             tok_str = f"{tok / 1000:.1f}K" if tok >= 1000 else str(tok)
             parts.append(f" [dim]+{la}/-{lr} {fc}f {tok_str}tok[/]")
 
+        ru = node.get("rollup")
+        if ru and ru["tasks"]:
+            parts.append(f" [dim]\u03a3 {_rollup_markup(ru)}[/]")
+
         txt = Text.from_markup("".join(parts))
         if muted:
             txt.stylize("dim")
         return txt
 
-    def is_terminal(node_id: str) -> bool:
-        return nodes.get(node_id, {}).get("status") in ("complete", "failed", "cancelled")
-
-    def has_bucket(node_id: str, show_terminal: bool) -> bool:
-        node = nodes.get(node_id)
-        if not node:
-            return False
-        self_match = is_terminal(node_id) if show_terminal else not is_terminal(node_id)
-        if self_match and node_id != root_id:
-            return True
-        return any(has_bucket(child, show_terminal) for child in node["children"])
-
-    def hidden_descendants(node_id: str, depth: int, show_terminal: bool) -> int:
-        count = 0
-        for child in nodes.get(node_id, {}).get("children", []):
-            if not has_bucket(child, show_terminal):
-                continue
-            if depth > max_visible_depth and child != root_id:
-                count += 1
-            count += hidden_descendants(child, depth + 1, show_terminal)
+    if root_id not in nodes:
+        return Panel("[dim]waiting for planner events ...[/]", title="[bold]PLANNER TREE[/]"), []
+
+    def block_rows(node_id: str, depth: int, pane: int) -> int:
+        """Rows emitted for ``node_id`` at ``depth``: its line plus hidden marker or subtree."""
+        node = nodes[node_id]
+        if depth >= max_visible_depth:
+            return 2 if node["pane_rows"][pane] > 1 else 1
+        memo = block_memo.get(node_id)
+        if memo is None:
+            memo = block_memo[node_id] = {}
+        key = (pane, max_visible_depth - depth)
+        cached = memo.get(key)
+        if cached is not None and cached[0] is node:
+            return cached[1]
+        count = 1
+        for child_id in node["children"]:
+            if nodes[child_id]["pane_rows"][pane]:
+                count += block_rows(child_id, depth + 1, pane)
+        memo[key] = (node, count)
         return count
 
-    if root_id not in nodes:
-        return Panel("[dim]waiting for planner events ...[/]", title="[bold]PLANNER TREE[/]")
+    def bucket_window(pane: int, offset: int, window: int) -> tuple[list[Text], int, int]:
+        """Build only the rows of ``pane`` that fall in ``[offset, offset + window)``.
 
-    def build_bucket_lines(show_terminal: bool) -> list[Text]:
+        Archive nodes among the built Completed rows are added to ``visible_archives``.
+        """
+        top = [cid for cid in nodes[root_id]["children"] if nodes[cid]["pane_rows"][pane]]
+        total = sum(block_rows(cid, 0, pane) for cid in top)
+        if total == 0:
+            return [Text.from_markup("[dim]none[/]")], 1, 0
+        clamped = max(0, min(offset, total - window))
         lines: list[Text] = []
-
-        def emit(parent_id: str, depth: int, prefix: str):
-            visible_children = [
-                cid for cid in nodes[parent_id]["children"] if has_bucket(cid, show_terminal)
-            ]
-            for idx, child_id in enumerate(visible_children):
-                child = nodes.get(child_id)
-                if not child:
+        skip = clamped
+
+        def take() -> bool:
+            nonlocal skip
+            if skip:
+                skip -= 1
+                return False
+            return len(lines) < window
+
+        def emit(kids: list[str], depth: int, prefix: str):
+            nonlocal skip
+            for idx, child_id in enumerate(kids):
+                if len(lines) >= window:
+                    return
+                size = block_rows(child_id, depth, pane)
+                if skip >= size:
+                    skip -= size
                     continue
-                is_last = idx == len(visible_children) - 1
-                connector = "└─ " if is_last else "├─ "
-                child_match = is_terminal(child_id) if show_terminal else not is_terminal(child_id)
-
-                line = Text()
-                line.append(f"{prefix}{connector}", style="bright_black")
-                line.append_text(label_for(child, muted=not child_match))
-                lines.append(line)
+                child = nodes[child_id]
+                is_last = idx == len(kids) - 1
+                if take():
+                    connector = "└─ " if is_last else "├─ "
+                    child_match = (child["status"] in PlannerTreeState.TERMINAL) == bool(pane)
+                    line = Text()
+                    line.append(f"{prefix}{connector}", style="bright_black")
+                    line.append_text(label_for(child, muted=not child_match))
+                    lines.append(line)
+                    if pane and child["role"] == PlannerTreeState.ARCHIVE_ROLE:
+                        visible_archives.append(child_id)
 
                 if depth >= max_visible_depth:
-                    hidden = hidden_descendants(child_id, depth + 1, show_terminal)
-                    if hidden > 0:
+                    hidden = child["pane_rows"][pane] - 1
+                    if hidden > 0 and take():
                         hidden_line = Text()
                         tail = "   " if is_last else "│  "
                         hidden_line.append(f"{prefix}{tail}└─ ", style="bright_black")
@@ -839,60 +3578,50 @@ def render_grid(s: dict[str, Any]) -> Panel:
                     continue
 
                 next_prefix = prefix + ("   " if is_last else "│  ")
-                emit(child_id, depth + 1, next_prefix)
-
-        emit(root_id, 0, "")
-        if not lines:
-            lines.append(Text.from_markup("[dim]none[/]"))
-        return lines
+                grandkids = [k for k in child["children"] if nodes[k]["pane_rows"][pane]]
+                emit(grandkids, depth + 1, next_prefix)
 
-    in_progress_lines = build_bucket_lines(show_terminal=False)
-    completed_lines = build_bucket_lines(show_terminal=True)
+        emit(top, 0, "")
+        return lines, total, clamped
 
     try:
         term_lines = os.get_terminal_size().lines
     except OSError:
         term_lines = 28
-    # Match right-pane body height (total - header - footer - borders).
-    pane_height = max(10, term_lines - 10)
+    # Match right-pane body height (total - header - footer - stragglers - borders).
+    pane_height = max(10, term_lines - 10 - (STRAGGLER_COUNT + 3))
     # Reserve one content row for the scroll indicator line.
     pane_window = max(3, pane_height - 3)
 
-    def _windowed(
-        lines: list[Text],
-        offset: int,
-        scroll_hint: str,
-        window: int,
-    ) -> tuple[Text, int, int]:
-        max_offset = max(0, len(lines) - window)
-        clamped = max(0, min(offset, max_offset))
+    def _windowed(pane: int, offset: int, scroll_hint: str, window: int) -> Text:
+        visible, total, clamped = bucket_window(pane, offset, window)
         out = Text()
-        visible = lines[clamped : clamped + window]
         for i in range(window):
             if i < len(visible):
                 out.append_text(visible[i])
             if i < window - 1:
                 out.append("\n")
 
-        start = clamped + 1 if len(lines) > 0 else 0
-        end = min(len(lines), clamped + window) if len(lines) > 0 else 0
+        start = clamped + 1
+        end = min(total, clamped + window)
         out.append("\n")
         out.append(
-            f" {start}-{end}/{len(lines)} ({scroll_hint})",
+            f" {start}-{end}/{total} ({scroll_hint})",
             style="dim",
         )
-        return out, clamped, max_offset
+        return out
 
-    in_progress_text, _, _ = _windowed(
-        in_progress_lines,
+    in_progress_text = _windowed(
+        PlannerTreeState.PANE_OPEN,
         s["in_progress_scroll"],
         "w/s to scroll",
         pane_window,
     )
-    completed_text, _, _ = _windowed(
-        completed_lines,
+    visible_archives: list[str] = []
+    completed_text = _windowed(
+        PlannerTreeState.PANE_DONE,
         s["completed_scroll"],
-        "e/d to scroll",
+        "e/d to scroll, x/z expand/fold archived" if s["tree"].get("archived") else "e/d to scroll",
         pane_window,
     )
 
@@ -917,14 +3646,15 @@ def render_grid(s: dict[str, Any]) -> Panel:
     wrap = Table.grid(expand=True)
     wrap.add_column(ratio=1)
     wrap.add_row(trees)
-    return Panel(
+    panel = Panel(
         wrap,
         title=_tabs_title(s["active_tab"]),
         border_style="bright_yellow",
     )
+    return panel, visible_archives
 
 
-def render_merge(s: dict[str, Any]) -> Panel:
+def render_merge(s: Mapping[str, Any]) -> Panel:
     rate = s["merge_rate"]
     bar_w = 20
     filled = int(rate * bar_w) if s["merge_total"] > 0 else 0
@@ -953,7 +3683,7 @@ def render_merge(s: dict[str, Any]) -> Panel:
     return Panel(tbl, title="[bold]MERGE QUEUE[/]", border_style="bright_magenta")
 
 
-def render_activity(s: dict[str, Any]) -> Panel:
+def render_activity(s: Mapping[str, Any]) -> Panel:
     logs = s["activity"]
     txt = Text()
     for ts_str, msg, style in logs:
@@ -968,11 +3698,326 @@ def render_activity(s: dict[str, Any]) -> Panel:
     )
 
 
-def render_footer(s: dict[str, Any]) -> Panel:
+def render_stragglers(s: Mapping[str, Any]) -> Panel:
+    rows = s.get("stragglers", ())
+    tbl = Table(show_header=False, box=None, padding=(0, 1), expand=True)
+    tbl.add_column("age", justify="right", no_wrap=True, width=7)
+    tbl.add_column("task", no_wrap=True, ratio=2)
+    tbl.add_column("parent", style="dim", no_wrap=True, ratio=2)
+    tbl.add_column("progress", style="dim", no_wrap=True, ratio=3)
+    now = time.time()
+    for row in rows:
+        elapsed = int(now - row["started_at"])
+        m, sec = divmod(elapsed, 60)
+        color = "bright_red" if elapsed > 300 else "bright_yellow" if elapsed > 180 else "dim"
+        tbl.add_row(
+            f"[{color}]{m}m{sec:02d}s[/]" if m else f"[{color}]{sec}s[/]",
+            f"[bold]{row['id']}[/] [dim]{row['status']}[/]",
+            f"< {row['parent']}" if row["parent"] else "",
+            row["worker_progress"][:60],
+        )
+    if not rows:
+        tbl.add_row("", "[dim]no tasks in flight[/]", "", "")
+    return Panel(tbl, title="[bold]OLDEST IN FLIGHT[/]", border_style="bright_red")
+
+
+def render_spans(s: Mapping[str, Any]) -> Panel:
+    data = s.get("spans")
+    title = _tabs_title(s["active_tab"])
+    if data is None or not data["events"]:
+        return Panel(
+            Text.from_markup("  [dim italic]waiting for trace spans ...[/]"),
+            title=title,
+            border_style="bright_magenta",
+        )
+
+    names = Table(show_header=True, box=None, padding=(0, 1), expand=True)
+    names.add_column("span", style="bold", no_wrap=True, ratio=1)
+    for col in ("n", "self", "self %", "total", "mean", "max"):
+        names.add_column(col, justify="right", no_wrap=True)
+    for row in data["names"][:12]:
+        names.add_row(
+            row["name"],
+            str(row["count"]),
+            f"[bright_white]{_ms_str(row['self_ms'])}[/]",
+            f"[bright_yellow]{row['self_share'] * 100:.0f}%[/]",
+            _ms_str(row["total_ms"]),
+            _ms_str(row["mean_ms"]),
+            _ms_str(row["max_ms"]),
+        )
+
+    segments = Table(show_header=True, box=None, padding=(0, 1), expand=True)
+    segments.add_column("segment (time until event)", style="dim", no_wrap=True, ratio=1)
+    for col in ("n", "mean", "max"):
+        segments.add_column(col, justify="right", no_wrap=True)
+    for row in data["segments"][:8]:
+        segments.add_row(
+            row["name"], str(row["count"]), _ms_str(row["mean_ms"]), _ms_str(row["max_ms"])
+        )
+
+    tasks = Text()
+    for row in data["tasks"]:
+        tasks.append(f" {row['task'][-24:]:<24} ", style="bold" if row["open"] else "dim")
+        tasks.append(
+            " › ".join(f"{label} {_ms_str(ms)}" for label, ms in row["segments"][-5:]) or "-",
+            style="bright_white",
+        )
+        llm = sum(ms for name, ms in row["spans"].items() if name.startswith("llm."))
+        if llm:
+            tasks.append(f"  llm {_ms_str(llm)}", style="bright_cyan")
+        tasks.append("\n")
+
+    llm = s.get("llm")
+    calls = Table(show_header=True, box=None, padding=(0, 1), expand=True)
+    calls.add_column("model @ endpoint", style="bright_cyan", no_wrap=True, ratio=1)
+    for col in ("calls", "err", "p50", "p95", "p99", "prompt", "compl", "tok/s"):
+        calls.add_column(col, justify="right", no_wrap=True)
+    for row in llm["groups"] if llm else ():
+        calls.add_row(
+            f"{row['model']} @ {row['endpoint']}",
+            str(row["calls"]),
+            f"[bright_red]{row['errors']}[/]" if row["errors"] else "[dim]0[/]",
+            _ms_str(row["p50_ms"]),
+            _ms_str(row["p95_ms"]),
+            _ms_str(row["p99_ms"]),
+            _fmt_tokens(row["prompt_tokens"]),
+            _fmt_tokens(row["completion_tokens"]),
+            f"{row['tokens_per_s']:.0f}",
+        )
+
+    wrap = Table.grid(expand=True)
+    wrap.add_column(ratio=1)
+    wrap.add_row(names)
+    wrap.add_row("")
+    wrap.add_row(segments)
+    if llm and llm["calls"]:
+        per_task = llm["calls_per_task"]
+        wrap.add_row("")
+        wrap.add_row(calls)
+        wrap.add_row(
+            Text.from_markup(
+                f" [dim]{per_task['mean']:.1f} calls/task (max {per_task['max']}), "
+                f"LLM busy {llm['llm_busy'] * 100:.0f}% / sandboxes busy "
+                f"{llm['sandbox_busy'] * 100:.0f}% of wall time, bound by[/] "
+                f"[bold]{llm['bound']}[/]"
+            )
+        )
+    wrap.add_row("")
+    wrap.add_row(Text.from_markup(" [bold]Recent tasks[/] [dim](segments since span start)[/]"))
+    wrap.add_row(tasks)
+    wrap.add_row(
+        Text.from_markup(f" [dim]{data['events']:,} span events, {data['open']:,} spans open[/]")
+    )
+    return Panel(wrap, title=title, border_style="bright_magenta")
+
+
+# (snapshot key, label, style, unit scale and suffix) per throughput chart row
+_THROUGHPUT_ROWS = (
+    ("completions", "Completed", "bright_green", 60, "/min"),
+    ("failures", "Failed", "bright_red", 60, "/min"),
+    ("merges", "Merged", "bright_magenta", 60, "/min"),
+    ("conflicts", "Conflicts", "yellow", 60, "/min"),
+    ("tokens", "Tokens", "bright_cyan", 1, "/s"),
+    ("active", "Active", "bright_yellow", 1, ""),
+)
+
+
+def _windows_markup(selected: str) -> str:
+    windows = "  ".join(
+        f"[reverse] {i}:{name} [/]" if name == selected else f"[dim]{i}:{name}[/]"
+        for i, (name, _) in enumerate(THROUGHPUT_WINDOWS, 1)
+    )
+    return f" {windows}  [dim](1/2/3 to pick window)[/]"
+
+
+def render_throughput(s: Mapping[str, Any]) -> Panel:
+    data = s.get("throughput")
+    if data is None:
+        return Panel("", title=_tabs_title(s["active_tab"]), border_style="bright_cyan")
+    series = data["series"]
+
+    tbl = Table(show_header=True, box=None, padding=(0, 1), expand=True)
+    tbl.add_column("series", style="dim", no_wrap=True)
+    tbl.add_column(f"last {data['window']}", ratio=1, no_wrap=True)
+    tbl.add_column("now", justify="right", no_wrap=True)
+    tbl.add_column("avg", justify="right", no_wrap=True)
+    tbl.add_column("peak", justify="right", no_wrap=True)
+
+    def fmt(value: float, scale: int, unit: str) -> str:
+        value *= scale
+        text = _fmt_tokens(int(value)) if value >= 1000 else f"{value:.1f}"
+        return f"{text}{unit}"
+
+    for key, label, style, scale, unit in _THROUGHPUT_ROWS:
+        row = series[key]
+        tbl.add_row(
+            label,
+            f"[{style}]{DashboardState._sparkline(list(row['columns']))}[/]",
+            f"[bright_white]{fmt(row['current'], scale, unit)}[/]",
+            fmt(row["mean"], scale, unit),
+            fmt(row["peak"], scale, unit),
+        )
+
+    phases = Table(show_header=True, box=None, padding=(0, 1), expand=True)
+    phases.add_column("phase", style="dim", no_wrap=True)
+    for col in ("n", "open", "p50", "p95", "p99", "max"):
+        phases.add_column(col, justify="right", no_wrap=True)
+    for row in s.get("phases", ()):
+        phases.add_row(
+            row["phase"],
+            str(row["count"]),
+            str(row["open"]) if row["open"] else "[dim]0[/]",
+            *(
+                f"[bright_white]{_ms_str(row[key])}[/]" if row["count"] else "[dim]-[/]"
+                for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")
+            ),
+        )
+
+    wrap = Table.grid(expand=True)
+    wrap.add_column(ratio=1)
+    wrap.add_row(tbl)
+    wrap.add_row("")
+    wrap.add_row(Text.from_markup(_windows_markup(data["window"])))
+    wrap.add_row("")
+    wrap.add_row(Text.from_markup(" [bold]Phase latency[/] [dim](log time)[/]"))
+    wrap.add_row(phases)
+    return Panel(wrap, title=_tabs_title(s["active_tab"]), border_style="bright_cyan")
+
+
+def render_branches(s: Mapping[str, Any]) -> Panel:
+    rows = s.get("branches") or ()
+    if not rows:
+        return Panel(
+            Text.from_markup("  [dim italic]no finished subtrees yet ...[/]"),
+            title=_tabs_title(s["active_tab"]),
+            border_style="bright_cyan",
+        )
+    tbl = Table(show_header=True, box=None, padding=(0, 1), expand=True)
+    tbl.add_column("subtree", no_wrap=True, ratio=1)
+    tbl.add_column("unmerged", justify="right", no_wrap=True)
+    tbl.add_column("tokens", justify="right", no_wrap=True)
+    tbl.add_column("tok/line", justify="right", no_wrap=True)
+    tbl.add_column("merged", justify="right", no_wrap=True)
+    tbl.add_column("fail", justify="right", no_wrap=True)
+    tbl.add_column("lines/min", justify="right", no_wrap=True)
+    for r in rows:
+        node_id = r["id"] if len(r["id"]) <= 24 else f"..{r['id'][-22:]}"
+        desc = r["desc"][:28]
+        unmerged = r["unmergedTokens"]
+        share = unmerged / r["tokensUsed"] if r["tokensUsed"] else 0.0
+        color = "bright_red" if share > 0.5 else "yellow" if share > 0.2 else "bright_white"
+        tpl = r["tokens_per_line"]
+        fail = r["fail_ratio"]
+        tbl.add_row(
+            f"[bold]{node_id}[/] [dim]d{r['depth']}[/] [italic dim]{desc}[/]",
+            f"[{color}]{_fmt_tokens(int(unmerged))}[/]",
+            _fmt_tokens(int(r["tokensUsed"])),
+            f"{tpl:,.0f}" if tpl is not None else "[bright_red]-[/]",
+            f"{r['merged']:.0f}[dim]/{r['tasks']:.0f}[/]",
+            f"[bright_red]{fail * 100:.0f}%[/]" if fail > 0.2 else f"{fail * 100:.0f}%",
+            f"{r['lines_per_min']:.1f}",
+        )
+    wrap = Table.grid(expand=True)
+    wrap.add_column(ratio=1)
+    wrap.add_row(
+        Text.from_markup(
+            " [bold]Subtrees by tokens spent without merged code[/] "
+            "[dim](finished tasks whose branch has not merged)[/]"
+        )
+    )
+    wrap.add_row(tbl)
+    return Panel(wrap, title=_tabs_title(s["active_tab"]), border_style="bright_cyan")
+
+
+_BOUND_STYLES = {
+    "capacity": "bold bright_red",
+    "dispatch": "bold yellow",
+    "planner": "bold bright_yellow",
+    "balanced": "bold bright_green",
+    "idle": "dim",
+}
+
+
+def render_utilization(s: Mapping[str, Any]) -> Panel:
+    u = s.get("utilization")
+    if u is None:
+        return Panel("", title=_tabs_title(s["active_tab"]), border_style="bright_cyan")
+    slots = u["slots"]
+
+    chart = Table(show_header=True, box=None, padding=(0, 1), expand=True)
+    chart.add_column("level", style="dim", no_wrap=True)
+    chart.add_column(f"last {u['window']}", ratio=1, no_wrap=True)
+    chart.add_column("now", justify="right", no_wrap=True)
+    chart.add_column("avg", justify="right", no_wrap=True)
+    # Busy slots are scaled to the slot count, so a full bar means every slot is taken.
+    busy_scale = [*u["busy_columns"], max(slots, u["peak_busy"])]
+    chart.add_row(
+        "Busy slots",
+        f"[bright_yellow]{DashboardState._sparkline(busy_scale)[:-1]}[/]",
+        f"[bright_white]{u['busy']:.0f}[/][dim]/{slots}[/]",
+        f"{u['mean_busy']:.1f}",
+    )
+    chart.add_row(
+        "Pending",
+        f"[yellow]{DashboardState._sparkline(list(u['queued_columns']))}[/]",
+        f"[bright_white]{u['queued_columns'][-1]:.0f}[/]",
+        f"{u['mean_queued']:.1f}",
+    )
+
+    tbl = Table(show_header=False, box=None, padding=(0, 1), expand=True)
+    tbl.add_column("k", style="dim", no_wrap=True)
+    tbl.add_column("v", no_wrap=True)
+    tbl.add_column("k2", style="dim", no_wrap=True)
+    tbl.add_column("v2", no_wrap=True)
+    util = u["utilization"]
+    util_color = "bright_green" if util >= 0.9 else "yellow" if util >= 0.75 else "bright_red"
+    tbl.add_row(
+        "Utilization",
+        f"[{util_color}]{util * 100:.0f}%[/]",
+        "Idle slots",
+        f"[bright_white]{u['idle_slots']:.1f}[/]",
+    )
+    tbl.add_row(
+        "Arrivals",
+        f"[bright_white]{u['arrivals_per_min']:.1f}[/][dim]/min[/]",
+        "Departures",
+        f"[bright_white]{u['departures_per_min']:.1f}[/][dim]/min[/]",
+    )
+    tbl.add_row(
+        "Pending wait",
+        f"[bright_white]{_ms_str(u['mean_wait_ms'])}[/] [dim]p95 {_ms_str(u['wait_p95_ms'])}[/]",
+        "Service",
+        f"[bright_white]{_ms_str(u['mean_service_ms'])}[/] "
+        f"[dim]p95 {_ms_str(u['service_p95_ms'])}[/]",
+    )
+    tbl.add_row(
+        "Little's L",
+        f"[bright_white]{u['little_l']:.1f}[/] [dim]vs {u['observed_l']:.1f} seen[/]",
+        "Offered load",
+        f"[bright_white]{u['offered_slots']:.1f}[/][dim]/{slots} slots[/]",
+    )
+    bound = u["bound"]
+    tbl.add_row("Bound by", f"[{_BOUND_STYLES.get(bound, 'bold')}]{bound}[/]", "", "")
+
+    wrap = Table.grid(expand=True)
+    wrap.add_column(ratio=1)
+    wrap.add_row(chart)
+    wrap.add_row("")
+    wrap.add_row(Text.from_markup(_windows_markup(u["window"])))
+    wrap.add_row("")
+    wrap.add_row(
+        Text.from_markup(" [bold]Slots and queueing[/] [dim](log time; p95 over the run)[/]")
+    )
+    wrap.add_row(tbl)
+    return Panel(wrap, title=_tabs_title(s["active_tab"]), border_style="bright_cyan")
+
+
+def render_footer(s: Mapping[str, Any]) -> Panel:
     done = s["completed"]
     total = s["total_tasks"]
     pct = done / total if total else 0
-    bar_w = 50
+    backlog = s.get("backlog", 0)
+    bar_w = 36 if backlog else 50
     filled = int(pct * bar_w)
     bar = (
         "[bold bright_green]"
@@ -982,14 +4027,37 @@ def render_footer(s: dict[str, Any]) -> Panel:
         + "\u2591" * (bar_w - filled)
         + "[/]"
     )
-    txt = Text.from_markup(
+    markup = (
         f"  [bold]TASKS[/]  {bar}  [bright_white]{done}[/]"
         f"[dim]/{total}[/]  [bright_cyan]{pct * 100:.0f}%[/]"
     )
-    return Panel(txt, style="bright_cyan", height=3)
+    if backlog:
+        markup += f"  [bright_yellow]{backlog:,} queued[/] [dim]@ {s.get('frame_hz', 0):.1f}Hz[/]"
+    coalesced = s.get("coalesced", 0)
+    if coalesced:
+        markup += f"  [dim]{coalesced:,} merged[/]"
+    return Panel(Text.from_markup(markup), style="bright_cyan", height=3)
+
+
+def _replay_markup(r: Mapping[str, Any]) -> str:
+    start = r["start_ts"]
+    pos = timedelta(seconds=max(0, (r["position_ts"] - start) // 1000))
+    total = timedelta(seconds=max(0, (r["end_ts"] - start) // 1000))
+    if r["finished"]:
+        state = "[bright_black]done[/]"
+    elif r["paused"]:
+        state = "[bold yellow]paused[/]"
+    else:
+        speed = f"{r['speed']:g}x" if r["speed"] > 0 else "max"
+        state = f"[bold bright_green]{speed}[/]"
+    return (
+        f"[bold bright_white]replay {pos}/{total}[/] {state}"
+        f"[bright_black] | [/]"
+        f"[bold bright_white]space pause  ,/. speed  b/n \u00b1{r['skip_minutes']:g}m[/]"
+    )
 
 
-def render_controls(s: dict[str, Any], interactive: bool) -> Panel:
+def render_controls(s: Mapping[str, Any], interactive: bool) -> Panel:
     max_levels = s["tree"].get("active_max_depth", s["tree"]["max_depth"]) + 1
     txt = Text.from_markup(
         f"[bold bright_white]Showing levels {s['visible_levels']}/{max_levels} of agents[/]"
@@ -998,35 +4066,444 @@ def render_controls(s: dict[str, Any], interactive: bool) -> Panel:
         f"[bright_black] | [/]"
         f"[bold bright_white]tab={s['active_tab']}[/]"
     )
+    replay = s.get("replay")
+    if replay:
+        txt.append_text(Text.from_markup(f"[bright_black] | [/]{_replay_markup(replay)}"))
     return Panel(txt, title="[bold bright_white]CONTROLS[/]", border_style="bright_cyan", height=3)
 
 
+# ---------------------------------------------------------------------------
+# Ingest buffer
+# ---------------------------------------------------------------------------
+
+
+class IngestBuffer(queue.Queue):
+    """Bounded reader -> render-loop queue that coalesces superseded events.
+
+    Once the buffer is half full, an event that replaces an earlier one still
+    waiting in the queue is merged into that entry instead of taking a new
+    slot: only the latest ``Metrics`` snapshot, the latest ``Worker progress``
+    per task within one phase, and one collapsed ``Task status`` transition
+    per task while it stays assigned/running are kept.  A merged entry keeps
+    the earlier event's timestamp, as it is folded at the earlier event's
+    place, so log-time engines see no event before its time.  Every other
+    event (task lifecycle, merges, errors, end-of-stream) is never dropped;
+    when the buffer is full those block the reader instead.
+    """
+
+    def __init__(self, maxsize: int = INGEST_QUEUE_SIZE):
+        super().__init__(maxsize)
+        self.coalesce_at = max(1, maxsize // 2) if maxsize > 0 else 0
+        self.coalesced: dict[str, int] = {}
+        self.coalesced_total = 0
+
+    @staticmethod
+    def coalesce_key(item: Any) -> tuple[str, str] | None:
+        if not isinstance(item, dict):
+            return None
+        msg = item.get("message")
+        if msg == "Metrics":
+            return (msg, "")
+        if msg in ("Worker progress", "Task status"):
+            task_id = (item.get("data") or {}).get("taskId")
+            if task_id:
+                return (msg, str(task_id))
+        return None
+
+    @staticmethod
+    def _mergeable(old: dict[str, Any], new: dict[str, Any]) -> bool:
+        """Whether folding ``new`` into ``old`` has the same effect as ingesting both."""
+        if new.get("message") == "Worker progress":
+            # A phase change is a phase-tracker edge; only repeats within a phase fold.
+            old_phase = (old.get("data") or {}).get("phase")
+            return old_phase == (new.get("data") or {}).get("phase")
+        if new.get("message") == "Task status":
+            return IngestBuffer._status_mergeable(old, new)
+        return True
+
+    @staticmethod
+    def _status_mergeable(old: dict[str, Any], new: dict[str, Any]) -> bool:
+        """Whether two ``Task status`` events for one task collapse into a single transition.
+
+        The merged event must place the task the same way: same role and parent
+        fields.  And since it lands at the first event's log time, the status
+        in between must not matter there: both events keep the task assigned or
+        running, so its queue wait and service time come out the same.
+        """
+        old_data = old.get("data") or {}
+        new_data = new.get("data") or {}
+        if old.get("agentRole") != new.get("agentRole"):
+            return False
+        if any(old_data.get(k) != new_data.get(k) for k in ("parentId", "parentTaskId")):
+            return False  # each placement (re)parents the task
+        started = ("running", "assigned")
+        return old_data.get("to") in started and new_data.get("to") in started
+
+    @staticmethod
+    def _merge(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+        """``new`` folded at ``old``'s place in the queue, so at ``old``'s log time."""
+        if new.get("message") == "Worker progress":
+            # The first event of a phase is where phase timing starts: keep it
+            # whole and take only the newer progress text.
+            detail = (new.get("data") or {}).get("detail")
+            return {**old, "data": {**(old.get("data") or {}), "detail": detail}}
+        merged = {**new, "timestamp": old.get("timestamp")}
+        if new.get("message") == "Task status":
+            # Collapse a -> b, b -> c into a -> c, keeping fields only the older event had.
+            old_data = old.get("data") or {}
+            data = {**old_data, **(new.get("data") or {})}
+            if "from" in old_data:
+                data["from"] = old_data["from"]
+            merged["data"] = data
+        return merged
+
+    def put(self, item: Any, block: bool = True, timeout: float | None = None):
+        key = self.coalesce_key(item)
+        if key is not None and self.coalesce_at:
+            with self.mutex:
+                slot = self._slots.get(key)
+                if (
+                    slot is not None
+                    and self._qsize() >= self.coalesce_at
+                    and self._mergeable(slot[0], item)
+                ):
+                    slot[0] = self._merge(slot[0], item)
+                    self.coalesced[key[0]] = self.coalesced.get(key[0], 0) + 1
+                    self.coalesced_total += 1
+                    return
+        super().put(item, block, timeout)
+
+    # queue.Queue storage hooks: entries are one-element slots so they can be
+    # updated in place while queued.
+
+    def _init(self, maxsize: int):
+        self.queue: deque[list[Any]] = deque()
+        self._slots: dict[tuple[str, str], list[Any]] = {}
+
+    def _qsize(self) -> int:
+        return len(self.queue)
+
+    def _put(self, item: Any):
+        slot = [item]
+        self.queue.append(slot)
+        key = self.coalesce_key(item)
+        if key is not None:
+            self._slots[key] = slot
+        elif isinstance(item, dict) and item.get("message") in (
+            CHECKPOINT_MESSAGE,
+            RESTORE_MESSAGE,
+        ):
+            self._slots.clear()  # nothing after a checkpoint may be folded in before it
+        elif isinstance(item, dict) and self._slots:
+            # A later status must not be merged back past an event that also
+            # moves this task (completion, dispatch, timeout, ...).
+            data = item.get("data") or {}
+            for field in ("taskId", "subtaskId", "parentTaskId"):
+                task_id = data.get(field) or (item.get(field) if field == "taskId" else None)
+                if task_id:
+                    self._slots.pop(("Task status", str(task_id)), None)
+
+    def _get(self) -> Any:
+        slot = self.queue.popleft()
+        item = slot[0]
+        key = self.coalesce_key(item)
+        if key is not None and self._slots.get(key) is slot:
+            del self._slots[key]
+        return item
+
+
+# ---------------------------------------------------------------------------
+# Checkpoints
+# ---------------------------------------------------------------------------
+
+
+class CheckpointEntry(NamedTuple):
+    offset: int  # byte offset into the run log just past the last folded line
+    timestamp: int  # log timestamp (ms) of the last folded event
+    path: str
+
+
+class CheckpointStore:
+    """State checkpoints for one run log, kept beside it.
+
+    ``logs/run-X.ndjson`` gets ``logs/run-X.checkpoints/<offset>-<timestamp>.v<N>.json.gz``
+    with ``N`` the ``CHECKPOINT_VERSION``, so listing them needs no file reads
+    and checkpoints in an older format are never offered.
+    """
+
+    SUFFIX = f".v{CHECKPOINT_VERSION}.json.gz"
+
+    def __init__(self, log_path: str):
+        self.log_path = log_path
+        self.dir = os.path.splitext(log_path)[0] + ".checkpoints"
+
+    def entries(self) -> list[CheckpointEntry]:
+        out: list[CheckpointEntry] = []
+        try:
+            names = os.listdir(self.dir)
+        except OSError:
+            return out
+        for name in names:
+            stem = name.removesuffix(self.SUFFIX)
+            offset, _, ts = stem.partition("-")
+            if stem != name and offset.isdigit() and ts.isdigit():
+                out.append(CheckpointEntry(int(offset), int(ts), os.path.join(self.dir, name)))
+        out.sort()
+        return out
+
+    def write(self, ckpt: dict[str, Any]):
+        os.makedirs(self.dir, exist_ok=True)
+        path = os.path.join(self.dir, f"{ckpt['offset']:012d}-{ckpt['timestamp']}{self.SUFFIX}")
+        tmp = f"{path}.tmp"
+        try:
+            with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=3) as fh:
+                json.dump(ckpt, fh, separators=(",", ":"))
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    def remove_stale(self):
+        """Delete ``.tmp`` files of writers that died mid-write, and older-format checkpoints."""
+        try:
+            names = os.listdir(self.dir)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(".tmp") or (
+                name.endswith(".json.gz") and not name.endswith(self.SUFFIX)
+            ):
+                try:
+                    os.remove(os.path.join(self.dir, name))
+                except OSError:
+                    pass
+
+    def load(self, entry: CheckpointEntry) -> dict[str, Any] | None:
+        try:
+            with gzip.open(entry.path, "rt", encoding="utf-8") as fh:
+                ckpt = json.load(fh)
+        except (OSError, EOFError, ValueError):
+            return None
+        if not isinstance(ckpt, dict) or ckpt.get("version") != CHECKPOINT_VERSION:
+            return None
+        return ckpt
+
+    def _first_loadable(
+        self, entries: Iterable[CheckpointEntry]
+    ) -> tuple[CheckpointEntry, dict[str, Any]] | None:
+        for entry in entries:
+            ckpt = self.load(entry)
+            if ckpt is not None:
+                return entry, ckpt
+        return None
+
+    def latest(self, max_offset: int) -> tuple[CheckpointEntry, dict[str, Any]] | None:
+        """Newest readable checkpoint that lies within the first ``max_offset`` bytes."""
+        return self._first_loadable(e for e in reversed(self.entries()) if e.offset <= max_offset)
+
+    def before(self, ts: int) -> tuple[CheckpointEntry, dict[str, Any]] | None:
+        """Newest readable checkpoint taken at or before log time ``ts``."""
+        entries = sorted(self.entries(), key=lambda e: e.timestamp, reverse=True)
+        return self._first_loadable(e for e in entries if e.timestamp <= ts)
+
+
+def restore_event(ckpt: dict[str, Any] | None) -> dict[str, Any]:
+    """Queue item asking ``DashboardState`` to load ``ckpt`` (``None`` = start empty)."""
+    ts = ckpt.get("timestamp", 0) if ckpt else 0
+    return {"message": RESTORE_MESSAGE, "timestamp": ts, "data": {"checkpoint": ckpt}}
+
+
+class CheckpointMarks:
+    """Decides where a file reader drops checkpoint markers into its stream.
+
+    A marker follows the first batch of lines that ends at least ``interval_ms``
+    of log time after the previous checkpoint (written now or on an earlier
+    pass), carrying the byte offset the state will then be in sync with.
+    """
+
+    def __init__(self, store: CheckpointStore, interval_ms: int):
+        self.store = store
+        self.interval_ms = interval_ms
+        store.remove_stale()
+        self._taken = sorted(e.timestamp for e in store.entries())
+        self._first_ts: int | None = None
+
+    def after(self, events: list[Any], offset: int, q: queue.Queue[Any]):
+        ts = next(
+            (
+                ev["timestamp"]
+                for ev in reversed(events)
+                if isinstance(ev, dict) and isinstance(ev.get("timestamp"), int)
+            ),
+            None,
+        )
+        if ts is None:
+            return
+        if self._first_ts is None:
+            self._first_ts = ts
+        i = bisect.bisect_right(self._taken, ts)
+        prev = self._taken[i - 1] if i else self._first_ts
+        if ts - prev < self.interval_ms:
+            return
+        bisect.insort(self._taken, ts)
+        q.put(
+            {
+                "message": CHECKPOINT_MESSAGE,
+                "timestamp": ts,
+                "data": {"source": self.store.log_path, "offset": offset},
+            }
+        )
+
+
+class CheckpointWriter:
+    """Writes a state checkpoint for every marker the readers emit.
+
+    The state is copied under the ingest lock when the marker is folded, so it
+    matches the marker's offset exactly; compression and disk I/O happen on a
+    background thread.  If the writer falls behind, markers are skipped.
+    ``close`` finishes the queued writes before the process exits.
+    """
+
+    def __init__(self, state: DashboardState):
+        self.state = state
+        self._pending: queue.Queue[tuple[str, dict[str, Any]] | None] = queue.Queue(maxsize=2)
+        state.register_handler(CHECKPOINT_MESSAGE, self._on_marker, name="CheckpointWriter")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _on_marker(self, ev: IngestEvent):
+        ckpt = self.state.checkpoint()
+        ckpt["offset"] = ev.data["offset"]
+        ckpt["timestamp"] = ev.event["timestamp"]
+        ckpt["source"] = os.path.basename(ev.data["source"])
+        try:
+            self._pending.put_nowait((ev.data["source"], ckpt))
+        except queue.Full:
+            pass
+
+    def close(self):
+        """Write the checkpoints still queued, then stop the writer thread."""
+        if self._thread.is_alive():
+            self._pending.put(None)
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            source, ckpt = item
+            try:
+                CheckpointStore(source).write(ckpt)
+            except OSError:
+                pass
+
+
 # ---------------------------------------------------------------------------
 # NDJSON readers
 # ---------------------------------------------------------------------------
 
 
+class NdjsonDecoder:
+    """Incremental NDJSON splitter: feed raw bytes, get objects for complete lines.
+
+    A trailing partial line is held until its newline arrives, so a reader can
+    hand over whatever a chunked ``read`` returned.  Only complete lines are
+    decoded, straight from bytes.
+    """
+
+    __slots__ = ("_tail", "bad_lines", "bytes_in")
+
+    def __init__(self):
+        self._tail = b""
+        self.bad_lines = 0
+        self.bytes_in = 0
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        self.bytes_in += len(chunk)
+        buf = self._tail + chunk if self._tail else chunk
+        end = buf.rfind(b"\n")
+        if end < 0:
+            if len(buf) > MAX_LINE_BYTES:
+                self.bad_lines += 1
+                buf = b""
+            self._tail = buf
+            return []
+        self._tail = buf[end + 1 :]
+        return self._decode(buf[:end])
+
+    @property
+    def pending(self) -> int:
+        """Bytes of an unfinished line still held back."""
+        return len(self._tail)
+
+    def flush(self) -> list[Any]:
+        """Decode the final line of a stream that did not end in a newline."""
+        tail, self._tail = self._tail, b""
+        return self._decode(tail) if tail else []
+
+    def _decode(self, block: bytes) -> list[Any]:
+        # orjson parses bytes directly; the stdlib parser is fastest on str,
+        # so decode the whole block of complete lines in one call.
+        lines: list[Any]
+        out: list[Any]
+        if JSON_BACKEND == "json":
+            text = block.decode("utf-8", "replace")
+            # JSON strings cannot hold a raw newline, so the lines of a clean
+            # block join into one array and parse in a single C call.  A blank
+            # or bad line fails that (or changes the count): go line by line.
+            try:
+                out = _json_loads("[" + text.replace("\n", ",") + "]")
+            except ValueError:
+                pass
+            else:
+                if len(out) == text.count("\n") + 1:
+                    return out
+            lines = text.split("\n")
+        else:
+            lines = block.split(b"\n")
+        out = []
+        append = out.append
+        loads = _json_loads
+        for line in lines:
+            try:
+                append(loads(line))
+            except ValueError:  # JSONDecodeError, UnicodeDecodeError, or a blank line
+                if line.strip():
+                    self.bad_lines += 1
+        return out
+
+
+def pump_ndjson(stream: Any, q: queue.Queue[Any]) -> NdjsonDecoder:
+    """Copy NDJSON events from a binary stream into ``q`` until EOF."""
+    decoder = NdjsonDecoder()
+    read = getattr(stream, "read1", stream.read)
+    while True:
+        chunk = read(READ_CHUNK)
+        if not chunk:
+            break
+        for ev in decoder.feed(chunk):
+            q.put(ev)
+    for ev in decoder.flush():
+        q.put(ev)
+    return decoder
+
+
 def reader_subprocess(cmd: list[str], q: queue.Queue[Any], cwd: str):
     """Spawn orchestrator process, read NDJSON lines from stdout."""
     try:
         proc = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
+            stderr=subprocess.DEVNULL,
             cwd=cwd,
             env={**os.environ},
         )
         assert proc.stdout is not None
-        for line in proc.stdout:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                q.put(json.loads(line))
-            except json.JSONDecodeError:
-                pass
+        pump_ndjson(proc.stdout, q)
         proc.wait()
     except Exception as exc:
         q.put(
@@ -1040,114 +4517,477 @@ def reader_subprocess(cmd: list[str], q: queue.Queue[Any], cwd: str):
         q.put(None)
 
 
-def reader_stdin(q: queue.Queue[Any]):
-    """Read NDJSON from stdin (pipe mode)."""
+def reader_stdin(q: queue.Queue[Any]):
+    """Read NDJSON from stdin (pipe mode)."""
+    try:
+        pump_ndjson(sys.stdin.buffer, q)
+    finally:
+        q.put(None)
+
+
+def _is_run_log(name: str) -> bool:
+    return name.startswith("run-") and name.endswith(".ndjson")
+
+
+def _find_latest_ndjson(logs_dir: str) -> str | None:
+    try:
+        with os.scandir(logs_dir) as it:
+            runs = [(e.stat().st_mtime, e.path) for e in it if _is_run_log(e.name)]
+    except OSError:
+        return None
+    return max(runs)[1] if runs else None
+
+
+class Inotify:
+    """Minimal ctypes binding to Linux inotify; raises OSError where unsupported."""
+
+    IN_MODIFY = 0x00000002
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_IGNORED = 0x00008000
+
+    _EVENT = struct.Struct("iIII")  # wd, mask, cookie, len -- then len bytes of name
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify requires Linux")
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self._check(self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC))
+
+    def _check(self, ret: int) -> int:
+        if ret < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        return ret
+
+    def add_watch(self, path: str, mask: int) -> int:
+        return self._check(
+            self._libc.inotify_add_watch(self.fd, os.fsencode(path), ctypes.c_uint32(mask))
+        )
+
+    def rm_watch(self, wd: int):
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def wait(self, timeout: float | None) -> list[tuple[int, int, str]]:
+        """Block until something happens (or ``timeout``); return all pending events."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        events: list[tuple[int, int, str]] = []
+        while ready:
+            try:
+                buf = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                break
+            off = 0
+            while off < len(buf):
+                wd, mask, _cookie, size = self._EVENT.unpack_from(buf, off)
+                off += self._EVENT.size
+                name = buf[off : off + size].rstrip(b"\0").decode(errors="replace")
+                off += size
+                events.append((wd, mask, name))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _LogTail:
+    """The run log currently being followed, read in chunks from where it left off."""
+
+    def __init__(self, q: queue.Queue[Any], checkpoint_ms: int = 0):
+        self.q = q
+        self.checkpoint_ms = checkpoint_ms
+        self.path: str | None = None
+        self._fh: Any = None
+        self._decoder = NdjsonDecoder()
+        self._marks: CheckpointMarks | None = None
+
+    def open(self, path: str):
+        """Start following ``path``, from its newest checkpoint when there is one."""
+        self.close()
+        self.path = path
+        self._fh = open(path, "rb")
+        if not self.checkpoint_ms:
+            return
+        store = CheckpointStore(path)
+        self._marks = CheckpointMarks(store, self.checkpoint_ms)
+        found = store.latest(os.fstat(self._fh.fileno()).st_size)
+        if found is not None:
+            entry, ckpt = found
+            self.q.put(restore_event(ckpt))
+            self._fh.seek(entry.offset)
+
+    def pump(self) -> bool:
+        """Queue everything appended since the last call; True if anything was read."""
+        if self._fh is None:
+            return False
+        had_data = False
+        while True:
+            chunk = self._fh.read(READ_CHUNK)
+            if not chunk:
+                return had_data
+            had_data = True
+            events = self._decoder.feed(chunk)
+            for ev in events:
+                self.q.put(ev)
+            if self._marks is not None:
+                self._marks.after(events, self._fh.tell() - self._decoder.pending, self.q)
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+            for ev in self._decoder.flush():
+                self.q.put(ev)
+
+
+def _follow_inotify(logs_dir: str, tail: _LogTail, notify: Inotify):
+    """Event-driven follow; returns if the logs directory stops being watchable."""
+    while not os.path.isdir(logs_dir):
+        time.sleep(FOLLOW_POLL_INTERVAL)
+    dir_wd = notify.add_watch(logs_dir, Inotify.IN_CREATE | Inotify.IN_MOVED_TO)
+    file_wd = -1
+    latest = _find_latest_ndjson(logs_dir)
+    while True:
+        if latest and latest != tail.path:
+            tail.open(latest)
+            if file_wd >= 0:
+                notify.rm_watch(file_wd)
+            file_wd = notify.add_watch(latest, Inotify.IN_MODIFY)
+        # Watch first, then read: anything appended in between still wakes us.
+        tail.pump()
+        latest = None
+        for wd, mask, name in notify.wait(FOLLOW_WATCHDOG_INTERVAL):
+            if wd != dir_wd:
+                continue
+            if mask & Inotify.IN_IGNORED:
+                return
+            if _is_run_log(name):
+                latest = os.path.join(logs_dir, name)
+
+
+def _follow_poll(logs_dir: str, tail: _LogTail):
+    check_counter = 0
+    while True:
+        if check_counter % 8 == 0:
+            latest = _find_latest_ndjson(logs_dir)
+            if latest and latest != tail.path:
+                tail.open(latest)
+        check_counter += 1
+        if not tail.pump():
+            time.sleep(FOLLOW_POLL_INTERVAL)
+
+
+def reader_follow(logs_dir: str, q: queue.Queue[Any], checkpoint_ms: int = 0):
+    """Tail the latest NDJSON log file live — like tail -f.
+
+    Waits for a log file to appear, reads existing content to catch up,
+    then streams new lines.  Switches to a newer file if one appears
+    (new orchestrator run).  On Linux, inotify wakes the reader as soon as
+    a run starts or a line lands; elsewhere it polls.
+
+    With ``checkpoint_ms`` set, a run is entered at its newest checkpoint
+    instead of its first line, and new checkpoint markers are emitted.
+    """
+    tail = _LogTail(q, checkpoint_ms)
     try:
-        while True:
-            line = sys.stdin.readline()
-            if not line:
-                break
-            line = line.strip()
-            if not line:
-                continue
+        try:
+            notify: Inotify | None = Inotify()
+        except (OSError, AttributeError):
+            notify = None
+        if notify is not None:
             try:
-                q.put(json.loads(line))
-            except json.JSONDecodeError:
-                pass
+                _follow_inotify(logs_dir, tail, notify)
+            except OSError:
+                pass  # watch limit hit or directory gone -- fall back to polling
+            finally:
+                notify.close()
+        _follow_poll(logs_dir, tail)
     finally:
+        tail.close()
         q.put(None)
 
 
-def reader_replay(filepath: str, speed: float, q: queue.Queue[Any]):
-    """Replay an NDJSON log file, preserving original timestamp deltas."""
-    try:
-        with open(filepath) as f:
-            lines = f.readlines()
+class TraceFollower:
+    """Tails the run's trace and LLM detail files into the ingest queue.
 
-        events: list[tuple[int, dict[str, Any]]] = []
-        for raw in lines:
-            raw = raw.strip()
-            if not raw:
-                continue
-            try:
-                ev = json.loads(raw)
-                ts = ev.get("timestamp", 0)
-                events.append((ts, ev))
-            except json.JSONDecodeError:
-                continue
+    Trace lines become ``TRACE_MESSAGE`` events; LLM detail entries are cut
+    down to their sizes (``summarize_llm_detail``) on the tail thread and
+    become ``LLM_DETAIL_MESSAGE`` events.  The paths come from the
+    orchestrator's ``Run files`` event, or from the state a checkpoint
+    restored (which carries them), so a follow that resumes mid-run still
+    finds them.  Both files are read from their start.
+    """
 
-        if not events:
-            q.put(None)
-            return
+    FILES = (
+        ("traceFile", TRACE_MESSAGE, "span"),
+        ("llmDetailFile", LLM_DETAIL_MESSAGE, "detail"),
+    )
 
-        base_ts = events[0][0]
-        wall_start = time.time()
+    def __init__(self, state: DashboardState, q: queue.Queue[Any]):
+        self.state = state
+        self.q = q
+        self.paths: dict[str, str] = {}
+        state.register_handler("Run files", self._on_run_files, name="TraceFollower")
+        state.register_handler(RESTORE_MESSAGE, self._on_run_files, name="TraceFollower")
+
+    def _on_run_files(self, ev: IngestEvent):
+        for key, message, field in self.FILES:
+            path = self.state.run_files.get(key)
+            if path and path != self.paths.get(key):
+                self.paths[key] = path
+                threading.Thread(
+                    target=self._tail, args=(key, path, message, field), daemon=True
+                ).start()
+
+    def _tail(self, key: str, path: str, message: str, field: str):
+        while not os.path.exists(path):
+            if path != self.paths.get(key):
+                return
+            time.sleep(FOLLOW_POLL_INTERVAL)
+        decoder = NdjsonDecoder()
+        with open(path, "rb") as fh:
+            while path == self.paths.get(key):
+                chunk = fh.read(READ_CHUNK)
+                if not chunk:
+                    time.sleep(FOLLOW_POLL_INTERVAL)
+                    continue
+                for entry in decoder.feed(chunk):
+                    if not isinstance(entry, dict):
+                        continue
+                    if message == LLM_DETAIL_MESSAGE:
+                        entry = summarize_llm_detail(entry)
+                    self.q.put(
+                        {
+                            "message": message,
+                            "timestamp": entry.get("timestamp"),
+                            "data": {field: entry},
+                        }
+                    )
 
-        for ts, ev in events:
-            delta_s = (ts - base_ts) / 1000.0
-            target_wall = wall_start + delta_s / speed
-            wait = target_wall - time.time()
-            if wait > 0:
-                time.sleep(wait)
-            q.put(ev)
-    finally:
-        q.put(None)
 
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
 
-def _find_latest_ndjson(logs_dir: str) -> str | None:
-    if not os.path.isdir(logs_dir):
-        return None
-    files = [f for f in os.listdir(logs_dir) if f.startswith("run-") and f.endswith(".ndjson")]
-    if not files:
-        return None
-    files.sort(key=lambda f: os.path.getmtime(os.path.join(logs_dir, f)), reverse=True)
-    return os.path.join(logs_dir, files[0])
+_TIMESTAMP_RE = re.compile(rb'"timestamp"\s*:\s*(\d+)')
 
 
-def reader_follow(logs_dir: str, q: queue.Queue[Any]):
-    """Tail the latest NDJSON log file live — like tail -f.
+class ReplayIndex:
+    """Sparse timestamp -> byte offset index over an NDJSON log.
 
-    Waits for a log file to appear, reads existing content to catch up,
-    then polls for new lines.  Switches to a newer file if one appears
-    (new orchestrator run).
+    Built by sampling the first line after every ``stride`` bytes, so even a
+    multi-GB log costs a few thousand short reads.  Offsets always point at
+    the start of a line; timestamps are kept non-decreasing for bisecting.
     """
-    current_path: str | None = None
-    fh = None
-    check_counter = 0
-
-    try:
-        while True:
-            if check_counter % 8 == 0:
-                latest = _find_latest_ndjson(logs_dir)
-                if latest and latest != current_path:
-                    if fh:
-                        fh.close()
-                    current_path = latest
-                    fh = open(current_path)
-            check_counter += 1
-
-            if fh is None:
-                time.sleep(0.25)
-                continue
 
-            had_data = False
+    def __init__(self, path: str, stride: int = REPLAY_INDEX_STRIDE):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.offsets: list[int] = []
+        self.timestamps: list[int] = []
+        self.end_ts = 0
+        with open(path, "rb") as fh:
+            self._build(fh, stride)
+
+    def _build(self, fh: Any, stride: int):
+        pos = 0
+        while pos < self.size:
+            fh.seek(pos)
+            if pos:
+                fh.readline()  # resync on the next line start
             while True:
+                start = fh.tell()
                 line = fh.readline()
                 if not line:
                     break
-                line = line.strip()
-                if line:
-                    try:
-                        q.put(json.loads(line))
-                        had_data = True
-                    except json.JSONDecodeError:
-                        pass
+                m = _TIMESTAMP_RE.search(line)
+                if m:
+                    ts = int(m.group(1))
+                    if self.timestamps:
+                        ts = max(ts, self.timestamps[-1])
+                    if start not in self.offsets[-1:]:
+                        self.offsets.append(start)
+                        self.timestamps.append(ts)
+                    break
+            pos = max(pos + stride, fh.tell())
+        fh.seek(max(0, self.size - READ_CHUNK))
+        tail = _TIMESTAMP_RE.findall(fh.read())
+        last = int(tail[-1]) if tail else 0
+        self.end_ts = max(last, self.timestamps[-1] if self.timestamps else 0)
+
+    @property
+    def start_ts(self) -> int:
+        return self.timestamps[0] if self.timestamps else 0
+
+    def offset_for(self, ts: int) -> tuple[int, int]:
+        """Latest indexed ``(offset, timestamp)`` at or before ``ts``."""
+        i = bisect.bisect_right(self.timestamps, ts) - 1
+        if i < 0:
+            return 0, self.start_ts
+        return self.offsets[i], self.timestamps[i]
+
+
+class ReplayControl:
+    """Pause / speed / skip requests from the UI thread to ``reader_replay``."""
+
+    def __init__(self, speed: float, skip_minutes: float = REPLAY_SKIP_MINUTES):
+        self._cond = threading.Condition()
+        self._changed = False
+        self._skip_ms = 0
+        self.speed = speed
+        self.paused = False
+        self.skip_minutes = skip_minutes
+        self.start_ts = 0
+        self.end_ts = 0
+        self.position_ts = 0
+        self.finished = False
+
+    def _update(self, **fields: Any):
+        with self._cond:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self._changed = True
+            self._cond.notify_all()
+
+    def toggle_pause(self):
+        self._update(paused=not self.paused)
+
+    def step_speed(self, direction: int):
+        """Move to the next faster (``+1``) or slower (``-1``) preset speed."""
+        if direction > 0:
+            speed = next((v for v in REPLAY_SPEEDS if v > self.speed), REPLAY_SPEEDS[-1])
+        else:
+            speed = next((v for v in reversed(REPLAY_SPEEDS) if v < self.speed), REPLAY_SPEEDS[0])
+        self._update(speed=speed)
+
+    def skip(self, minutes: float | None = None):
+        step = self.skip_minutes if minutes is None else minutes
+        self._update(_skip_ms=self._skip_ms + int(step * 60_000))
+
+    def take_changes(self) -> int:
+        """Acknowledge pending control changes; returns the requested skip in ms."""
+        with self._cond:
+            skip, self._skip_ms, self._changed = self._skip_ms, 0, False
+            return skip
+
+    def wait_until(self, deadline: float) -> bool:
+        """Sleep until monotonic ``deadline`` while unpaused; True if interrupted by a change."""
+        if not self._changed and not self.paused and deadline <= time.monotonic():
+            return False  # already due -- skip the lock on the hot path
+        with self._cond:
+            while not self._changed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 and not self.paused:
+                    return False
+                self._cond.wait(None if self.paused else remaining)
+            return True
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "speed": self.speed,
+            "paused": self.paused,
+            "skip_minutes": self.skip_minutes,
+            "start_ts": self.start_ts,
+            "end_ts": self.end_ts,
+            "position_ts": self.position_ts,
+            "finished": self.finished,
+        }
+
+
+def _replay_seek(
+    store: CheckpointStore | None,
+    q: queue.Queue[Any],
+    control: ReplayControl,
+    position: int,
+    target: int,
+) -> int | None:
+    """Jump via the newest checkpoint at or before ``target``; returns the offset to read from.
+
+    Forward skips only jump when a checkpoint lies past ``position`` (otherwise
+    folding on is just as fast).  Backward skips without one restart from an
+    empty state at the top of the log.
+    """
+    found = store.before(target) if store is not None else None
+    if target >= position and (found is None or found[0].timestamp <= position):
+        return None
+    entry, ckpt = found if found is not None else (None, None)
+    q.put(restore_event(ckpt))
+    control.position_ts = entry.timestamp if entry else 0
+    return entry.offset if entry else 0
+
+
+def reader_replay(
+    filepath: str,
+    speed: float,
+    q: queue.Queue[Any],
+    control: ReplayControl | None = None,
+    checkpoint_ms: int = 0,
+):
+    """Replay an NDJSON log file, preserving original timestamp deltas.
+
+    Streams from disk in chunks, so memory stays flat for any log size.
+    ``control`` lets the UI pause, change speed or skip; skipped events are
+    still delivered (the state has to fold them), just unpaced.  With
+    ``checkpoint_ms`` set, checkpoints are written along the way and skips
+    jump through the nearest one instead of folding every event.
+    """
+    control = control or ReplayControl(speed)
+    store = CheckpointStore(filepath) if checkpoint_ms else None
+    marks = CheckpointMarks(store, checkpoint_ms) if store is not None else None
+    try:
+        index = ReplayIndex(filepath)
+        control.start_ts, control.end_ts = index.start_ts, index.end_ts
+        anchor_ts: int | None = None
+        anchor_wall = 0.0
+
+        def emit(ev: Any) -> int | None:
+            """Deliver ``ev`` at its replay time, or return an offset to seek to instead."""
+            nonlocal anchor_ts, anchor_wall
+            ts = ev.get("timestamp", 0) if isinstance(ev, dict) else 0
+            if not isinstance(ts, (int, float)):
+                ts = 0
+            if anchor_ts is None:
+                anchor_ts, anchor_wall = ts, time.monotonic()
+            while control.wait_until(
+                anchor_wall + (ts - anchor_ts) / 1000.0 / control.speed
+                if control.speed > 0
+                else 0.0
+            ):
+                # Re-anchor at the current position (plus any skip) on every change.
+                position = max(control.position_ts, anchor_ts)
+                skip = control.take_changes()
+                anchor_ts = max(control.start_ts, position + skip)
+                anchor_wall = time.monotonic()
+                if skip:
+                    offset = _replay_seek(store, q, control, position, anchor_ts)
+                    if offset is not None:
+                        return offset
+            q.put(ev)
+            if ts > control.position_ts:
+                control.position_ts = ts
+            return None
 
-            if not had_data:
-                time.sleep(0.25)
+        with open(filepath, "rb") as fh:
+            decoder = NdjsonDecoder()
+            while True:
+                chunk = fh.read(READ_CHUNK)
+                if not chunk:
+                    break
+                events = decoder.feed(chunk)
+                seek: int | None = None
+                for ev in events:
+                    seek = emit(ev)
+                    if seek is not None:
+                        break
+                if seek is not None:
+                    fh.seek(seek)
+                    decoder = NdjsonDecoder()
+                elif marks is not None:
+                    marks.after(events, fh.tell() - decoder.pending, q)
+            for ev in decoder.flush():
+                emit(ev)
     finally:
-        if fh:
-            fh.close()
+        control.finished = True
         q.put(None)
 
 
@@ -1184,9 +5024,40 @@ _DEMO_DESCS = [
 ]
 
 
-def demo_generator(q: queue.Queue[Any], max_agents: int, total_features: int):
-    """Generate synthetic orchestrator events for demo mode."""
-    start = time.time()
+DEMO_TICK = 0.25  # simulated seconds per generator step
+DEMO_MAX_SUB_DEPTH = 2  # "-sub-" levels below a top-level demo task
+DEMO_EPOCH_MS = 1_767_225_600_000  # 2026-01-01T00:00:00Z; seeded runs start here
+_DEMO_PHASES = (
+    "Cloning repo...",
+    "Installing deps...",
+    "Reading codebase...",
+    "Writing implementation...",
+    "Running tests...",
+    "Committing changes...",
+    "Tool calls: {}",
+    "Analyzing code structure...",
+)
+
+
+def demo_generator(
+    q: queue.Queue[Any],
+    max_agents: int,
+    total_features: int,
+    seed: int | None = None,
+    rate: float | None = None,
+):
+    """Generate synthetic orchestrator events for demo mode.
+
+    The run advances on a simulated clock of ``DEMO_TICK`` steps, so a given
+    ``seed`` always yields the same events, timestamps included: seeded runs
+    start at ``DEMO_EPOCH_MS`` rather than the current time.  ``rate`` paces output to that
+    many events/s (0 = unthrottled); by default the clock runs in real time.
+    """
+    rng = random.Random(seed)
+    wall_start = time.time()
+    start_ms = DEMO_EPOCH_MS if seed is not None else int(wall_start * 1000)
+    elapsed = 0.0
+    emitted = 0
     task_n = 0
     done = 0
     failed = 0
@@ -1194,269 +5065,230 @@ def demo_generator(q: queue.Queue[Any], max_agents: int, total_features: int):
     conflicts = 0
     iteration = 0
     tokens = 0
-    active: dict[str, float] = {}
-    created: list[str] = []
+    active: dict[str, float] = {}  # taskId -> simulated start time
+    expiry: list[tuple[float, int, str]] = []  # (finish time, spawn order, taskId)
+    parent_pool: list[str] = []
     child_counters: dict[str, int] = {}
 
+    def emit(level: str, agent_id: str, agent_role: str, message: str, data: dict[str, Any]):
+        nonlocal emitted
+        emitted += 1
+        q.put(
+            {
+                "timestamp": ts,
+                "level": level,
+                "agentId": agent_id,
+                "agentRole": agent_role,
+                "message": message,
+                "data": data,
+            }
+        )
+
     try:
         while done + failed < total_features:
-            now = time.time()
-            elapsed = now - start
-            ts = int(now * 1000)
+            now = elapsed
+            ts = start_ms + int(now * 1000)
 
             ramp = min(1.0, elapsed / 25.0)
             target = int(max_agents * ramp)
 
-            # -- complete some running tasks --------------------------------
-            for tid, started in list(active.items()):
-                dur = random.uniform(2.5, 10.0)
-                if now - started > dur:
-                    ok = random.random() < 0.92
-                    status = "complete" if ok else "failed"
-                    tok = random.randint(3000, 18000)
-                    tokens += tok
-
-                    if ok:
-                        done += 1
-                    else:
-                        failed += 1
+            # -- complete tasks whose run time is up ------------------------
+            while expiry and expiry[0][0] <= now:
+                _, _, tid = heapq.heappop(expiry)
+                started = active.pop(tid)
+                ok = rng.random() < 0.92
+                status = "complete" if ok else "failed"
+                tok = rng.randint(3000, 18000)
+                tokens += tok
+
+                if ok:
+                    done += 1
+                else:
+                    failed += 1
 
-                    q.put(
-                        {
-                            "timestamp": ts,
-                            "level": "info",
-                            "agentId": "main",
-                            "agentRole": "root-planner",
-                            "message": "Task completed",
-                            "data": {
-                                "taskId": tid,
-                                "status": status,
-                                "summary": f"Completed: {random.choice(_DEMO_DESCS)[:60]}",
-                                "filesChanged": random.randint(1, 8),
-                                "linesAdded": random.randint(20, 500),
-                                "linesRemoved": random.randint(0, 100),
-                                "filesCreated": random.randint(0, 3),
-                                "filesModified": random.randint(1, 5),
-                                "tokensUsed": tok,
-                                "toolCallCount": random.randint(5, 40),
-                                "durationMs": int((now - started) * 1000),
-                            },
-                        }
-                    )
-                    q.put(
-                        {
-                            "timestamp": ts,
-                            "level": "info",
-                            "agentId": "main",
-                            "agentRole": "root-planner",
-                            "message": "Task status",
-                            "data": {"taskId": tid, "from": "running", "to": status},
-                        }
-                    )
+                emit(
+                    "info",
+                    "main",
+                    "root-planner",
+                    "Task completed",
+                    {
+                        "taskId": tid,
+                        "status": status,
+                        "summary": f"Completed: {rng.choice(_DEMO_DESCS)[:60]}",
+                        "filesChanged": rng.randint(1, 8),
+                        "linesAdded": rng.randint(20, 500),
+                        "linesRemoved": rng.randint(0, 100),
+                        "filesCreated": rng.randint(0, 3),
+                        "filesModified": rng.randint(1, 5),
+                        "tokensUsed": tok,
+                        "toolCallCount": rng.randint(5, 40),
+                        "durationMs": int((now - started) * 1000),
+                    },
+                )
+                emit(
+                    "info",
+                    "main",
+                    "root-planner",
+                    "Task status",
+                    {"taskId": tid, "from": "running", "to": status},
+                )
 
-                    # merge
-                    if ok:
-                        if random.random() < 0.94:
-                            merged += 1
-                            q.put(
-                                {
-                                    "timestamp": ts,
-                                    "level": "info",
-                                    "agentId": "planner",
-                                    "agentRole": "root-planner",
-                                    "message": "Merge result",
-                                    "data": {
-                                        "branch": f"worker/{tid}",
-                                        "status": "merged",
-                                        "success": True,
-                                    },
-                                }
-                            )
-                        else:
-                            conflicts += 1
-                            q.put(
-                                {
-                                    "timestamp": ts,
-                                    "level": "warn",
-                                    "agentId": "planner",
-                                    "agentRole": "root-planner",
-                                    "message": "Merge result",
-                                    "data": {
-                                        "branch": f"worker/{tid}",
-                                        "status": "conflict",
-                                        "success": False,
-                                    },
-                                }
-                            )
-                    del active[tid]
+                # merge
+                if ok:
+                    if rng.random() < 0.94:
+                        merged += 1
+                        emit(
+                            "info",
+                            "planner",
+                            "root-planner",
+                            "Merge result",
+                            {"branch": f"worker/{tid}", "status": "merged", "success": True},
+                        )
+                    else:
+                        conflicts += 1
+                        emit(
+                            "warn",
+                            "planner",
+                            "root-planner",
+                            "Merge result",
+                            {"branch": f"worker/{tid}", "status": "conflict", "success": False},
+                        )
 
             # -- spawn new tasks to fill slots ------------------------------
             while len(active) < target and task_n < total_features:
                 task_n += 1
                 parent_id = ""
-                parent_pool = [t for t in created if t.count("-sub-") < 2]
-                if parent_pool and random.random() < 0.5:
-                    parent_id = random.choice(parent_pool)
+                if parent_pool and rng.random() < 0.5:
+                    parent_id = rng.choice(parent_pool)
                     child_counters[parent_id] = child_counters.get(parent_id, 0) + 1
                     tid = f"{parent_id}-sub-{child_counters[parent_id]}"
                 else:
                     tid = f"agent-{task_n:03d}"
-                desc = random.choice(_DEMO_DESCS)
-                created.append(tid)
-
-                q.put(
-                    {
-                        "timestamp": ts,
-                        "level": "info",
-                        "agentId": "main",
-                        "agentRole": "root-planner",
-                        "message": "Task created",
-                        "data": {"taskId": tid, "desc": desc, "parentId": parent_id or None},
-                    }
+                desc = rng.choice(_DEMO_DESCS)
+                if tid.count("-sub-") < DEMO_MAX_SUB_DEPTH:
+                    parent_pool.append(tid)
+
+                emit(
+                    "info",
+                    "main",
+                    "root-planner",
+                    "Task created",
+                    {"taskId": tid, "desc": desc, "parentId": parent_id or None},
                 )
-                q.put(
-                    {
-                        "timestamp": ts,
-                        "level": "info",
-                        "agentId": "worker-pool",
-                        "agentRole": "root-planner",
-                        "message": "Dispatching task to ephemeral sandbox",
-                        "data": {"taskId": tid, "parentId": parent_id or None},
-                    }
+                emit(
+                    "info",
+                    "worker-pool",
+                    "root-planner",
+                    "Dispatching task to ephemeral sandbox",
+                    {"taskId": tid, "parentId": parent_id or None},
                 )
-                q.put(
+                emit(
+                    "info",
+                    "main",
+                    "root-planner",
+                    "Task status",
                     {
-                        "timestamp": ts,
-                        "level": "info",
-                        "agentId": "main",
-                        "agentRole": "root-planner",
-                        "message": "Task status",
-                        "data": {
-                            "taskId": tid,
-                            "parentId": parent_id or None,
-                            "from": "pending",
-                            "to": "running",
-                            "desc": desc,
-                        },
-                    }
+                        "taskId": tid,
+                        "parentId": parent_id or None,
+                        "from": "pending",
+                        "to": "running",
+                        "desc": desc,
+                    },
                 )
                 active[tid] = now
-
-            for tid_active in list(active.keys()):
-                if random.random() < 0.3:
-                    phases = [
-                        "Cloning repo...",
-                        "Installing deps...",
-                        "Reading codebase...",
-                        "Writing implementation...",
-                        "Running tests...",
-                        "Committing changes...",
-                        f"Tool calls: {random.randint(5, 40)}",
-                        "Analyzing code structure...",
-                    ]
-                    q.put(
-                        {
-                            "timestamp": ts,
-                            "level": "info",
-                            "agentId": "worker-pool",
-                            "agentRole": "root-planner",
-                            "message": "Worker progress",
-                            "data": {
-                                "taskId": tid_active,
-                                "phase": "execution",
-                                "detail": random.choice(phases),
-                            },
-                        }
+                heapq.heappush(expiry, (now + rng.uniform(2.5, 10.0), task_n, tid))
+
+            for tid_active in active:
+                if rng.random() < 0.3:
+                    phase = rng.choice(_DEMO_PHASES).format(rng.randint(5, 40))
+                    emit(
+                        "info",
+                        "worker-pool",
+                        "root-planner",
+                        "Worker progress",
+                        {"taskId": tid_active, "phase": "execution", "detail": phase},
                     )
 
-            if random.random() < 0.35:
+            if rng.random() < 0.35:
                 eh = max(elapsed / 3600, 0.001)
                 ma = merged + conflicts
-                q.put(
+                emit(
+                    "info",
+                    "monitor",
+                    "root-planner",
+                    "Metrics",
                     {
                         "timestamp": ts,
-                        "level": "info",
-                        "agentId": "monitor",
-                        "agentRole": "root-planner",
-                        "message": "Metrics",
-                        "data": {
-                            "timestamp": ts,
-                            "activeWorkers": len(active),
-                            "pendingTasks": max(0, task_n - done - failed - len(active)),
-                            "completedTasks": done,
-                            "failedTasks": failed,
-                            "commitsPerHour": done / eh,
-                            "mergeSuccessRate": merged / ma if ma else 0,
-                            "totalTokensUsed": tokens,
-                            "totalCostUsd": 0,
-                        },
-                    }
+                        "activeWorkers": len(active),
+                        "pendingTasks": max(0, task_n - done - failed - len(active)),
+                        "completedTasks": done,
+                        "failedTasks": failed,
+                        "commitsPerHour": done / eh,
+                        "mergeSuccessRate": merged / ma if ma else 0,
+                        "totalTokensUsed": tokens,
+                        "totalCostUsd": 0,
+                    },
                 )
 
             # -- iteration events -------------------------------------------
-            if done > 0 and done % 15 == 0 and random.random() < 0.4:
+            if done > 0 and done % 15 == 0 and rng.random() < 0.4:
                 iteration += 1
-                q.put(
+                emit(
+                    "info",
+                    "main",
+                    "root-planner",
+                    "Iteration complete",
                     {
-                        "timestamp": ts,
-                        "level": "info",
-                        "agentId": "main",
-                        "agentRole": "root-planner",
-                        "message": "Iteration complete",
-                        "data": {
-                            "iteration": iteration,
-                            "tasks": random.randint(8, 20),
-                            "handoffs": random.randint(8, 20),
-                            "activeWorkers": len(active),
-                            "completedTasks": done,
-                        },
-                    }
+                        "iteration": iteration,
+                        "tasks": rng.randint(8, 20),
+                        "handoffs": rng.randint(8, 20),
+                        "activeWorkers": len(active),
+                        "completedTasks": done,
+                    },
                 )
 
-            if done > 0 and done % 20 == 0 and random.random() < 0.5:
-                q.put(
+            if done > 0 and done % 20 == 0 and rng.random() < 0.5:
+                emit(
+                    "info",
+                    "planner",
+                    "root-planner",
+                    "Calling LLM for task decomposition",
                     {
-                        "timestamp": ts,
-                        "level": "info",
-                        "agentId": "planner",
-                        "agentRole": "root-planner",
-                        "message": "Calling LLM for task decomposition",
-                        "data": {
-                            "isFirstPlan": False,
-                            "historyMessages": random.randint(4, 20),
-                            "newHandoffs": random.randint(3, 10),
-                        },
-                    }
+                        "isFirstPlan": False,
+                        "historyMessages": rng.randint(4, 20),
+                        "newHandoffs": rng.randint(3, 10),
+                    },
                 )
 
             # -- occasional reconciler sweep --------------------------------
-            if random.random() < 0.015:
-                b = random.random() < 0.85
-                t = random.random() < 0.80
-                q.put(
-                    {
-                        "timestamp": ts,
-                        "level": "info",
-                        "agentId": "reconciler",
-                        "agentRole": "reconciler",
-                        "message": "Sweep check results",
-                        "data": {"buildOk": b, "testsOk": t},
-                    }
+            if rng.random() < 0.015:
+                b = rng.random() < 0.85
+                t = rng.random() < 0.80
+                emit(
+                    "info",
+                    "reconciler",
+                    "reconciler",
+                    "Sweep check results",
+                    {"buildOk": b, "testsOk": t},
                 )
                 if not (b and t):
-                    fc = random.randint(1, 3)
-                    q.put(
-                        {
-                            "timestamp": ts,
-                            "level": "info",
-                            "agentId": "main",
-                            "agentRole": "root-planner",
-                            "message": "Reconciler created fix tasks",
-                            "data": {"count": fc},
-                        }
+                    emit(
+                        "info",
+                        "main",
+                        "root-planner",
+                        "Reconciler created fix tasks",
+                        {"count": rng.randint(1, 3)},
                     )
 
-            time.sleep(0.25)
+            elapsed += DEMO_TICK
+            if rate is None:
+                delay = wall_start + elapsed - time.time()
+            elif rate > 0:
+                delay = wall_start + emitted / rate - time.time()
+            else:
+                delay = 0.0
+            if delay > 0:
+                time.sleep(delay)
     finally:
         q.put(None)
 
@@ -1488,6 +5320,12 @@ class KeyPoller:
             sys.stdout.flush()
             termios.tcsetattr(self.fd, termios.TCSADRAIN, self._old)
 
+    def pending(self) -> bool:
+        if not self.enabled or self.fd is None:
+            return False
+        ready, _, _ = select.select([self.fd], [], [], 0)
+        return bool(ready)
+
     def poll(self) -> str:
         if not self.enabled or self.fd is None:
             return ""
@@ -1552,6 +5390,113 @@ class KeyPoller:
         return raw.decode("utf-8", errors="ignore")
 
 
+# ---------------------------------------------------------------------------
+# Frame pacing
+# ---------------------------------------------------------------------------
+
+
+class FramePacer:
+    """Adaptive frame scheduler for the TUI main loop.
+
+    Each frame ingests queued events until its time budget (the frame interval
+    minus the measured render cost) is spent, waiting for new events while the
+    queue is empty.  The frame rate drops while a backlog persists, so less
+    time goes to rendering, and climbs back toward ``max_hz`` once ingestion
+    keeps up.
+    """
+
+    WAIT_SLICE = 0.05  # max blocking wait before re-checking for key input
+    BATCH_SIZE = 256  # events per DashboardState.ingest_many call
+
+    def __init__(self, hz: float, min_hz: float = 1.0, max_hz: float | None = None):
+        self.base_hz = float(hz)
+        self.min_hz = min(float(min_hz), self.base_hz)
+        self.max_hz = max(float(max_hz or hz * 2), self.base_hz)
+        self.hz = self.base_hz
+        self.render_cost = 0.0
+        self.ingested = 0
+        self.frame_start = time.perf_counter()
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.hz
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter()
+        self.ingested = 0
+
+    def _deadline(self) -> float:
+        budget = max(self.interval - self.render_cost, self.interval * 0.5)
+        return self.frame_start + budget
+
+    def drain(
+        self,
+        q: queue.Queue[Any],
+        ingest_many: Callable[[list[dict[str, Any]]], None],
+        interrupted: Callable[[], bool],
+    ) -> bool:
+        """Ingest events until the frame budget is spent; True once the stream ended.
+
+        Events are handed over in batches of up to ``BATCH_SIZE``, flushed early
+        whenever the queue runs dry.
+        """
+        deadline = self._deadline()
+        batch: list[dict[str, Any]] = []
+        try:
+            while True:
+                now = time.perf_counter()
+                if now >= deadline:
+                    return False
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    if batch:
+                        ingest_many(batch)
+                        self.ingested += len(batch)
+                        batch = []
+                    if interrupted():
+                        return False
+                    try:
+                        item = q.get(timeout=min(deadline - now, self.WAIT_SLICE))
+                    except queue.Empty:
+                        continue
+                if item is None:
+                    return True
+                batch.append(item)
+                if len(batch) >= self.BATCH_SIZE:
+                    ingest_many(batch)
+                    self.ingested += len(batch)
+                    batch = []
+        finally:
+            if batch:
+                ingest_many(batch)
+                self.ingested += len(batch)
+
+    def wait(self, interrupted: Callable[[], bool]):
+        """Sleep out the rest of the frame, waking early for key input."""
+        deadline = self._deadline()
+        while not interrupted():
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, self.WAIT_SLICE))
+
+    def record_render(self, cost: float):
+        self.render_cost = cost if not self.render_cost else 0.8 * self.render_cost + 0.2 * cost
+
+    def end_frame(self, backlog: int):
+        if backlog:
+            hz = self.hz * 0.8
+        elif self.ingested:
+            hz = self.hz * 1.25
+        else:
+            hz = self.hz + (self.base_hz - self.hz) * 0.25
+        # Never let rendering take more than half of a frame.
+        if self.render_cost:
+            hz = min(hz, 0.5 / self.render_cost)
+        self.hz = max(self.min_hz, min(self.max_hz, hz))
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -1571,6 +5516,293 @@ def print_json_loop(q: queue.Queue[Any]):
             break
 
 
+def print_handler_stats(console: Console, rows: list[dict[str, Any]]):
+    """Print the per-handler ingest profile collected by ``DashboardState``."""
+    table = Table(title="Ingest handlers", box=None, title_justify="left", padding=(0, 1))
+    table.add_column("message", style="white")
+    table.add_column("handler", style="dim")
+    table.add_column("calls", justify="right")
+    table.add_column("total ms", justify="right")
+    table.add_column("mean \u00b5s", justify="right")
+    for r in rows:
+        if not r["calls"]:
+            continue
+        table.add_row(
+            r["message"],
+            r["handler"],
+            f"{r['calls']:,}",
+            f"{r['total_ms']:.1f}",
+            f"{r['mean_us']:.1f}",
+        )
+    console.print(table)
+    console.print()
+
+
+# ---------------------------------------------------------------------------
+# Headless output
+# ---------------------------------------------------------------------------
+
+HEADLESS_STATS = (
+    "elapsed",
+    "log_elapsed",
+    "active",
+    "pending",
+    "completed",
+    "failed",
+    "total_tasks",
+    "cph",
+    "merge_rate",
+    "merge_merged",
+    "merge_conflicts",
+    "merge_failed",
+    "tokens",
+    "estimated_in_flight",
+    "cost",
+    "iteration",
+    "recent_velocity",
+    "planner_thinking",
+    "stragglers",
+    "phases",
+    "alerts",
+    "alerts_fired",
+    "replay",
+)
+
+
+def _headless_node(view: Mapping[str, Any]) -> dict[str, Any]:
+    return {
+        "status": view["status"],
+        "progress": round(view["progress"], 4),
+        "depth": view["depth"],
+        "role": view["role"],
+        "children": view["children"],
+    }
+
+
+class SnapshotWriter:
+    """Writes ``DashboardState`` snapshots as compact NDJSON records.
+
+    In delta mode every record after the first carries only the stats that
+    changed and the tree nodes whose views were rebuilt since the last one.
+    """
+
+    def __init__(self, out: Any, deltas: bool = False):
+        self.out = out
+        self.deltas = deltas
+        self.records = 0
+        self._stats: dict[str, Any] = {}
+        self._nodes: Mapping[str, Any] = {}
+
+    def _emit(self, record: dict[str, Any]):
+        self.out.write(json.dumps(record, separators=(",", ":"), default=dict))
+        self.out.write("\n")
+        self.out.flush()
+        self.records += 1
+
+    def write(self, s: Mapping[str, Any]):
+        stats = {k: s[k] for k in HEADLESS_STATS}
+        tree = s["tree"]
+        nodes = tree["nodes"]
+        delta = self.deltas and self.records > 0
+        current = nodes.current()
+        if delta:
+            prev_stats, prev_nodes = self._stats, self._nodes
+            changed_stats = {k: v for k, v in stats.items() if prev_stats.get(k) != v}
+            names = None
+            if isinstance(prev_nodes, NodeViews):
+                names = nodes.changed_since(prev_nodes)
+            changed = {
+                n: current[n]
+                for n in (current if names is None else names)
+                if n in current and prev_nodes.get(n) is not current[n]
+            }
+        else:
+            changed_stats, changed = stats, current
+        self._stats, self._nodes = stats, nodes
+        self._emit(
+            {
+                "type": "delta" if delta else "snapshot",
+                "generation": s["generation"],
+                "stats": changed_stats,
+                "tree": {
+                    "max_depth": tree["max_depth"],
+                    "active_max_depth": tree["active_max_depth"],
+                    "nodes": {n: _headless_node(v) for n, v in changed.items()},
+                },
+            }
+        )
+
+    def summary(self, s: Mapping[str, Any], state: DashboardState):
+        root = s["tree"]["nodes"].get(PlannerTreeState.ROOT_ID)
+        run = state.run_summary()
+        utilization = dict(state.utilization_summary())
+        for key in ("busy_columns", "queued_columns"):
+            del utilization[key]
+        self._emit(
+            {
+                "type": "summary",
+                "generation": s["generation"],
+                "stats": {k: s[k] for k in HEADLESS_STATS},
+                "tree": {
+                    "nodes": len(s["tree"]["nodes"]),
+                    "max_depth": s["tree"]["max_depth"],
+                    "progress": round(root["progress"], 4) if root else 0.0,
+                    "archived": s["tree"]["archived"],
+                    "status_counts": run["status_counts"],
+                },
+                "llm": run["llm"],
+                "utilization": utilization,
+                "branches": run["branches"],
+            }
+        )
+
+
+def run_headless(args: argparse.Namespace) -> int:
+    """Ingest like the TUI, but write JSON state records instead of rendering.
+
+    Returns ``ALERT_EXIT_CODE`` if any alert fired during the run, else 0.
+    """
+    state = make_state(args)
+    dq = IngestBuffer(INGEST_QUEUE_SIZE)
+    replay_control = ReplayControl(args.speed, args.skip_minutes) if args.replay else None
+    checkpoint_ms = int(args.checkpoint_interval * 60_000)
+    ckpt_writer = CheckpointWriter(state) if checkpoint_ms > 0 else None
+    if not args.replay:  # a replay's trace would run ahead of its log
+        TraceFollower(state, dq)
+    start_reader(args, dq, checkpoint_ms, replay_control)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    writer = SnapshotWriter(out, args.deltas)
+    interval = args.snapshot_interval
+    next_at = time.monotonic() + interval if interval > 0 else float("inf")
+    batch: list[dict[str, Any]] = []
+
+    def sync_replay():
+        if replay_control is not None:
+            state.set_replay(replay_control.status())
+
+    def record():
+        sync_replay()
+        writer.write(state.snap())
+
+    try:
+        while True:
+            now = time.monotonic()
+            if now >= next_at:
+                state.ingest_many(batch)
+                batch = []
+                record()
+                next_at = now + interval
+            try:
+                item = dq.get(timeout=min(FramePacer.WAIT_SLICE, next_at - now))
+            except queue.Empty:
+                state.ingest_many(batch)
+                batch = []
+                state.check_alerts()
+                continue
+            if item is None:
+                break
+            batch.append(item)
+            if len(batch) >= FramePacer.BATCH_SIZE:
+                state.ingest_many(batch)
+                batch = []
+    except KeyboardInterrupt:
+        pass
+    finally:
+        state.ingest_many(batch)
+        if interval > 0:
+            record()  # deltas stay complete up to the summary
+        else:
+            sync_replay()  # the summary's replay stat is otherwise never set
+        writer.summary(state.snap(), state)
+        if out is not sys.stdout:
+            out.close()
+        if ckpt_writer is not None:
+            ckpt_writer.close()
+    return ALERT_EXIT_CODE if state.alerts.fired_total else 0
+
+
+def make_state(args: argparse.Namespace) -> DashboardState:
+    """``DashboardState`` configured from the command line (TUI and --headless)."""
+    state = DashboardState(args.agents, args.features, args.cost_rate)
+    state.archive_after = args.archive_after * 60
+    if args.alerts is not None:
+        state.alerts.configure(args.alerts)
+    state.alerts.live = not args.replay  # replayed log time is not wall time
+    return state
+
+
+def _read_ndjson(path: str) -> Iterable[Any]:
+    decoder = NdjsonDecoder()
+    with open(path, "rb") as fh:
+        while chunk := fh.read(READ_CHUNK):
+            yield from decoder.feed(chunk)
+    yield from decoder.flush()
+
+
+def run_llm_stats(args: argparse.Namespace) -> int:
+    """Offline: analyze an llmDetailFile (and its sibling trace file) into one JSON record."""
+    detail_path = args.llm_stats
+    directory, name = os.path.split(detail_path)
+    trace_path = os.path.join(directory, name.replace("llm-detail-", "trace-", 1))
+    stats = LlmCallStats()
+    if trace_path != detail_path and os.path.exists(trace_path):
+        for span in _read_ndjson(trace_path):
+            if isinstance(span, dict):
+                stats.add_span(span)
+    else:
+        print(f"no trace file at {trace_path}; latency and tokens unavailable", file=sys.stderr)
+    for entry in _read_ndjson(detail_path):
+        if isinstance(entry, dict):
+            stats.add_detail(summarize_llm_detail(entry))
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        json.dump(stats.summary(), out, indent=2)
+        out.write("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def start_reader(
+    args: argparse.Namespace,
+    q: queue.Queue[Any],
+    checkpoint_ms: int = 0,
+    replay_control: ReplayControl | None = None,
+) -> threading.Thread:
+    """Start the reader thread for the input mode selected on the command line."""
+    if args.follow:
+        logs_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+        thr = threading.Thread(target=reader_follow, args=(logs_dir, q, checkpoint_ms), daemon=True)
+    elif args.replay:
+        replay_control = replay_control or ReplayControl(args.speed, args.skip_minutes)
+        if args.seek:
+            replay_control.skip(args.seek)
+        thr = threading.Thread(
+            target=reader_replay,
+            args=(args.replay, args.speed, q, replay_control, checkpoint_ms),
+            daemon=True,
+        )
+    elif args.demo:
+        thr = threading.Thread(
+            target=demo_generator,
+            args=(q, args.agents, args.features, args.seed, args.rate),
+            daemon=True,
+        )
+    elif args.stdin:
+        thr = threading.Thread(target=reader_stdin, args=(q,), daemon=True)
+    else:
+        cwd = os.path.dirname(os.path.abspath(__file__))
+        thr = threading.Thread(
+            target=reader_subprocess,
+            args=(["node", "packages/orchestrator/dist/main.js"], q, cwd),
+            daemon=True,
+        )
+    thr.start()
+    return thr
+
+
 def main():
     ap = argparse.ArgumentParser(description="Longshot Rich Terminal Dashboard")
     ap.add_argument("--demo", action="store_true", help="Synthetic data mode")
@@ -1591,75 +5823,152 @@ def main():
         "--speed",
         type=float,
         default=1.0,
-        help="Replay speed multiplier (default 1.0, e.g. 10 = 10x faster)",
+        help="Replay speed multiplier (default 1.0, e.g. 10 = 10x faster, 0 = as fast as possible)",
+    )
+    ap.add_argument(
+        "--skip-minutes",
+        type=float,
+        default=REPLAY_SKIP_MINUTES,
+        help=f"Log minutes skipped by the replay 'n' key (default {REPLAY_SKIP_MINUTES:g})",
+    )
+    ap.add_argument(
+        "--seek",
+        type=float,
+        default=0.0,
+        metavar="MIN",
+        help="Start --replay this many log minutes in (via checkpoints when available)",
+    )
+    ap.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=CHECKPOINT_INTERVAL_MINUTES,
+        metavar="MIN",
+        help="Log minutes between state checkpoints for --follow/--replay; 0 disables "
+        f"writing and resuming from them (default {CHECKPOINT_INTERVAL_MINUTES:g})",
     )
     ap.add_argument("--json-only", action="store_true", help="Output raw NDJSON to stdout (no TUI)")
+    ap.add_argument(
+        "--headless",
+        action="store_true",
+        help="No TUI: write JSON state records to --output, then a final summary",
+    )
+    ap.add_argument(
+        "--output",
+        default="-",
+        metavar="FILE",
+        help="Headless output file (default stdout)",
+    )
+    ap.add_argument(
+        "--snapshot-interval",
+        type=float,
+        default=1.0,
+        metavar="SEC",
+        help="Seconds between headless state records; 0 writes only the summary (default 1)",
+    )
+    ap.add_argument(
+        "--deltas",
+        action="store_true",
+        help="Headless records after the first carry only changed stats and tree nodes",
+    )
+    ap.add_argument(
+        "--archive-after",
+        type=float,
+        default=ARCHIVE_AFTER_MINUTES,
+        metavar="MIN",
+        help="Log minutes after which a finished subtree folds into one aggregate node; "
+        f"0 keeps everything expanded (default {ARCHIVE_AFTER_MINUTES:g})",
+    )
+    ap.add_argument(
+        "--llm-stats",
+        default=None,
+        metavar="FILE",
+        help="Analyze an llm-detail-*.ndjson file (joined with its trace-*.ndjson) and "
+        "write per model/endpoint latency and token stats as JSON to --output",
+    )
+    ap.add_argument(
+        "--alerts",
+        default=None,
+        metavar="FILE",
+        help='JSON alert rules, {"rules": [{"kind": ..., "name": ..., params}]} with kinds '
+        f"{', '.join(ALERT_KINDS)}; --headless exits {ALERT_EXIT_CODE} if any fired "
+        "(default: built-in rules)",
+    )
     ap.add_argument("--agents", type=int, default=100, help="Max agent slots (default 100)")
-    ap.add_argument("--features", type=int, default=200, help="Total features (default 200)")
-    ap.add_argument("--hz", type=int, default=4, help="Refresh rate Hz (default 4)")
+    ap.add_argument(
+        "--features",
+        "--tasks",
+        type=int,
+        default=200,
+        help="Total features; --demo generates this many tasks (default 200)",
+    )
+    ap.add_argument("--seed", type=int, default=None, help="Random seed for --demo")
+    ap.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        metavar="EV/S",
+        help="Pace --demo at this many events/s, 0 = unthrottled (default: real time)",
+    )
+    ap.add_argument(
+        "--hz", type=int, default=4, help="Base refresh rate Hz, adapts to load (default 4)"
+    )
     ap.add_argument(
         "--cost-rate", type=float, default=COST_PER_1K, help="$/1K tokens for cost estimate"
     )
+    ap.add_argument(
+        "--ingest-stats",
+        action="store_true",
+        help="Print per-message handler call counts and timings on exit",
+    )
     args = ap.parse_args()
+    if args.alerts is not None:
+        try:
+            args.alerts = load_alert_rules(args.alerts)
+        except (OSError, ValueError) as exc:
+            ap.error(f"--alerts {args.alerts}: {exc}")
 
     # If JSON-only, we don't need rich console or dashboard state
     if args.json_only:
-        dq: queue.Queue[Any] = queue.Queue()
-        if args.follow:
-            logs_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
-            thr = threading.Thread(target=reader_follow, args=(logs_dir, dq), daemon=True)
-        elif args.demo:
-            thr = threading.Thread(
-                target=demo_generator, args=(dq, args.agents, args.features), daemon=True
-            )
-        elif args.stdin:
-            thr = threading.Thread(target=reader_stdin, args=(dq,), daemon=True)
-        else:
-            cwd = os.path.dirname(os.path.abspath(__file__))
-            thr = threading.Thread(
-                target=reader_subprocess,
-                args=(["node", "packages/orchestrator/dist/main.js"], dq, cwd),
-                daemon=True,
-            )
-        thr.start()
+        # Raw passthrough must not merge events, so only bound the buffer.
+        dq: queue.Queue[Any] = queue.Queue(INGEST_QUEUE_SIZE)
+        start_reader(args, dq)
         print_json_loop(dq)
         return
 
+    if args.llm_stats:
+        sys.exit(run_llm_stats(args))
+
+    if args.headless:
+        sys.exit(run_headless(args))
+
+    if not HAVE_RICH:
+        print("Rich library required.  pip install rich")
+        sys.exit(1)
+
     console = Console()
-    state = DashboardState(args.agents, args.features, args.cost_rate)
-    dq: queue.Queue[Any] = queue.Queue()
+    state = make_state(args)
+    dq = IngestBuffer(INGEST_QUEUE_SIZE)
+    replay_control = ReplayControl(args.speed, args.skip_minutes) if args.replay else None
 
-    if args.follow:
-        logs_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
-        thr = threading.Thread(target=reader_follow, args=(logs_dir, dq), daemon=True)
-    elif args.replay:
-        thr = threading.Thread(
-            target=reader_replay, args=(args.replay, args.speed, dq), daemon=True
-        )
-    elif args.demo:
-        thr = threading.Thread(
-            target=demo_generator, args=(dq, args.agents, args.features), daemon=True
-        )
-    elif args.stdin:
-        thr = threading.Thread(target=reader_stdin, args=(dq,), daemon=True)
-    else:
-        cwd = os.path.dirname(os.path.abspath(__file__))
-        thr = threading.Thread(
-            target=reader_subprocess,
-            args=(["node", "packages/orchestrator/dist/main.js"], dq, cwd),
-            daemon=True,
-        )
-    thr.start()
+    checkpoint_ms = int(args.checkpoint_interval * 60_000)
+    ckpt_writer = CheckpointWriter(state) if checkpoint_ms > 0 else None
+    if not args.replay:  # a replay's trace would run ahead of its log
+        TraceFollower(state, dq)
+    start_reader(args, dq, checkpoint_ms, replay_control)
 
     layout = make_layout()
     interactive_zoom = sys.stdin.isatty() and not args.stdin
 
     try:
         with KeyPoller(interactive_zoom) as key_poller:
-            with Live(layout, console=console, refresh_per_second=args.hz, screen=True):
+            with Live(layout, console=console, auto_refresh=False, screen=True) as live:
                 running = True
                 stream_ended = False
+                last_rendered: Mapping[str, Any] | None = None
+                visible_archives: list[str] = []
+                pacer = FramePacer(args.hz)
                 while running:
+                    pacer.begin_frame()
                     key = key_poller.poll()
                     while key:
                         if key in ("+", "="):
@@ -1676,8 +5985,7 @@ def main():
                                 except ValueError:
                                     mx = 0
                                     my = 0
-                                cur = state.snap()
-                                if cur["active_tab"] == "grid":
+                                if state.active_tab == "grid":
                                     pane = _grid_pane_from_mouse(
                                         mx,
                                         my,
@@ -1695,54 +6003,90 @@ def main():
                             state.set_tab("grid")
                         elif key in ("a", "A"):
                             state.set_tab("activity")
+                        elif key in ("t", "T"):
+                            state.set_tab("throughput")
+                        elif key in ("u", "U"):
+                            state.set_tab("slots")
+                        elif key in ("k", "K"):
+                            state.set_tab("branches")
+                        elif key in ("r", "R"):
+                            state.set_tab("spans")
+                        elif key in ("1", "2", "3") and state.active_tab in ("throughput", "slots"):
+                            state.set_throughput_window(THROUGHPUT_WINDOWS[int(key) - 1][0])
                         elif key in ("w", "W"):
-                            cur = state.snap()
-                            if cur["active_tab"] == "grid":
+                            if state.active_tab == "grid":
                                 state.adjust_tree_scroll("in_progress", -2)
                         elif key in ("s", "S"):
-                            cur = state.snap()
-                            if cur["active_tab"] == "grid":
+                            if state.active_tab == "grid":
                                 state.adjust_tree_scroll("in_progress", 2)
                         elif key in ("e", "E"):
-                            cur = state.snap()
-                            if cur["active_tab"] == "grid":
+                            if state.active_tab == "grid":
                                 state.adjust_tree_scroll("completed", -2)
                         elif key in ("d", "D"):
-                            cur = state.snap()
-                            if cur["active_tab"] == "grid":
+                            if state.active_tab == "grid":
                                 state.adjust_tree_scroll("completed", 2)
+                        elif key in ("x", "X"):
+                            if state.active_tab == "grid":
+                                state.expand_archives(visible_archives)
+                        elif key in ("z", "Z"):
+                            if state.active_tab == "grid":
+                                state.collapse_archives()
+                        elif replay_control is not None and key in (" ", "p", "P"):
+                            replay_control.toggle_pause()
+                        elif replay_control is not None and key in (".", ">"):
+                            replay_control.step_speed(1)
+                        elif replay_control is not None and key in (",", "<"):
+                            replay_control.step_speed(-1)
+                        elif replay_control is not None and key in ("n", "N"):
+                            replay_control.skip()
+                        elif replay_control is not None and key in ("b", "B"):
+                            replay_control.skip(-replay_control.skip_minutes)
                         key = key_poller.poll()
 
-                    # drain queue
-                    batch = 0
-                    while (not stream_ended) and batch < 200:  # cap per tick
-                        try:
-                            item = dq.get_nowait()
-                            if item is None:
-                                stream_ended = True
-                                break
-                            state.ingest(item)
-                            batch += 1
-                        except queue.Empty:
-                            break
-
-                    # render
-                    s = state.snap()
-                    apply_tab_layout(layout, s["active_tab"])
-                    layout["header"].update(render_header(s))
-                    layout["metrics"].update(render_metrics(s))
-                    layout["merge"].update(render_merge(s))
-                    if s["active_tab"] == "activity":
-                        layout["right"].update(render_activity(s))
+                    # ingest within the frame budget, then render only if state changed
+                    if stream_ended:
+                        pacer.wait(key_poller.pending)
                     else:
-                        layout["right"].update(render_grid(s))
-                    layout["footer"].update(render_footer(s))
-                    layout["controls"].update(render_controls(s, interactive_zoom))
+                        stream_ended = pacer.drain(dq, state.ingest_many, key_poller.pending)
+                    backlog = dq.qsize()
+                    state.set_loop_stats(backlog, pacer.hz, dq.coalesced_total)
+                    state.check_alerts()
+                    if replay_control is not None:
+                        state.set_replay(replay_control.status())
 
-                    time.sleep(1.0 / args.hz)
+                    s = state.snap()
+                    if s is not last_rendered:
+                        render_start = time.perf_counter()
+                        last_rendered = s
+                        apply_tab_layout(layout, s["active_tab"])
+                        layout["header"].update(render_header(s))
+                        layout["metrics"].update(render_metrics(s))
+                        layout["merge"].update(render_merge(s))
+                        if s["active_tab"] == "activity":
+                            layout["tab"].update(render_activity(s))
+                        elif s["active_tab"] == "throughput":
+                            layout["tab"].update(render_throughput(s))
+                        elif s["active_tab"] == "slots":
+                            layout["tab"].update(render_utilization(s))
+                        elif s["active_tab"] == "branches":
+                            layout["tab"].update(render_branches(s))
+                        elif s["active_tab"] == "spans":
+                            layout["tab"].update(render_spans(s))
+                        else:
+                            grid, visible_archives = build_grid(s)
+                            layout["tab"].update(grid)
+                        layout["stragglers"].update(render_stragglers(s))
+                        layout["footer"].update(render_footer(s))
+                        layout["controls"].update(render_controls(s, interactive_zoom))
+                        live.refresh()
+                        pacer.record_render(time.perf_counter() - render_start)
+                    pacer.end_frame(backlog)
 
     except KeyboardInterrupt:
         pass
+    finally:
+        if ckpt_writer is not None:
+            ckpt_writer.close()
 
     # final summary
     s = state.snap()
@@ -1758,7 +6102,33 @@ def main():
     )
     console.print(f"  Tokens      {s['tokens']:,}")
     console.print(f"  Est. cost   ${s['cost']:.2f}")
+    llm = state.run_summary()["llm"]
+    if llm["calls"]:
+        console.print(
+            f"  LLM calls   {llm['calls']}  errors {llm['errors']}  "
+            f"{llm['calls_per_task']['mean']:.1f}/task  bound by {llm['bound']}"
+        )
+    u = state.utilization_summary()
+    if u["arrivals_per_min"] or u["mean_busy"]:
+        console.print(
+            f"  Slots (1h)  {u['utilization'] * 100:.0f}% of {u['slots']} busy  "
+            f"wait {_ms_str(u['mean_wait_ms'])}  service {_ms_str(u['mean_service_ms'])}  "
+            f"bound by {u['bound']}"
+        )
+    if s["alerts_fired"]:
+        console.print(
+            f"  Alerts      {s['alerts_fired']} fired"
+            + (f", firing: {', '.join(a['name'] for a in s['alerts'])}" if s["alerts"] else "")
+        )
+    for row in s["phases"]:
+        if row["count"]:
+            console.print(
+                f"  {row['phase']:<18}  n={row['count']}  p50 {_ms_str(row['p50_ms'])}  "
+                f"p95 {_ms_str(row['p95_ms'])}  p99 {_ms_str(row['p99_ms'])}"
+            )
     console.print()
+    if args.ingest_stats:
+        print_handler_stats(console, state.handler_stats())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""Throughput and scaling benchmarks for dashboard.py.
+
+``readers``: writes a synthetic run log shaped like ``logs/run-*.ndjson``
+(including the chatty debug-level worker output) and measures how fast the
+NDJSON readers turn it into events.  Exits non-zero when the chunked reader
+is not ``--min-speedup`` times faster than the readline loop it replaced, or
+slower than ``--min-mbps``, so it can gate CI.
+
+``scale``: feeds deterministic synthetic swarms (``demo_generator``'s event
+vocabulary, configurable depth and fan-out) of each ``--tasks`` size through
+``DashboardState`` and reports ingest events/s, ``snap()`` and ``render_grid``
+latency, and peak RSS.  Each size runs in its own interpreter and reports
+its own high-water mark: ``ru_maxrss`` survives ``exec``, so workers reset
+and read ``VmHWM`` where Linux provides it.  The scale suite runs before the
+readers suite, and the readers only count the events they decode.
+
+    python scripts/bench_dashboard.py
+    python scripts/bench_dashboard.py --suite scale --tasks 1000,10000,100000 --json > bench.json
+    python scripts/bench_dashboard.py --lines 500000 --min-mbps 50 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import io
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import dashboard  # noqa: E402
+
+
+class BenchArgs(argparse.Namespace):
+    suite: str
+    lines: int
+    seed: int
+    repeat: int
+    min_mbps: float
+    min_speedup: float
+    tasks: str
+    depth: int
+    fanout: int
+    concurrency: int
+    json: bool
+    scale_worker: int
+
+
+def parse_args() -> BenchArgs:
+    parser = argparse.ArgumentParser(description="Benchmark dashboard.py ingest paths")
+    _ = parser.add_argument(
+        "--suite",
+        choices=("all", "readers", "scale"),
+        default="all",
+        help="Which benchmarks to run (default all)",
+    )
+    _ = parser.add_argument("--lines", type=int, default=200_000, help="NDJSON lines to generate")
+    _ = parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    _ = parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing runs")
+    _ = parser.add_argument(
+        "--min-mbps",
+        type=float,
+        default=0.0,
+        help="Fail if the chunked reader is slower than this many MB/s",
+    )
+    _ = parser.add_argument(
+        "--min-speedup",
+        type=float,
+        default=1.2,
+        help="Fail if the chunked reader is not this many times faster than readline (1.2)",
+    )
+    _ = parser.add_argument(
+        "--tasks",
+        default="1000,10000,100000",
+        help="Comma-separated swarm sizes for the scale suite",
+    )
+    _ = parser.add_argument("--depth", type=int, default=4, help="Max planner tree depth")
+    _ = parser.add_argument("--fanout", type=int, default=8, help="Max children per task")
+    _ = parser.add_argument(
+        "--concurrency", type=int, default=200, help="Tasks running at once in the swarm"
+    )
+    _ = parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    _ = parser.add_argument("--scale-worker", type=int, default=0, help=argparse.SUPPRESS)
+    return parser.parse_args(namespace=BenchArgs())
+
+
+# ---------------------------------------------------------------------------
+# Synthetic run log
+# ---------------------------------------------------------------------------
+
+
+def synth_log_line(rng: random.Random, i: int, ts: int) -> dict[str, Any]:
+    task_id = f"task-{rng.randrange(max(1, i // 20 + 1))}"
+    roll = rng.random()
+    if roll < 0.45:
+        return {
+            "timestamp": ts,
+            "level": "debug",
+            "agentId": "worker-pool",
+            "agentRole": "worker",
+            "taskId": task_id,
+            "message": "Worker output",
+            "data": {"taskId": task_id, "line": "x" * rng.randrange(40, 200)},
+        }
+    if roll < 0.65:
+        return {
+            "timestamp": ts,
+            "level": "info",
+            "agentId": "task-queue",
+            "agentRole": "root-planner",
+            "message": "Task status",
+            "data": {"taskId": task_id, "from": "pending", "to": "running"},
+        }
+    if roll < 0.8:
+        return {
+            "timestamp": ts,
+            "level": "info",
+            "agentId": "worker-pool",
+            "agentRole": "worker",
+            "message": "Worker progress",
+            "data": {"taskId": task_id, "phase": "tool", "detail": "edit src/chunk.ts"},
+        }
+    if roll < 0.9:
+        return {
+            "timestamp": ts,
+            "level": "info",
+            "agentId": "monitor",
+            "agentRole": "root-planner",
+            "message": "Metrics",
+            "data": {"activeWorkers": rng.randrange(100), "pendingTasks": rng.randrange(500)},
+        }
+    return {
+        "timestamp": ts,
+        "level": "info",
+        "agentId": "planner",
+        "agentRole": "root-planner",
+        "message": "Task created",
+        "data": {"taskId": f"task-{i}", "desc": "Implement chunk meshing system"},
+    }
+
+
+def write_synth_log(path: str, lines: int, seed: int) -> int:
+    rng = random.Random(seed)
+    ts = 1_700_000_000_000
+    with open(path, "w") as fh:
+        for i in range(lines):
+            ts += rng.randrange(0, 20)
+            fh.write(json.dumps(synth_log_line(rng, i, ts), separators=(",", ":")))
+            fh.write("\n")
+    return os.path.getsize(path)
+
+
+# ---------------------------------------------------------------------------
+# NDJSON reader throughput
+# ---------------------------------------------------------------------------
+
+
+class CountingSink:
+    """Stands in for the ingest queue: counts events instead of keeping them."""
+
+    def __init__(self):
+        self.count = 0
+
+    def put(self, item: Any):
+        self.count += 1
+
+
+def read_readline(path: str) -> int:
+    """The pre-chunking reader: text-mode readline + json.loads per line."""
+    q = CountingSink()
+    with open(path) as fh:
+        while True:
+            line = fh.readline()
+            if not line:
+                break
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                q.put(json.loads(line))
+            except json.JSONDecodeError:
+                pass
+    return q.count
+
+
+def read_chunked(path: str) -> int:
+    q = CountingSink()
+    with open(path, "rb") as fh:
+        dashboard.pump_ndjson(fh, q)  # type: ignore[arg-type]
+    return q.count
+
+
+def read_chunked_pipe(path: str) -> int:
+    """Chunked reader over an unbuffered-sized pipe-like stream (stdin shape)."""
+    q = CountingSink()
+    with open(path, "rb") as raw, io.BufferedReader(raw, buffer_size=8192) as fh:
+        dashboard.pump_ndjson(fh, q)  # type: ignore[arg-type]
+    return q.count
+
+
+def time_reader(fn: Callable[[str], int], path: str, size: int, repeat: int) -> dict[str, Any]:
+    best_wall = best_cpu = float("inf")
+    events = 0
+    for _ in range(repeat):
+        w0, c0 = time.perf_counter(), time.process_time()
+        events = fn(path)
+        best_wall = min(best_wall, time.perf_counter() - w0)
+        best_cpu = min(best_cpu, time.process_time() - c0)
+    return {
+        "events": events,
+        "seconds": best_wall,
+        "cpu_seconds": best_cpu,
+        "mb_per_s": size / best_wall / 1e6,
+        "events_per_s": events / best_wall,
+    }
+
+
+def bench_readers(args: BenchArgs, tmpdir: str) -> dict[str, Any]:
+    path = os.path.join(tmpdir, "run-bench.ndjson")
+    size = write_synth_log(path, args.lines, args.seed)
+    results = {
+        "readline": time_reader(read_readline, path, size, args.repeat),
+        "chunked": time_reader(read_chunked, path, size, args.repeat),
+        "chunked_small_buffer": time_reader(read_chunked_pipe, path, size, args.repeat),
+    }
+    return {"bytes": size, "lines": args.lines, "backend": dashboard.JSON_BACKEND, **results}
+
+
+# ---------------------------------------------------------------------------
+# Swarm scaling
+# ---------------------------------------------------------------------------
+
+PROGRESS_DETAILS = (
+    "Cloning repo...",
+    "Installing deps...",
+    "Reading codebase...",
+    "Writing implementation...",
+    "Running tests...",
+    "Committing changes...",
+    "Analyzing code structure...",
+)
+
+
+def synth_swarm(
+    tasks: int, depth: int, fanout: int, concurrency: int, seed: int
+) -> Iterator[dict[str, Any]]:
+    """Deterministic swarm run in ``demo_generator``'s event vocabulary.
+
+    Tasks form a tree at most ``depth`` levels deep with at most ``fanout``
+    children each; ``concurrency`` of them run at a time, each finishing after
+    a random simulated duration.
+    """
+    rng = random.Random(seed)
+    ts = 1_700_000_000_000
+    open_parents: list[str] = []
+    child_counts: dict[str, int] = {}
+    running: list[tuple[int, str]] = []  # (finish_ts, task_id) heap
+    started = done = failed = merged = conflicts = iteration = tokens = 0
+
+    def ev(message: str, data: dict[str, Any], level: str = "info") -> dict[str, Any]:
+        return {
+            "timestamp": ts,
+            "level": level,
+            "agentId": "main",
+            "agentRole": "root-planner",
+            "message": message,
+            "data": data,
+        }
+
+    while started < tasks or running:
+        while started < tasks and len(running) < concurrency:
+            started += 1
+            parent = rng.choice(open_parents) if open_parents and rng.random() < 0.7 else None
+            if parent is None:
+                tid = f"agent-{started:06d}"
+            else:
+                child_counts[parent] += 1
+                tid = f"{parent}-sub-{child_counts[parent]}"
+                if child_counts[parent] >= fanout:
+                    open_parents.remove(parent)
+            if tid.count("-sub-") + 1 < depth:
+                open_parents.append(tid)
+                child_counts[tid] = 0
+            desc = rng.choice(dashboard._DEMO_DESCS)
+            yield ev("Task created", {"taskId": tid, "desc": desc, "parentId": parent})
+            yield ev("Dispatching task to ephemeral sandbox", {"taskId": tid, "parentId": parent})
+            yield ev(
+                "Task status",
+                {"taskId": tid, "parentId": parent, "from": "pending", "to": "running"},
+            )
+            heapq.heappush(running, (ts + rng.randrange(2_500, 10_000), tid))
+
+        finish_ts, tid = heapq.heappop(running)
+        ts = max(ts, finish_ts)
+        if rng.random() < 0.3:
+            yield ev(
+                "Worker progress",
+                {"taskId": tid, "phase": "execution", "detail": rng.choice(PROGRESS_DETAILS)},
+            )
+        ok = rng.random() < 0.92
+        status = "complete" if ok else "failed"
+        tok = rng.randrange(3_000, 18_000)
+        tokens += tok
+        done += ok
+        failed += not ok
+        yield ev(
+            "Task completed",
+            {
+                "taskId": tid,
+                "status": status,
+                "filesChanged": rng.randrange(1, 8),
+                "linesAdded": rng.randrange(20, 500),
+                "linesRemoved": rng.randrange(0, 100),
+                "tokensUsed": tok,
+                "durationMs": rng.randrange(2_500, 10_000),
+            },
+        )
+        yield ev("Task status", {"taskId": tid, "from": "running", "to": status})
+        if ok:
+            if rng.random() < 0.94:
+                merged += 1
+                yield ev("Merge result", {"branch": f"worker/{tid}", "status": "merged"})
+            else:
+                conflicts += 1
+                yield ev("Merge result", {"branch": f"worker/{tid}", "status": "conflict"}, "warn")
+        if rng.random() < 0.05:
+            yield ev(
+                "Metrics",
+                {
+                    "activeWorkers": len(running),
+                    "completedTasks": done,
+                    "failedTasks": failed,
+                    "mergeSuccessRate": merged / max(1, merged + conflicts),
+                    "totalTokensUsed": tokens,
+                },
+            )
+        if done and done % 50 == 0 and ok:
+            iteration += 1
+            yield ev("Iteration complete", {"iteration": iteration, "tasks": rng.randrange(8, 20)})
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    return {
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+def _reset_peak_rss():
+    """Restart this process's ``VmHWM`` at its current RSS (Linux 4.0+; else a no-op)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as fh:
+            fh.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1e3  # kB
+    except OSError:
+        pass
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1e6 if sys.platform == "darwin" else rss / 1e3  # bytes on macOS, KiB elsewhere
+
+
+def run_scale_case(args: BenchArgs, tasks: int) -> dict[str, Any]:
+    """One swarm size, measured in this process (see ``bench_scale``)."""
+    from rich.console import Console
+
+    _reset_peak_rss()
+
+    state = dashboard.DashboardState(args.concurrency, tasks, dashboard.COST_PER_1K)
+    console = Console(file=io.StringIO(), width=200, height=60, color_system=None)
+    batch_size = 256
+    snap_every = max(batch_size, tasks // 8)
+    events = 0
+    ingest_s = 0.0
+    snap_ms: list[float] = []
+    render_ms: list[float] = []
+    batch: list[dict[str, Any]] = []
+
+    def measure_frame():
+        t0 = time.perf_counter()
+        s = state.snap()
+        snap_ms.append((time.perf_counter() - t0) * 1000)
+        t0 = time.perf_counter()
+        console.print(dashboard.render_grid(s))
+        render_ms.append((time.perf_counter() - t0) * 1000)
+        console.file.seek(0)
+        console.file.truncate()
+
+    next_frame = snap_every
+    for ev in synth_swarm(tasks, args.depth, args.fanout, args.concurrency, args.seed):
+        batch.append(ev)
+        if len(batch) < batch_size:
+            continue
+        t0 = time.perf_counter()
+        state.ingest_many(batch)
+        ingest_s += time.perf_counter() - t0
+        events += len(batch)
+        batch = []
+        if events >= next_frame:
+            measure_frame()
+            next_frame += snap_every
+    t0 = time.perf_counter()
+    state.ingest_many(batch)
+    ingest_s += time.perf_counter() - t0
+    events += len(batch)
+    measure_frame()
+
+    return {
+        "tasks": tasks,
+        "events": events,
+        "nodes": len(state.tree),
+        "max_depth": state.tree.max_depth(),
+        "ingest_events_per_s": events / ingest_s if ingest_s else 0.0,
+        "snap_ms": _percentiles(snap_ms),
+        "render_grid_ms": _percentiles(render_ms),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def bench_scale(args: BenchArgs) -> list[dict[str, Any]]:
+    results = []
+    for size in (int(t) for t in args.tasks.split(",") if t.strip()):
+        cmd = [
+            sys.executable,
+            os.path.abspath(__file__),
+            "--scale-worker",
+            str(size),
+            "--depth",
+            str(args.depth),
+            "--fanout",
+            str(args.fanout),
+            "--concurrency",
+            str(args.concurrency),
+            "--seed",
+            str(args.seed),
+        ]
+        out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(out))
+    return results
+
+
+def print_readers(readers: dict[str, Any]):
+    print(
+        f"NDJSON readers  {readers['lines']:,} lines, {readers['bytes'] / 1e6:.1f} MB, "
+        f"backend={readers['backend']}"
+    )
+    for name in ("readline", "chunked", "chunked_small_buffer"):
+        r = readers[name]
+        print(
+            f"  {name:<22} {r['mb_per_s']:8.1f} MB/s  {r['events_per_s']:>12,.0f} ev/s  "
+            f"cpu {r['cpu_seconds']:.2f}s"
+        )
+    print(f"  chunked / readline     {readers['speedup']:8.2f}x")
+
+
+def print_scale(results: list[dict[str, Any]]):
+    print("Swarm scaling  (snap / render_grid: p50 p95 max ms)")
+    for r in results:
+        snap, render = r["snap_ms"], r["render_grid_ms"]
+        print(
+            f"  {r['tasks']:>7,} tasks {r['nodes']:>7,} nodes  "
+            f"{r['ingest_events_per_s']:>9,.0f} ev/s  "
+            f"snap {snap['p50']:6.2f} {snap['p95']:6.2f} {snap['max']:6.2f}  "
+            f"render {render['p50']:6.2f} {render['p95']:6.2f} {render['max']:6.2f}  "
+            f"rss {r['peak_rss_mb']:.0f} MB"
+        )
+
+
+def main() -> int:
+    args = parse_args()
+    if args.scale_worker:
+        print(json.dumps(run_scale_case(args, args.scale_worker)))
+        return 0
+
+    results: dict[str, Any] = {"backend": dashboard.JSON_BACKEND}
+    ok = True
+    # Scale workers first, while this process is still small.
+    if args.suite in ("all", "scale"):
+        results["scale"] = bench_scale(args)
+    if args.suite in ("all", "readers"):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            readers = bench_readers(args, tmpdir)
+        results["readers"] = readers
+        chunked, readline = readers["chunked"]["mb_per_s"], readers["readline"]["mb_per_s"]
+        readers["speedup"] = chunked / readline
+        ok = chunked >= args.min_mbps and readers["speedup"] >= args.min_speedup
+    results["ok"] = ok
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        if "readers" in results:
+            print_readers(results["readers"])
+        if "scale" in results:
+            print_scale(results["scale"])
+        if not ok:
+            print(
+                f"FAIL: chunked reader below --min-mbps {args.min_mbps} "
+                f"or --min-speedup {args.min_speedup}"
+            )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""Shared helpers: a deterministic demo log and the figures a fold of it produces."""
+
+import queue
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import dashboard  # noqa: E402
+
+BATCH = 256
+
+
+def demo_log(features: int = 400, seed: int = 7) -> list[dict]:
+    q: queue.Queue = queue.Queue()
+    dashboard.demo_generator(q, 24, features, seed=seed, rate=0)
+    events = []
+    while (item := q.get()) is not None:
+        events.append(item)
+    return events
+
+
+def new_state(archive_after: float = 0) -> dashboard.DashboardState:
+    state = dashboard.DashboardState(24, 400, 0.01)
+    state.archive_after = archive_after
+    return state
+
+
+def fold(events: list[dict], state: dashboard.DashboardState | None = None):
+    state = state or new_state(dashboard.ARCHIVE_AFTER_MINUTES * 60)
+    for i in range(0, len(events), BATCH):
+        state.ingest_many(events[i : i + BATCH])
+    return state
+
+
+def figures(state: dashboard.DashboardState) -> dict:
+    s = state.snap()
+    utilization = dict(state.utilization_summary())
+    return {
+        "clock": state.tree.clock,
+        "counts": {k: s[k] for k in ("active", "pending", "completed", "failed", "tokens")},
+        "merges": (s["merge_merged"], s["merge_conflicts"], s["merge_failed"]),
+        "status_counts": dict(state.tree.status_counts),
+        "phases": s["phases"],
+        "utilization": utilization,
+    }
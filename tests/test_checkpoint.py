@@ -0,0 +1,44 @@
+"""Restoring a checkpoint and folding the rest of the log must match a full fold."""
+
+import json
+
+import pytest
+from folding import dashboard, demo_log, figures, fold, new_state
+
+
+def everything(state: dashboard.DashboardState) -> dict:
+    s = state.snap()
+    tree = s["tree"]
+    return {
+        **figures(state),
+        "log_elapsed": s["log_elapsed"],
+        "recent_velocity": s["recent_velocity"],
+        "archived": tree["archived"],
+        "nodes": dict(tree["nodes"]),
+        "branches": state.run_summary()["branches"],
+    }
+
+
+@pytest.mark.parametrize("archive_after", [0, 30])
+@pytest.mark.parametrize("cut", [0.3, 0.7])
+def test_restore_then_fold_matches_full_fold(archive_after, cut):
+    events = demo_log()
+    split = int(len(events) * cut)
+    full = fold(events, new_state(archive_after))
+
+    head = fold(events[:split], new_state(archive_after))
+    ckpt = json.loads(json.dumps(head.checkpoint()))
+    resumed = new_state(archive_after)
+    resumed.restore(ckpt)
+    fold(events[split:], resumed)
+
+    if archive_after:
+        assert full.snap()["tree"]["archived"]  # archival must actually have run
+    assert everything(resumed) == everything(full)
+
+
+def test_restore_rejects_another_version():
+    ckpt = new_state().checkpoint()
+    ckpt["version"] = dashboard.CHECKPOINT_VERSION - 1
+    with pytest.raises(ValueError):
+        new_state().restore(ckpt)
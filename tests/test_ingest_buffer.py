@@ -0,0 +1,89 @@
+"""IngestBuffer coalescing must not change what the dashboard computes."""
+
+from folding import dashboard, demo_log, figures, fold
+
+
+def coalesced(events: list[dict]) -> tuple[list[dict], int]:
+    """``events`` as they leave an IngestBuffer that coalesces on every put."""
+    buf = dashboard.IngestBuffer(0)
+    buf.coalesce_at = 1
+    for event in events:
+        buf.put(event)
+    out = []
+    while not buf.empty():
+        out.append(buf.get())
+    return out, buf.coalesced_total
+
+
+def test_coalesced_fold_matches_direct_fold():
+    events = demo_log()
+    merged, count = coalesced(events)
+    assert count > len(events) // 10  # the check is only worth something if merges happened
+    assert figures(fold(merged)) == figures(fold(events))
+
+
+def test_merged_event_keeps_the_earlier_timestamp():
+    buf = dashboard.IngestBuffer(0)
+    buf.coalesce_at = 1
+    for ts, detail in ((1000, "a"), (5000, "b")):
+        buf.put(
+            {
+                "timestamp": ts,
+                "message": "Worker progress",
+                "data": {"taskId": "t1", "phase": "execution", "detail": detail},
+            }
+        )
+    item = buf.get()
+    assert buf.empty()
+    assert item["timestamp"] == 1000
+    assert item["data"]["detail"] == "b"
+
+
+def test_status_leaving_in_flight_is_not_collapsed():
+    buf = dashboard.IngestBuffer(0)
+    buf.coalesce_at = 1
+    for ts, old, new in ((1000, "pending", "running"), (9000, "running", "complete")):
+        buf.put(
+            {
+                "timestamp": ts,
+                "message": "Task status",
+                "data": {"taskId": "t1", "from": old, "to": new},
+            }
+        )
+    assert buf.qsize() == 2
+
+
+def phase_log() -> list[dict]:
+    """Tasks reporting sandbox then execution progress several times each."""
+    events = []
+    for n in range(40):
+        tid = f"task-{n}"
+        t = 1_700_000_000_000 + n * 10_000
+        events.append({"timestamp": t, "message": "Task created", "data": {"taskId": tid}})
+        for step, phase in enumerate(["sandbox"] * 3 + ["execution"] * 4):
+            events.append(
+                {
+                    "timestamp": t + 700 * (step + 1) + 37 * n,
+                    "message": "Worker progress",
+                    "data": {"taskId": tid, "phase": phase, "detail": f"step {step}"},
+                }
+            )
+        events.append(
+            {
+                "timestamp": t + 9_000,
+                "message": "Task completed",
+                "data": {"taskId": tid, "status": "complete"},
+            }
+        )
+    return events
+
+
+def test_coalesced_progress_keeps_phase_starts():
+    events = phase_log()
+    merged, count = coalesced(events)
+    assert count == 40 * 5
+    direct, folded = fold(events), fold(merged)
+    assert folded.phases.summary() == direct.phases.summary()
+    # The merged entry still shows the newest progress text.
+    node = folded.tree.snapshot()["nodes"]["task-0"]
+    assert node["worker_progress"] == "step 6"
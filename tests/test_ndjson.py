@@ -0,0 +1,29 @@
+"""NdjsonDecoder: whole-block parsing and its line-by-line fallback."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import dashboard  # noqa: E402
+
+
+def test_clean_block_with_escaped_newlines():
+    dec = dashboard.NdjsonDecoder()
+    assert dec.feed(b'{"a":1}\n{"b":"x\\ny"}\n') == [{"a": 1}, {"b": "x\ny"}]
+    assert dec.bad_lines == 0
+
+
+def test_bad_and_blank_lines_fall_back_per_line():
+    dec = dashboard.NdjsonDecoder()
+    events = dec.feed(b'{"a":1}\n\n{"c":3}\nnot json\n1,2\n{"d":4}\r\n')
+    assert events == [{"a": 1}, {"c": 3}, {"d": 4}]
+    assert dec.bad_lines == 2
+
+
+def test_partial_line_waits_for_its_newline():
+    dec = dashboard.NdjsonDecoder()
+    assert dec.feed(b'{"a":1}\n{"b":') == [{"a": 1}]
+    assert dec.pending == 5
+    assert dec.feed(b"2}") == []
+    assert dec.flush() == [{"b": 2}]
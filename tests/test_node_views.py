@@ -0,0 +1,38 @@
+"""A published NodeViews snapshot keeps reading as published."""
+
+import copy
+
+from folding import BATCH, demo_log, fold, new_state
+
+
+def test_snapshot_is_unchanged_by_later_ingest():
+    events = demo_log()
+    state = fold(events[:1500], new_state(30))
+    nodes = state.snap()["tree"]["nodes"]
+    frozen = copy.deepcopy(dict(nodes))
+    views = {name: nodes[name] for name in nodes}
+
+    for i in range(1500, len(events), BATCH):
+        state.ingest_many(events[i : i + BATCH])
+        state.snap()  # newer snapshots chain onto the old one
+    later = state.snap()["tree"]["nodes"]
+    assert later is not nodes
+    assert dict(later) != frozen  # the tree did move on
+
+    assert len(nodes) == len(frozen)
+    assert set(nodes) == set(frozen)
+    assert dict(nodes) == frozen
+    assert all(nodes[name] is view for name, view in views.items())
+    assert dict(nodes.current()) == frozen
+
+
+def test_changed_since_names_every_differing_node():
+    events = demo_log()
+    state = fold(events[:1500])
+    old = state.snap()["tree"]["nodes"]
+    fold(events[1500:2000], state)
+    new = state.snap()["tree"]["nodes"]
+    changed = new.changed_since(old)
+    assert changed is not None
+    differing = {n for n in set(old) | set(new) if old.get(n) is not new.get(n)}
+    assert differing <= set(changed)